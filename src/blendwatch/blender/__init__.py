@@ -1,11 +1,11 @@
 """Blender-specific functionality for BlendWatch."""
 
 from .library_writer import LibraryPathWriter, update_blend_file_paths, get_blend_file_libraries
-from .backlinks import BacklinkScanner, BacklinkResult, find_backlinks
+from .backlinks import BacklinkScanner, BacklinkResult, TransitiveBacklinks, find_backlinks
 from .link_updater import parse_move_log, apply_move_log
 
 __all__ = [
     'LibraryPathWriter', 'update_blend_file_paths', 'get_blend_file_libraries',
-    'BacklinkScanner', 'BacklinkResult', 'find_backlinks',
+    'BacklinkScanner', 'BacklinkResult', 'TransitiveBacklinks', 'find_backlinks',
     'parse_move_log', 'apply_move_log'
 ]
@@ -6,49 +6,102 @@ which blend files link to a given asset or library file.
 """
 
 import logging
+import os
 import re
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Set, NamedTuple, Sequence
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Union, Set, NamedTuple, Sequence, Tuple
 
 from blendwatch.blender.library_writer import LibraryPathWriter, get_blend_file_libraries
 # Import block-level optimizations for enhanced performance
-from blendwatch.blender.block_level_optimizations import SelectiveBlockReader, batch_scan_libraries
+from blendwatch.blender.block_level_optimizations import LibraryScan, iter_library_scans
 from blendwatch.blender.cache import BlendFileCache
+from blendwatch.blender.validation import BrokenLink, DirectoryListingCache, StatCache, find_broken_links
 from blendwatch.core.config import Config, load_default_config
-from blendwatch.utils.path_utils import resolve_path, is_path_ignored, find_files_by_extension
+from blendwatch.utils.path_utils import resolve_path, is_path_ignored, find_files_cached, normalize_path
 
 # Enhanced asset tracking with blender-asset-tracer
-from blender_asset_tracer import trace
+from blender_asset_tracer import blendfile, trace
 from blender_asset_tracer.trace import result, progress
 
 log = logging.getLogger(__name__)
 
+# Number of files traced before blender-asset-tracer's file cache is closed
+TRACE_BATCH_SIZE = 16
+
 class DependencyInfo(NamedTuple):
     """Information about a dependency found by blender-asset-tracer."""
-    asset_path: Path
+    asset_path: Path  # Absolute path, with tile tokens or glob patterns for sequences
     block_name: str
     is_sequence: bool
     usage_type: str
 
 
+class ManifestEntry(NamedTuple):
+    """A file that is needed to open or render a blend file."""
+    path: str  # Absolute path
+    usage_type: str  # "blendfile" for the blend file itself, else as in DependencyInfo
+    size: Optional[int]  # None if the file is missing
+    mtime: Optional[float]  # None if the file is missing
+
+
 class BacklinkResult(NamedTuple):
     """Result of a backlink search."""
     blend_file: Path
-    library_paths: Dict[str, str]
-    matching_libraries: List[str]
+    library_paths: Mapping[str, str]  # Read-only view of the file's cached library paths
+    matching_libraries: List[str]  # Names of the matching libraries, stored paths of matching assets
+
+
+class TransitiveBacklinks(NamedTuple):
+    """Result of a transitive backlink search."""
+    target: Path
+    depths: Dict[Path, int]  # Dependent blend file -> fewest links between it and the target
+    edges: Dict[Path, List[Path]]  # File -> blend files linking to it directly
+    cycles: List[List[Path]]  # Link cycles found, each as a list of files
+    truncated: bool  # Whether the depth limit stopped the search early
+
+
+def _find_cycles(edges: Dict[Path, List[Path]]) -> List[List[Path]]:
+    """Find link cycles in a graph with an iterative depth-first search."""
+    cycles = []
+    on_stack: Dict[Path, int] = {}  # Node -> position in path
+    done: Set[Path] = set()
+    
+    for root in edges:
+        if root in done:
+            continue
+        path = [root]
+        on_stack[root] = 0
+        iterators = [iter(edges.get(root, ()))]
+        while iterators:
+            node = next(iterators[-1], None)
+            if node is None:
+                finished = path.pop()
+                del on_stack[finished]
+                done.add(finished)
+                iterators.pop()
+            elif node in on_stack:
+                cycles.append(path[on_stack[node]:])
+            elif node not in done:
+                on_stack[node] = len(path)
+                path.append(node)
+                iterators.append(iter(edges.get(node, ())))
+    
+    return cycles
 
 
 class BacklinkScanner:
     """Scanner for finding backlinks to blend files and assets."""
     
-    def __init__(self, search_directory: Union[str, Path], config: Optional[Config] = None):
+    def __init__(self, search_directory: Union[str, Path], config: Optional[Config] = None,
+                 cache: Optional[BlendFileCache] = None):
         """Initialize the backlink scanner.
         
         Args:
             search_directory: Directory to search for blend files
             config: Configuration object with ignore patterns. If None, uses default config.
+            cache: Library cache to use, e.g. one kept up to date by a watcher.
+                If None, a new cache is opened.
         """
         self.search_directory = resolve_path(str(search_directory))
         if not self.search_directory.exists():
@@ -68,12 +121,9 @@ class BacklinkScanner:
                 log.warning(f"Invalid ignore pattern '{pattern}': {e}")
         
         # Initialize high-performance cache
-        self.cache = BlendFileCache()
+        self.cache = cache if cache is not None else BlendFileCache(
+            fingerprint_rate=self.config.fingerprint_io_rate * 1024 * 1024)
         
-        # Cache the blend file list to avoid repeated directory scanning
-        self._blend_files_cache: Optional[List[Path]] = None
-        self._blend_files_cache_time: float = 0
-        self._cache_timeout: float = 300  # 5 minutes
     
     def _should_ignore_directory(self, directory: Path) -> bool:
         """Check if a directory should be ignored based on config patterns.
@@ -86,8 +136,91 @@ class BacklinkScanner:
         """
         return is_path_ignored(directory, self.config.ignore_dirs)
     
+    def _path_key(self, path: Union[str, Path], base_dir: str = "") -> str:
+        """Normalize a path for comparison, following the configured case and symlink handling."""
+        return normalize_path(str(path), base_dir,
+                              case_insensitive=self.config.case_insensitive_paths,
+                              resolve_symlinks=self.config.resolve_symlinks)
+    
+    def _key_transform(self) -> Optional[Callable[[str], str]]:
+        """Get the transform that applies the configured path handling to cached library keys."""
+        if not (self.config.case_insensitive_paths or self.config.resolve_symlinks):
+            return None
+        return self._path_key
+    
+    def _match_libraries(self, blend_file: Path, library_paths: Dict[str, str],
+                         target_key: str) -> List[str]:
+        """Get the names of the libraries that refer to the target.
+        
+        Each library is keyed by its path and by its name (the path as stored
+        in the file), both resolved relative to the blend file. Libraries
+        that only share the target's file name match when ``match_basename``
+        is enabled.
+        """
+        base_dir = str(Path(blend_file).parent)
+        target_basename = os.path.basename(target_key)
+        
+        matching_libraries = []
+        for lib_name, lib_path in library_paths.items():
+            keys = {self._path_key(lib_path, base_dir)}
+            if lib_name:
+                keys.add(self._path_key(lib_name, base_dir))
+            if target_key in keys or (self.config.match_basename and
+                                      any(os.path.basename(key) == target_basename for key in keys)):
+                matching_libraries.append(lib_name)
+        return matching_libraries
+    
+    def _iter_cached_backlinks_to_targets(self, target_assets: Sequence[Path], blend_files: List[Path],
+                                          known_paths: Optional[Set[str]] = None
+                                          ) -> Iterator[Tuple[Path, BacklinkResult]]:
+        """Yield (target, backlink) pairs from one pass over the cache's reverse index."""
+        targets = {str(target_asset): target_asset for target_asset in target_assets}
+        target_keys = {target_asset: self._path_key(target_asset) for target_asset in target_assets}
+        
+        for blend_file, library_paths, linked in self.cache.iter_links_to_targets(
+                list(targets), blend_files,
+                match_basename=self.config.match_basename,
+                key_transform=self._key_transform(),
+                known_paths=known_paths):
+            for target_str, matching_libraries in linked.items():
+                target_asset = targets[target_str]
+                # A blend file doesn't link to itself
+                if self._path_key(blend_file) == target_keys[target_asset]:
+                    continue
+                yield target_asset, BacklinkResult(
+                    blend_file=blend_file,
+                    library_paths=library_paths,
+                    matching_libraries=matching_libraries
+                )
+    
+    def _find_cached_backlinks_to_targets(self, target_assets: Sequence[Path], blend_files: List[Path],
+                                          known_paths: Optional[Set[str]] = None
+                                          ) -> Dict[Path, List[BacklinkResult]]:
+        """Find backlinks to several targets with one pass over the cache's reverse index."""
+        results: Dict[Path, List[BacklinkResult]] = {target_asset: [] for target_asset in target_assets}
+        for target_asset, backlink in self._iter_cached_backlinks_to_targets(target_assets, blend_files,
+                                                                             known_paths):
+            results[target_asset].append(backlink)
+        return results
+    
+    def _iter_cached_backlinks_under(self, target_directory: Path, blend_files: List[Path],
+                                     known_paths: Optional[Set[str]] = None) -> Iterator[BacklinkResult]:
+        """Yield backlinks into a directory from a prefix query on the cache's reverse index."""
+        for blend_file, library_paths, matching_libraries in self.cache.iter_links_under_directory(
+                str(target_directory), blend_files, key_transform=self._key_transform(),
+                known_paths=known_paths):
+            yield BacklinkResult(
+                blend_file=blend_file,
+                library_paths=library_paths,
+                matching_libraries=matching_libraries
+            )
+    
     def find_blend_files(self, force_refresh: bool = False) -> List[Path]:
-        """Find all .blend files using the path utilities with caching.
+        """Find all .blend files outside of ignored directories.
+        
+        The search directory is walked once with ``os.scandir``, pruning
+        ignored directories before descending into them. The result is reused
+        until one of the walked directories' mtimes changes.
         
         Args:
             force_refresh: If True, ignore cache and re-scan directory
@@ -95,80 +228,43 @@ class BacklinkScanner:
         Returns:
             List of paths to .blend files
         """
-        # Check if we can use cached results
-        current_time = time.time()
-        if (not force_refresh and 
-            self._blend_files_cache is not None and 
-            current_time - self._blend_files_cache_time < self._cache_timeout):
-            return self._blend_files_cache
-        
         start_time = time.time()
-        
-        # Use the utility function to find blend files
-        blend_files = find_files_by_extension(self.search_directory, ['.blend'], recursive=True)
-        
-        # Filter out files in ignored directories
-        filtered_files = []
-        for blend_file in blend_files:
-            # Check if any parent directory should be ignored
-            should_ignore = False
-            for parent in blend_file.parents:
-                if parent == self.search_directory:
-                    break  # Don't check the search directory itself
-                if self._should_ignore_directory(parent):
-                    should_ignore = True
-                    break
-            
-            if not should_ignore:
-                filtered_files.append(blend_file)
-        
-        # Cache the results
-        self._blend_files_cache = filtered_files
-        self._blend_files_cache_time = current_time
+        ignore_dirs = [pattern.pattern for pattern in self.ignore_patterns]
+        blend_files = find_files_cached(self.search_directory, ['.blend'], ignore_dirs,
+                                        force_refresh=force_refresh)
         
         duration = time.time() - start_time
-        log.info(f"Found {len(filtered_files)} blend files in {duration:.2f}s")
-        return filtered_files
+        log.info(f"Found {len(blend_files)} blend files in {duration:.2f}s")
+        return blend_files
     
-    def _check_blend_file_for_target(self, blend_file: Path, target_asset: Path) -> Optional[BacklinkResult]:
-        """Check if a blend file links to the target asset using cache.
+    def iter_backlinks_to_file(self, target_asset: Union[str, Path]) -> Iterator[BacklinkResult]:
+        """Yield the blend files that link to the target asset as they are found.
+        
+        Files are checked in a single pass, so on a cold cache results arrive
+        while the remaining files are still being read, and no list of all
+        results is kept.
         
         Args:
-            blend_file: Path to the blend file to check
-            target_asset: Path to the target asset to look for
+            target_asset: Path to the asset to find backlinks for
             
-        Returns:
-            BacklinkResult if the blend file links to the target, None otherwise
+        Yields:
+            BacklinkResult for each file that links to the target
         """
-        try:
-            # Use cache to get library paths
-            library_paths = self.cache.get_library_paths(blend_file)
-            if library_paths is None:
-                return None
-            
-            # Look for matches in library paths
-            matching_libraries = []
-            target_name = target_asset.name
-            target_str = str(target_asset)
-            
-            for lib_name, lib_path in library_paths.items():
-                # Check for exact filename matches or path matches
-                if (target_name in lib_path or 
-                    target_str in lib_path or
-                    target_asset.resolve() == Path(lib_path).resolve()):
-                    matching_libraries.append(lib_name)
-            
-            if matching_libraries:
-                return BacklinkResult(
-                    blend_file=blend_file,
-                    library_paths=library_paths,
-                    matching_libraries=matching_libraries
-                )
-            
-        except Exception as e:
-            log.warning(f"Could not check {blend_file}: {e}")
+        target_asset = resolve_path(str(target_asset))
+        # Note: We don't check if target_asset exists anymore because for rename operations,
+        # the old path is expected to not exist after the rename
+        
+        # Find all blend files (cached)
+        blend_files = self.find_blend_files()
+        
+        # Filter out the target file itself if it's a blend file
+        if target_asset.suffix.lower() == '.blend':
+            target_key = self._path_key(target_asset)
+            blend_files = [f for f in blend_files if self._path_key(f) != target_key]
         
-        return None
+        log.info(f"Checking {len(blend_files)} blend files for backlinks to {target_asset.name}")
+        for _, backlink in self._iter_cached_backlinks_to_targets([target_asset], blend_files):
+            yield backlink
     
     def find_backlinks_to_file(self, target_asset: Union[str, Path], 
                               max_workers: int = 4, 
@@ -183,54 +279,15 @@ class BacklinkScanner:
         Returns:
             List of BacklinkResult objects for files that link to the target
         """
-        target_asset = resolve_path(str(target_asset))
-        # Note: We don't check if target_asset exists anymore because for rename operations,
-        # the old path is expected to not exist after the rename
-        
         start_time = time.time()
         
-        # Find all blend files (cached)
-        blend_files = self.find_blend_files()
-        
-        # Filter out the target file itself if it's a blend file
-        if target_asset.suffix.lower() == '.blend':
-            blend_files = [f for f in blend_files if f.resolve() != target_asset.resolve()]
-        
-        log.info(f"Checking {len(blend_files)} blend files for backlinks to {target_asset.name}")
-        
         # Progress reporting
         if progress_callback:
             # Simple progress notification for now
-            log.info(f"Starting backlink scan for {target_asset.name}")
+            log.info(f"Starting backlink scan for {Path(target_asset).name}")
             
         # Use the cache's optimized bulk operation
-        processed = 0
-        linking_files = self.cache.get_files_linking_to(str(target_asset), blend_files)
-        
-        # Convert to BacklinkResult objects
-        backlinks = []
-        for blend_file in linking_files:
-            library_paths = self.cache.get_library_paths(blend_file)
-            if library_paths is None:
-                continue
-            
-            # Find which libraries match
-            matching_libraries = []
-            target_name = target_asset.name
-            target_str = str(target_asset)
-            
-            for lib_name, lib_path in library_paths.items():
-                if (target_name in lib_path or 
-                    target_str in lib_path or
-                    str(target_asset) == lib_path):
-                    matching_libraries.append(lib_name)
-            
-            if matching_libraries:
-                backlinks.append(BacklinkResult(
-                    blend_file=blend_file,
-                    library_paths=library_paths,
-                    matching_libraries=matching_libraries
-                ))
+        backlinks = list(self.iter_backlinks_to_file(target_asset))
         
         duration = time.time() - start_time
         
@@ -241,6 +298,39 @@ class BacklinkScanner:
         
         return backlinks
     
+    def iter_backlinks_to_directory(self, target_directory: Union[str, Path]) -> Iterator[BacklinkResult]:
+        """Yield the blend files that link to anything below a directory as they are found.
+        
+        Args:
+            target_directory: Directory to find backlinks into
+            
+        Yields:
+            BacklinkResult for each linking file, listing the libraries below the directory
+        """
+        target_directory = resolve_path(str(target_directory))
+        blend_files = self.find_blend_files()
+        log.info(f"Checking {len(blend_files)} blend files for backlinks into {target_directory}")
+        yield from self._iter_cached_backlinks_under(target_directory, blend_files)
+    
+    def find_backlinks_to_directory(self, target_directory: Union[str, Path]) -> List[BacklinkResult]:
+        """Find all blend files that link to anything below a directory.
+        
+        This is a single prefix query on the cache's sorted reverse index,
+        instead of one query per file in the directory.
+        
+        Args:
+            target_directory: Directory to find backlinks into
+            
+        Returns:
+            List of BacklinkResult objects, listing the libraries below the directory
+        """
+        start_time = time.time()
+        backlinks = list(self.iter_backlinks_to_directory(target_directory))
+        
+        duration = time.time() - start_time
+        log.info(f"Found {len(backlinks)} backlinks in {duration:.2f}s")
+        return backlinks
+    
     def save_cache(self):
         """Save the cache to disk for future use."""
         self.cache.save()
@@ -252,82 +342,161 @@ class BacklinkScanner:
     def clear_cache(self):
         """Clear all cached data."""
         self.cache.clear()
-        self._blend_files_cache = None
-        self._blend_files_cache_time = 0
 
     def find_backlinks_to_multiple_files(self, target_assets: Sequence[Union[str, Path]], 
                                        max_workers: int = 4) -> Dict[Path, List[BacklinkResult]]:
         """Find backlinks for multiple target assets.
         
+        All targets are looked up together: their canonical keys are probed in
+        the reverse index at once and the candidate files are checked in a
+        single pass, instead of scanning every file for every target.
+        
         Args:
             target_assets: List of assets to find backlinks for
-            max_workers: Number of threads to use for parallel processing
+            max_workers: Kept for compatibility, the lookup needs no worker threads
             
         Returns:
             Dictionary mapping target assets to their backlink results
         """
         target_assets = [resolve_path(str(asset)) for asset in target_assets]
-        results = {}
+        start_time = time.time()
         
         # Find all blend files once
         blend_files = self.find_blend_files()
+        log.info(f"Checking {len(blend_files)} blend files for backlinks to {len(target_assets)} targets")
+        
+        results = self._find_cached_backlinks_to_targets(target_assets, blend_files)
         
-        for target_asset in target_assets:
-            log.info(f"Finding backlinks for {target_asset.name}")
+        duration = time.time() - start_time
+        total = sum(len(backlinks) for backlinks in results.values())
+        log.info(f"Found {total} backlinks to {len(results)} targets in {duration:.2f}s")
+        return results
+    
+    def find_transitive_backlinks(self, target_asset: Union[str, Path],
+                                  max_depth: Optional[int] = None) -> TransitiveBacklinks:
+        """Find all blend files that depend on the target, directly or through other libraries.
+        
+        This is a breadth-first search over the cached library graph: each
+        level is a single reverse index lookup for all files found on the
+        previous level, and every file is expanded once. Files are only read
+        if they have never been cached or changed on disk. The first level
+        checks all search files, deeper levels only the files that link
+        libraries, as only those can depend on the blend files found so far.
+        
+        Args:
+            target_asset: Path to the asset to find dependents of. If this is a
+                directory, files linking to anything below it are the first level.
+            max_depth: Maximum number of links between a dependent and the
+                target. If None, the search continues until no new files are found.
             
-            # Filter out the target file itself if it's a blend file
-            files_to_check = blend_files
-            if target_asset.suffix.lower() == '.blend':
-                files_to_check = [f for f in blend_files if f.resolve() != target_asset.resolve()]
+        Returns:
+            TransitiveBacklinks with the dependents, the links between them and
+            any link cycles
+        """
+        target_asset = resolve_path(str(target_asset))
+        start_time = time.time()
+        blend_files = self.find_blend_files()
+        known_paths = self.cache.get_known_paths()
+        
+        depths: Dict[Path, int] = {}
+        edges: Dict[Path, List[Path]] = {}
+        frontier = [target_asset]
+        depth = 0
+        truncated = False
+        while frontier:
+            if max_depth is not None and depth >= max_depth:
+                # Only truncated if the next level would find more files
+                backlinks = self._find_cached_backlinks_to_targets(frontier, blend_files, known_paths)
+                truncated = any(backlink.blend_file != target_asset and backlink.blend_file not in depths
+                                for node in frontier for backlink in backlinks[node])
+                break
             
-            backlinks = []
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_file = {
-                    executor.submit(self._check_blend_file_for_target, blend_file, target_asset): blend_file
-                    for blend_file in files_to_check
-                }
-                
-                for future in as_completed(future_to_file):
-                    result = future.result()
-                    if result is not None:
-                        backlinks.append(result)
+            depth += 1
+            if depth == 1 and target_asset.is_dir():
+                backlinks = {target_asset: list(self._iter_cached_backlinks_under(target_asset, blend_files,
+                                                                                  known_paths))}
+            else:
+                backlinks = self._find_cached_backlinks_to_targets(frontier, blend_files, known_paths)
+            if depth == 1:
+                # The first pass read every file that wasn't cached, deeper levels
+                # look for files linking to blend files, which needs a Library block
+                linking = self.cache.get_files_with_libraries()
+                blend_files = [blend_file for blend_file in blend_files if str(blend_file) in linking]
             
-            results[target_asset] = backlinks
-            log.info(f"Found {len(backlinks)} backlinks for {target_asset.name}")
+            next_frontier = []
+            for node in frontier:
+                edges[node] = [backlink.blend_file for backlink in backlinks[node]]
+                for dependent in edges[node]:
+                    if dependent != target_asset and dependent not in depths:
+                        depths[dependent] = depth
+                        next_frontier.append(dependent)
+            frontier = next_frontier
+        
+        cycles = _find_cycles(edges)
+        if cycles:
+            log.warning(f"Found {len(cycles)} link cycles depending on {target_asset.name}")
         
-        return results
+        duration = time.time() - start_time
+        log.info(f"Found {len(depths)} files depending on {target_asset.name} "
+                 f"in {depth} levels in {duration:.2f}s")
+        
+        return TransitiveBacklinks(
+            target=target_asset,
+            depths=depths,
+            edges=edges,
+            cycles=cycles,
+            truncated=truncated
+        )
     
-    def find_blend_files_optimized(self, force_refresh: bool = False) -> List[Path]:
-        """Find all .blend files with enhanced block-level pre-filtering.
+    def scan_blend_files(self, force_refresh: bool = False,
+                         max_workers: Optional[int] = 4) -> List[LibraryScan]:
+        """Read the Library blocks of all .blend files in the search directory.
         
-        This optimized version uses block-level I/O to quickly identify which
-        files actually contain libraries before adding them to the scan list.
+        Every file is opened once. The returned scans carry the library paths,
+        so later stages can use them without reading the files again.
         
         Args:
             force_refresh: If True, ignore cache and re-scan directory
+            max_workers: Number of worker processes. If None, uses the CPU count.
         
         Returns:
-            List of paths to .blend files that contain libraries
+            LibraryScan of every .blend file that contains libraries
         """
-        # First get all blend files using the standard method
         all_blend_files = self.find_blend_files(force_refresh)
-        
         if not all_blend_files:
             return []
         
-        # Use block-level pre-filtering to only return files with libraries
-        files_with_libraries = []
-        for blend_file in all_blend_files:
-            try:
-                if SelectiveBlockReader.has_libraries(blend_file):
-                    files_with_libraries.append(blend_file)
-            except Exception as e:
-                log.debug(f"Error checking {blend_file} for libraries: {e}")
-                # Include file in results on error to be safe
-                files_with_libraries.append(blend_file)
+        scans = list(iter_library_scans(all_blend_files, max_workers=max_workers))
+        log.info(f"Pre-filtered {len(all_blend_files)} files to {len(scans)} files with libraries")
+        return scans
+    
+    def find_blend_files_optimized(self, force_refresh: bool = False) -> List[Path]:
+        """Find all .blend files with enhanced block-level pre-filtering.
+        
+        This optimized version uses block-level I/O to quickly identify which
+        files actually contain libraries before adding them to the scan list.
+        Use ``scan_blend_files()`` instead when the library paths are needed
+        too, so the files aren't read twice.
+        
+        Args:
+            force_refresh: If True, ignore cache and re-scan directory
         
-        log.info(f"Pre-filtered {len(all_blend_files)} files to {len(files_with_libraries)} files with libraries")
-        return files_with_libraries
+        Returns:
+            List of paths to .blend files that contain libraries
+        """
+        return [scan.path for scan in self.scan_blend_files(force_refresh)]
+    
+    def _match_backlink(self, blend_file: Path, library_paths: Dict[str, str],
+                        target_key: str) -> Optional[BacklinkResult]:
+        """Build a BacklinkResult if any of the library paths refers to the target."""
+        matching_libraries = self._match_libraries(blend_file, library_paths, target_key)
+        if not matching_libraries:
+            return None
+        return BacklinkResult(
+            blend_file=blend_file,
+            library_paths=library_paths,
+            matching_libraries=matching_libraries
+        )
     
     def find_backlinks_to_file_optimized(self, target_asset: Union[str, Path], 
                                         max_workers: int = 4, 
@@ -339,9 +508,12 @@ class BacklinkScanner:
         2. Uses batch scanning for better I/O efficiency
         3. Implements selective block reading
         
+        With pre-filtering, each file is read once: the scans that find the
+        files with libraries are matched directly.
+        
         Args:
             target_asset: Path to the asset to find backlinks for
-            max_workers: Number of threads to use for parallel processing
+            max_workers: Number of worker processes to use for batch scanning
             use_prefiltering: Whether to use block-level pre-filtering
             
         Returns:
@@ -349,70 +521,37 @@ class BacklinkScanner:
         """
         target_asset = resolve_path(str(target_asset))
         start_time = time.time()
+        is_target_blend = target_asset.suffix.lower() == '.blend'
+        target_key = self._path_key(target_asset)
         
-        # Use optimized file discovery if enabled
         if use_prefiltering:
-            blend_files = self.find_blend_files_optimized()
+            scans = self.scan_blend_files(max_workers=max_workers)
+            # Filter out the target file itself if it's a blend file
+            if is_target_blend:
+                scans = [scan for scan in scans if self._path_key(scan.path) != target_key]
+            log.info(f"Checking {len(scans)} blend files for backlinks to {target_asset.name}")
+            candidates = [(scan.path, scan.library_paths) for scan in scans]
         else:
             blend_files = self.find_blend_files()
-        
-        # Filter out the target file itself if it's a blend file
-        if target_asset.suffix.lower() == '.blend':
-            blend_files = [f for f in blend_files if f.resolve() != target_asset.resolve()]
-        
-        log.info(f"Checking {len(blend_files)} blend files for backlinks to {target_asset.name}")
-        
-        # Use batch scanning for better performance
-        if len(blend_files) > 10:  # Use batch scanning for larger file sets
-            batch_results = batch_scan_libraries(blend_files, max_workers=max_workers)
-            
-            # Convert batch results to BacklinkResult objects
-            backlinks = []
-            target_name = target_asset.name
-            target_str = str(target_asset)
+            if is_target_blend:
+                blend_files = [f for f in blend_files if self._path_key(f) != target_key]
+            log.info(f"Checking {len(blend_files)} blend files for backlinks to {target_asset.name}")
             
-            for blend_file, library_paths in batch_results.items():
-                matching_libraries = []
-                for lib_name, lib_path in library_paths.items():
-                    if (target_name in lib_path or 
-                        target_str in lib_path or
-                        str(target_asset) == lib_path):
-                        matching_libraries.append(lib_name)
-                
-                if matching_libraries:
-                    backlinks.append(BacklinkResult(
-                        blend_file=blend_file,
-                        library_paths=library_paths,
-                        matching_libraries=matching_libraries
-                    ))
+            if len(blend_files) > 10:  # Use batch scanning for larger file sets
+                candidates = [(scan.path, scan.library_paths)
+                              for scan in iter_library_scans(blend_files, max_workers=max_workers)]
+            else:
+                # Use standard cache-based approach for smaller file sets
+                candidates = None
+        
+        if candidates is None:
+            backlinks = self._find_cached_backlinks_to_targets([target_asset], blend_files)[target_asset]
         else:
-            # Use standard cache-based approach for smaller file sets
-            linking_files = self.cache.get_files_linking_to(str(target_asset), blend_files)
-            
-            # Convert to BacklinkResult objects
             backlinks = []
-            for blend_file in linking_files:
-                library_paths = self.cache.get_library_paths(blend_file)
-                if library_paths is None:
-                    continue
-                
-                # Find which libraries match
-                matching_libraries = []
-                target_name = target_asset.name
-                target_str = str(target_asset)
-                
-                for lib_name, lib_path in library_paths.items():
-                    if (target_name in lib_path or 
-                        target_str in lib_path or
-                        str(target_asset) == lib_path):
-                        matching_libraries.append(lib_name)
-                
-                if matching_libraries:
-                    backlinks.append(BacklinkResult(
-                        blend_file=blend_file,
-                        library_paths=library_paths,
-                        matching_libraries=matching_libraries
-                    ))
+            for blend_file, library_paths in candidates:
+                backlink = self._match_backlink(blend_file, library_paths, target_key)
+                if backlink is not None:
+                    backlinks.append(backlink)
         
         duration = time.time() - start_time
         
@@ -435,6 +574,10 @@ class BacklinkScanner:
         - Sound files
         - Other asset types
         
+        Traces are memoized in the cache, keyed by the identity of the blend
+        file and checked against the libraries the trace went through, so
+        files are only traced again after they or their libraries changed.
+        
         Args:
             blend_file: Path to the blend file to analyze
             progress_callback: Optional progress callback for long operations
@@ -442,50 +585,40 @@ class BacklinkScanner:
         Returns:
             List of DependencyInfo objects describing all dependencies
         """
+        try:
+            return self._trace_dependencies(blend_file, progress_callback)
+        finally:
+            blendfile.close_all_cached()
+
+    def _trace_dependencies(self, blend_file: Union[str, Path],
+                            progress_callback: Optional[progress.Callback] = None) -> List[DependencyInfo]:
+        """Find all dependencies of a blend file, leaving blender-asset-tracer's files open.
+        
+        See ``find_all_dependencies()``, callers close the files with
+        ``blendfile.close_all_cached()``.
+        """
         blend_file = resolve_path(str(blend_file))
         if not blend_file.exists():
             raise FileNotFoundError(f"Blend file not found: {blend_file}")
         
+        traced = self.cache.get_dependency_trace(blend_file)
+        if traced is not None:
+            log.debug(f"Using memoized dependency trace of {blend_file.name}")
+            return [DependencyInfo(Path(asset_path), block_name, is_sequence, usage_type)
+                    for asset_path, block_name, is_sequence, usage_type in traced]
+        
+        # The identity before tracing, so a file saved during the trace isn't memoized as traced
+        stat = blend_file.stat()
+        identity = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        recorder = _TraceRecorder(progress_callback)
         dependencies = []
         
         try:
             log.info(f"Analyzing dependencies for {blend_file.name}")
             
             # Use blender-asset-tracer to find all dependencies
-            for block_usage in trace.deps(blend_file, progress_callback):
-                # Convert BlockUsage to our DependencyInfo format
-                # Handle BlendPath to Path conversion
-                asset_path = Path(str(block_usage.asset_path))
-                
-                # Determine usage type based on block information
-                usage_type = "unknown"
-                if hasattr(block_usage, 'block') and block_usage.block:
-                    if hasattr(block_usage.block, 'code'):
-                        block_code = block_usage.block.code
-                        if block_code == b'LI':
-                            usage_type = "library"
-                        elif block_code == b'IM':
-                            usage_type = "image"
-                        elif block_code == b'SO':
-                            usage_type = "sound"
-                        else:
-                            usage_type = block_code.decode('ascii', errors='ignore')
-                
-                # Handle block_name conversion from bytes to string
-                block_name = "unknown"
-                if block_usage.block_name:
-                    if isinstance(block_usage.block_name, bytes):
-                        block_name = block_usage.block_name.decode('utf-8', errors='ignore')
-                    else:
-                        block_name = str(block_usage.block_name)
-                
-                dep_info = DependencyInfo(
-                    asset_path=asset_path,
-                    block_name=block_name,
-                    is_sequence=block_usage.is_sequence,
-                    usage_type=usage_type
-                )
-                dependencies.append(dep_info)
+            for block_usage in trace.deps(blend_file, recorder):
+                dependencies.append(_dependency_info(block_usage))
             
             log.info(f"Found {len(dependencies)} dependencies in {blend_file.name}")
             
@@ -493,8 +626,49 @@ class BacklinkScanner:
             log.error(f"Error analyzing dependencies for {blend_file}: {e}")
             raise
         
+        # Missing libraries are recorded too, the trace is outdated once they appear
+        library_files = recorder.opened_files | {str(dep.asset_path) for dep in dependencies
+                                                 if dep.usage_type == "library"}
+        self.cache.put_dependency_trace(blend_file, identity, library_files,
+                                        [(str(dep.asset_path), dep.block_name, dep.is_sequence, dep.usage_type)
+                                         for dep in dependencies])
         return dependencies
 
+    def find_all_dependencies_batch(self, blend_files: Sequence[Union[str, Path]],
+                                    progress_callback: Optional[progress.Callback] = None
+                                    ) -> Dict[Path, List[DependencyInfo]]:
+        """Find all dependencies of several blend files.
+        
+        Libraries shared by the files are only read once per batch of
+        ``TRACE_BATCH_SIZE`` files: blender-asset-tracer keeps the files it
+        opened until the batch is done, then they are closed. Files that were
+        traced before reuse their memoized trace.
+        
+        Args:
+            blend_files: Paths of the blend files to analyze
+            progress_callback: Optional progress callback for long operations
+            
+        Returns:
+            Dictionary mapping each blend file to its dependencies. Files that
+            can't be traced are logged and left out.
+        """
+        start_time = time.time()
+        blend_files = [resolve_path(str(blend_file)) for blend_file in blend_files]
+        results = {}
+        for start in range(0, len(blend_files), TRACE_BATCH_SIZE):
+            try:
+                for blend_file in blend_files[start:start + TRACE_BATCH_SIZE]:
+                    try:
+                        results[blend_file] = self._trace_dependencies(blend_file, progress_callback)
+                    except Exception as e:
+                        log.warning(f"Could not trace dependencies of {blend_file}: {e}")
+            finally:
+                blendfile.close_all_cached()
+        
+        duration = time.time() - start_time
+        log.info(f"Traced dependencies of {len(results)} files in {duration:.2f}s")
+        return results
+
     def get_dependency_summary(self, blend_file: Union[str, Path]) -> Dict[str, int]:
         """Get a summary of dependency types for a blend file.
         
@@ -515,29 +689,31 @@ class BacklinkScanner:
         
         return summary
 
-    def find_missing_dependencies(self, blend_file: Union[str, Path]) -> List[DependencyInfo]:
+    def find_missing_dependencies(self, blend_file: Union[str, Path],
+                                  listings: Optional[DirectoryListingCache] = None) -> List[DependencyInfo]:
         """Find dependencies that are missing from the filesystem.
         
+        Existence is checked against one listing per directory. Image
+        sequences and UDIM tile sets count as present if any of their files
+        is, found by matching frame and tile numbers against the listing
+        instead of checking each file.
+        
         Args:
             blend_file: Path to the blend file to analyze
+            listings: Directory listings to check against, share one to
+                check many files with one listing per directory
             
         Returns:
             List of DependencyInfo objects for missing dependencies
         """
         dependencies = self.find_all_dependencies(blend_file)
-        missing = []
+        if listings is None:
+            listings = DirectoryListingCache()
         
-        for dep in dependencies:
-            if not dep.asset_path.exists():
-                # For sequences, check if any file in the sequence exists
-                if dep.is_sequence:
-                    # For now, just mark as missing if the exact path doesn't exist
-                    # TODO: Implement proper sequence checking
-                    missing.append(dep)
-                else:
-                    missing.append(dep)
-        
-        return missing
+        asset_paths = [os.path.normpath(str(dep.asset_path)) for dep in dependencies]
+        listings.list_directories(os.path.dirname(asset_path) for asset_path in asset_paths)
+        return [dep for dep, asset_path in zip(dependencies, asset_paths)
+                if not listings.asset_exists(asset_path, dep.is_sequence)]
 
     def get_blend_file_dependencies_by_type(self, blend_file: Union[str, Path]) -> Dict[str, List[DependencyInfo]]:
         """Get dependencies grouped by type.
@@ -562,6 +738,131 @@ class BacklinkScanner:
         
         return by_type
     
+    def build_manifests(self, blend_files: Sequence[Union[str, Path]],
+                        max_workers: int = 4) -> Dict[Path, List[ManifestEntry]]:
+        """List every file each blend file needs, with its size and mtime.
+        
+        The transitive dependencies come from the memoized traces, so only
+        files that changed or whose libraries changed are parsed again.
+        Sequences and tile sets are expanded from one listing per directory,
+        and every file is stat'ed once, however many blend files need it.
+        The files opened for tracing are closed after every batch of traced
+        files, see ``find_all_dependencies_batch()``.
+        
+        Args:
+            blend_files: Paths of the blend files, e.g. the shots to render
+            max_workers: Number of threads listing directories and calling stat
+            
+        Returns:
+            Dictionary mapping each blend file to its manifest, the blend file
+            itself first. Files that can't be traced are logged and left out.
+        """
+        start_time = time.time()
+        dependencies = self.find_all_dependencies_batch(blend_files)
+        
+        listings = DirectoryListingCache()
+        listings.list_directories((os.path.dirname(os.path.normpath(str(dep.asset_path)))
+                                   for deps in dependencies.values() for dep in deps if dep.is_sequence),
+                                  max_workers=max_workers)
+        
+        files_per_blend_file: Dict[Path, Dict[str, str]] = {}
+        for blend_file, deps in dependencies.items():
+            # Path -> usage type, in trace order without duplicates
+            files = {str(blend_file): "blendfile"}
+            for dep in deps:
+                asset_path = os.path.normpath(str(dep.asset_path))
+                expanded = listings.sequence_files(asset_path) if dep.is_sequence else []
+                for path in expanded or [asset_path]:
+                    files.setdefault(path, dep.usage_type)
+            files_per_blend_file[blend_file] = files
+        
+        stats = StatCache()
+        stats.stat_many((path for files in files_per_blend_file.values() for path in files), max_workers=max_workers)
+        
+        manifests = {}
+        for blend_file, files in files_per_blend_file.items():
+            manifest = []
+            for path, usage_type in files.items():
+                stat = stats.stat(path)
+                manifest.append(ManifestEntry(path=path, usage_type=usage_type,
+                                              size=stat.st_size if stat is not None else None,
+                                              mtime=stat.st_mtime if stat is not None else None))
+            manifests[blend_file] = manifest
+        
+        duration = time.time() - start_time
+        log.info(f"Built manifests of {len(manifests)} files in {duration:.2f}s")
+        return manifests
+    
+    def find_broken_links(self, max_workers: int = 4) -> Dict[Path, List[BrokenLink]]:
+        """Find library and asset paths that don't exist, in all blend files.
+        
+        Unlike ``find_missing_dependencies()``, this doesn't trace each file:
+        the stored paths come from the cache and every unique target is
+        checked only once.
+        
+        Args:
+            max_workers: Number of threads reading files and listing directories
+            
+        Returns:
+            Dictionary mapping each blend file with broken links to those links
+        """
+        start_time = time.time()
+        broken = find_broken_links(self.find_blend_files(), self.cache, max_workers=max_workers)
+        self.cache.save()
+        
+        duration = time.time() - start_time
+        log.info(f"Found {sum(len(links) for links in broken.values())} broken links "
+                 f"in {len(broken)} files in {duration:.2f}s")
+        return broken
+    
+
+
+class _TraceRecorder(progress.Callback):
+    """Records the blend files a dependency trace opens, forwarding to another callback."""
+    
+    def __init__(self, forward_to: Optional[progress.Callback] = None):
+        self.forward_to = forward_to
+        self.opened_files: Set[str] = set()
+    
+    def trace_blendfile(self, filename: Path) -> None:
+        self.opened_files.add(str(filename))
+        if self.forward_to is not None:
+            self.forward_to.trace_blendfile(filename)
+
+
+def _dependency_info(block_usage: result.BlockUsage) -> DependencyInfo:
+    """Convert a blender-asset-tracer BlockUsage to a DependencyInfo."""
+    # The absolute path, the stored one may be relative to a library
+    asset_path = Path(block_usage.abspath)
+    
+    # Determine usage type based on block information
+    usage_type = "unknown"
+    if hasattr(block_usage, 'block') and block_usage.block:
+        if hasattr(block_usage.block, 'code'):
+            block_code = block_usage.block.code
+            if block_code == b'LI':
+                usage_type = "library"
+            elif block_code == b'IM':
+                usage_type = "image"
+            elif block_code == b'SO':
+                usage_type = "sound"
+            else:
+                usage_type = block_code.decode('ascii', errors='ignore')
+    
+    # Handle block_name conversion from bytes to string
+    block_name = "unknown"
+    if block_usage.block_name:
+        if isinstance(block_usage.block_name, bytes):
+            block_name = block_usage.block_name.decode('utf-8', errors='ignore')
+        else:
+            block_name = str(block_usage.block_name)
+    
+    return DependencyInfo(
+        asset_path=asset_path,
+        block_name=block_name,
+        is_sequence=block_usage.is_sequence,
+        usage_type=usage_type
+    )
 
 
 def find_backlinks(target_asset: Union[str, Path], 
@@ -0,0 +1,569 @@
+"""
+Lightweight block header walker for .blend files.
+
+Reads a blend file by walking the chain of block headers (BHeads) with
+``struct`` and seeking over the bodies of blocks that aren't needed. Only the
+SDNA (DNA1 block) and the requested block types are read and decoded, so
+getting a few small blocks out of a large scene costs little more than reading
+its headers.
+
+Parsed SDNAs are cached process-wide, keyed by a hash of the DNA1 block,
+pointer size and endianness. All files written by the same Blender version
+share one SDNA, so after the first file of each version the DNA1 block is
+only hashed, not parsed.
+
+Gzip and Zstandard compressed files are decompressed on the fly. For
+Zstandard files in the seekable format Blender writes, skipped block bodies
+jump directly between frames, so frames that contain no needed data are never
+decompressed.
+"""
+
+import gzip
+import hashlib
+import io
+import mmap
+import os
+import re
+import struct
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import zstandard
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Zstandard seekable format: a skippable frame holding the seek table, ending in a footer
+SKIPPABLE_FRAME_MAGIC = 0x184D2A5E
+SEEKABLE_FOOTER_MAGIC = 0x8F92EAB1
+
+_ARRAY_SIZE_RE = re.compile(rb'\[(\d+)\]')
+
+# (DNA1 digest, pointer size, little endian) -> parsed SDNA, shared by all files
+_SDNA_CACHE_SIZE = 32
+_sdna_cache: Dict[Tuple[bytes, int, bool], 'SDNA'] = {}
+_sdna_cache_lock = threading.Lock()
+
+
+@dataclass
+class BlendFileHeader:
+    """Information from the file header of a blend file."""
+    pointer_size: int
+    little_endian: bool
+    file_format_version: int  # 0 for the legacy 12 byte header
+    version: int  # Blender version, e.g. 279
+
+    @property
+    def size(self) -> int:
+        """Size of the file header in bytes."""
+        return 12 if self.file_format_version == 0 else 17
+
+    @property
+    def endian_str(self) -> str:
+        """Byte order prefix for ``struct`` formats."""
+        return '<' if self.little_endian else '>'
+
+
+@dataclass
+class Block:
+    """A block read from a blend file."""
+    code: bytes
+    sdna_index: int
+    count: int
+    data: Union[bytes, memoryview]
+    offset: int  # Position of the block data in the (uncompressed) file
+
+
+@dataclass
+class StructLayout:
+    """Memory layout of a DNA struct."""
+    name: str
+    size: int
+    # Field name (without pointer/array decoration) -> (offset, size, type name)
+    fields: Dict[str, Tuple[int, int, str]] = field(default_factory=dict)
+
+    def read_string(self, data: bytes, field_name: str) -> Optional[bytes]:
+        """Read a char array field, up to the first NUL byte.
+
+        Args:
+            data: Block data of a struct with this layout
+            field_name: Name of the field to read
+
+        Returns:
+            Field value, or None if the struct has no such field
+        """
+        try:
+            offset, size, _ = self.fields[field_name]
+        except KeyError:
+            return None
+        return bytes(data[offset:offset + size]).split(b'\0', 1)[0]
+
+
+def read_file_header(fileobj: BinaryIO) -> BlendFileHeader:
+    """Read the file header of an uncompressed blend file.
+
+    Leaves the file positioned at the first block header.
+
+    Raises:
+        ValueError: If this is not a (supported) blend file
+    """
+    magic = fileobj.read(7)
+    if magic != b'BLENDER':
+        raise ValueError(f"Invalid blend file magic {magic!r}")
+
+    byte_7 = fileobj.read(1)
+    if byte_7 in (b'_', b'-'):
+        # Legacy header: BLENDER-v279
+        pointer_size = 4 if byte_7 == b'_' else 8
+        endian = fileobj.read(1)
+        if endian not in (b'v', b'V'):
+            raise ValueError(f"Invalid endian indicator {endian!r}")
+        return BlendFileHeader(
+            pointer_size=pointer_size,
+            little_endian=endian == b'v',
+            file_format_version=0,
+            version=int(fileobj.read(3))
+        )
+
+    # Blender 5.0+ header: BLENDER17-01v0500
+    rest = fileobj.read(9)
+    if byte_7 + rest[:1] != b'17' or rest[1:2] != b'-' or rest[4:5] != b'v':
+        raise ValueError("Invalid blend file header")
+    file_format_version = int(rest[2:4])
+    if file_format_version != 1:
+        raise ValueError(f"Unsupported file format version {file_format_version}")
+    return BlendFileHeader(
+        pointer_size=8,
+        little_endian=True,
+        file_format_version=file_format_version,
+        version=int(rest[5:9])
+    )
+
+
+def _bhead_reader(header: BlendFileHeader):
+    """Get the struct and a function returning (code, length, sdna_index, count)."""
+    endian = header.endian_str
+    if header.file_format_version == 1:
+        bhead = struct.Struct(endian + '4siQqq')
+        return bhead, lambda code, sdna_index, old, length, count: (code, length, sdna_index, count)
+
+    pointer = 'I' if header.pointer_size == 4 else 'Q'
+    bhead = struct.Struct(endian + '4si' + pointer + 'ii')
+    return bhead, lambda code, length, old, sdna_index, count: (code, length, sdna_index, count)
+
+
+def _field_base_name(name: bytes) -> str:
+    """Strip pointer, function pointer and array decoration from a DNA field name."""
+    base = name.lstrip(b'*(').split(b'[', 1)[0].split(b')', 1)[0]
+    return base.decode('ascii', errors='replace')
+
+
+def _field_size(name: bytes, type_size: int, pointer_size: int) -> int:
+    """Get the size in bytes of a DNA field."""
+    count = 1
+    for array_size in _ARRAY_SIZE_RE.findall(name):
+        count *= int(array_size)
+    if name.startswith(b'*') or name.startswith(b'(*'):
+        return pointer_size * count
+    return type_size * count
+
+
+class SDNA:
+    """Struct definitions from the DNA1 block of a blend file.
+
+    Struct layouts are computed lazily and memoized, so only the structs of
+    blocks that are actually decoded cost anything beyond parsing the tables.
+    """
+
+    def __init__(self, data: bytes, header: BlendFileHeader):
+        """Parse the SDNA tables.
+
+        Args:
+            data: Body of the DNA1 block
+            header: File header of the blend file the block came from
+
+        Raises:
+            ValueError: If the data is not a valid SDNA
+        """
+        self.pointer_size = header.pointer_size
+        endian = header.endian_str
+        int_struct = struct.Struct(endian + 'i')
+
+        if data[:4] != b'SDNA':
+            raise ValueError("DNA1 block does not start with SDNA")
+        offset = 4
+
+        def expect(marker: bytes):
+            nonlocal offset
+            # Sections are 4-byte aligned
+            offset = (offset + 3) & ~3
+            if data[offset:offset + 4] != marker:
+                raise ValueError(f"Expected {marker!r} in SDNA")
+            offset += 4
+
+        def read_strings() -> List[bytes]:
+            nonlocal offset
+            count = int_struct.unpack_from(data, offset)[0]
+            offset += 4
+            strings = []
+            for _ in range(count):
+                end = data.index(b'\0', offset)
+                strings.append(data[offset:end])
+                offset = end + 1
+            return strings
+
+        expect(b'NAME')
+        self.names = read_strings()
+        expect(b'TYPE')
+        self.types = read_strings()
+
+        expect(b'TLEN')
+        count = len(self.types)
+        self.type_lengths = list(struct.unpack_from(f'{endian}{count}H', data, offset))
+        offset += 2 * count
+
+        expect(b'STRC')
+        struct_count = int_struct.unpack_from(data, offset)[0]
+        offset += 4
+        # Struct index -> (type index, [(field type index, field name index), ...])
+        self.structs: List[Tuple[int, List[Tuple[int, int]]]] = []
+        for _ in range(struct_count):
+            type_index, field_count = struct.unpack_from(endian + 'hh', data, offset)
+            offset += 4
+            fields = struct.unpack_from(f'{endian}{field_count * 2}h', data, offset)
+            offset += 4 * field_count
+            self.structs.append((type_index, list(zip(fields[0::2], fields[1::2]))))
+
+        self._layouts: Dict[int, StructLayout] = {}
+        self._struct_indices: Optional[Dict[bytes, int]] = None
+
+    def struct_name(self, struct_index: int) -> str:
+        """Get the type name of a struct."""
+        return self.types[self.structs[struct_index][0]].decode('ascii', errors='replace')
+
+    def layout(self, struct_index: int) -> StructLayout:
+        """Get the layout of a struct by its SDNA index."""
+        layout = self._layouts.get(struct_index)
+        if layout is not None:
+            return layout
+
+        type_index, fields = self.structs[struct_index]
+        layout = StructLayout(
+            name=self.types[type_index].decode('ascii', errors='replace'),
+            size=self.type_lengths[type_index]
+        )
+        offset = 0
+        for field_type, field_name in fields:
+            name = self.names[field_name]
+            size = _field_size(name, self.type_lengths[field_type], self.pointer_size)
+            type_name = self.types[field_type].decode('ascii', errors='replace')
+            layout.fields.setdefault(_field_base_name(name), (offset, size, type_name))
+            offset += size
+
+        self._layouts[struct_index] = layout
+        return layout
+
+    def layout_by_name(self, type_name: str) -> Optional[StructLayout]:
+        """Get the layout of a struct by its type name, e.g. ``"ID"``.
+
+        Returns:
+            Layout of the struct, or None if the SDNA has no such struct
+        """
+        if self._struct_indices is None:
+            self._struct_indices = {self.types[type_index]: index
+                                    for index, (type_index, _) in enumerate(self.structs)}
+        struct_index = self._struct_indices.get(type_name.encode('ascii'))
+        if struct_index is None:
+            return None
+        return self.layout(struct_index)
+
+
+def get_sdna(data: Union[bytes, memoryview], header: BlendFileHeader) -> SDNA:
+    """Get the parsed SDNA for a DNA1 block, parsing it only once per process.
+
+    Args:
+        data: Body of the DNA1 block
+        header: File header of the blend file the block came from
+
+    Returns:
+        Shared SDNA instance for this DNA1 block
+    """
+    key = (hashlib.blake2b(data, digest_size=16).digest(), header.pointer_size, header.little_endian)
+    with _sdna_cache_lock:
+        sdna = _sdna_cache.get(key)
+    if sdna is not None:
+        return sdna
+
+    sdna = SDNA(bytes(data), header)
+    with _sdna_cache_lock:
+        if len(_sdna_cache) >= _SDNA_CACHE_SIZE:
+            # Drop the oldest entry, there are only a handful of Blender versions in use
+            del _sdna_cache[next(iter(_sdna_cache))]
+        _sdna_cache[key] = sdna
+    return sdna
+
+
+def _read_seek_table(fileobj: BinaryIO) -> Optional[List[Tuple[int, int, int, int]]]:
+    """Read the seek table of a Zstandard file in the seekable format.
+
+    Returns:
+        List of (compressed offset, compressed size, decompressed offset,
+        decompressed size) per frame, or None if the file has no seek table
+    """
+    fileobj.seek(0, os.SEEK_END)
+    file_size = fileobj.tell()
+    if file_size < 17:
+        return None
+
+    fileobj.seek(-9, os.SEEK_END)
+    frame_count, descriptor, magic = struct.unpack('<IBI', fileobj.read(9))
+    if magic != SEEKABLE_FOOTER_MAGIC:
+        return None
+
+    # Entries have an optional checksum
+    entry_size = 12 if descriptor & 0x80 else 8
+    table_size = frame_count * entry_size
+    if table_size + 17 > file_size:
+        return None
+
+    fileobj.seek(-(table_size + 17), os.SEEK_END)
+    frame_magic, frame_size = struct.unpack('<II', fileobj.read(8))
+    if frame_magic != SKIPPABLE_FRAME_MAGIC or frame_size != table_size + 9:
+        return None
+    table = fileobj.read(table_size)
+
+    frames = []
+    compressed_offset = decompressed_offset = 0
+    for index in range(frame_count):
+        compressed_size, decompressed_size = struct.unpack_from('<II', table, index * entry_size)
+        frames.append((compressed_offset, compressed_size, decompressed_offset, decompressed_size))
+        compressed_offset += compressed_size
+        decompressed_offset += decompressed_size
+    return frames
+
+
+class SeekableZstdReader(io.RawIOBase):
+    """Read-only file object over a Zstandard file in the seekable format.
+
+    Frames are independent, so a seek only decompresses the frame it lands
+    in. The most recently used frame is kept decompressed.
+    """
+
+    def __init__(self, fileobj: BinaryIO, frames: List[Tuple[int, int, int, int]]):
+        """Initialize the reader.
+
+        Args:
+            fileobj: Compressed file, owned (and closed) by the reader
+            frames: Seek table as returned by ``_read_seek_table``
+        """
+        super().__init__()
+        self._fileobj = fileobj
+        self._frames = frames
+        self._frame_starts = [frame[2] for frame in frames]
+        self._size = frames[-1][2] + frames[-1][3] if frames else 0
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._position = 0
+        self._frame_index = -1
+        self._frame_data = b''
+        self.frames_decompressed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._size
+        self._position = max(0, offset)
+        return self._position
+
+    def _load_frame(self, index: int):
+        """Decompress a frame, unless it is the current one."""
+        if index == self._frame_index:
+            return
+        compressed_offset, compressed_size, _, decompressed_size = self._frames[index]
+        self._fileobj.seek(compressed_offset)
+        self._frame_data = self._decompressor.decompress(
+            self._fileobj.read(compressed_size), max_output_size=decompressed_size)
+        self._frame_index = index
+        self.frames_decompressed += 1
+
+    def read(self, size: int = -1) -> bytes:
+        end = self._size if size is None or size < 0 else min(self._position + size, self._size)
+        chunks = []
+        while self._position < end:
+            index = bisect_right(self._frame_starts, self._position) - 1
+            self._load_frame(index)
+            frame_offset = self._position - self._frame_starts[index]
+            chunk = self._frame_data[frame_offset:frame_offset + end - self._position]
+            if not chunk:
+                break
+            chunks.append(chunk)
+            self._position += len(chunk)
+        return b''.join(chunks)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._fileobj.close()
+        super().close()
+
+
+def _open_uncompressed(path: Path) -> BinaryIO:
+    """Open a blend file for reading, decompressing gzip and Zstandard on the fly."""
+    fileobj = open(path, 'rb')
+    magic = fileobj.read(4)
+    fileobj.seek(0)
+
+    if magic[:2] == GZIP_MAGIC:
+        fileobj.close()
+        return gzip.open(path, 'rb')
+    if magic == ZSTD_MAGIC:
+        frames = _read_seek_table(fileobj)
+        if frames:
+            return SeekableZstdReader(fileobj, frames)
+        # Plain Zstandard stream: seeking forward decompresses and discards
+        fileobj.seek(0)
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, read_across_frames=True)
+    return fileobj
+
+
+def read_blocks(blend_file: Union[str, Path],
+                codes: Iterable[bytes]) -> Tuple[BlendFileHeader, Optional[SDNA], List[Block]]:
+    """Read blocks of the given types by walking the block headers.
+
+    The bodies of all other blocks are skipped with a seek.
+
+    Args:
+        blend_file: Path to the blend file
+        codes: Block codes to read, e.g. ``[b"LI"]``
+
+    Returns:
+        Tuple of (file header, SDNA or None if the file has no DNA1 block,
+        blocks in file order)
+
+    Raises:
+        ValueError: If the file is not a blend file the walker can read
+        OSError: If the file can't be read
+    """
+    with _open_uncompressed(Path(blend_file)) as fileobj:
+        return walk_blocks(fileobj, codes)
+
+
+def walk_blocks(fileobj: BinaryIO,
+                codes: Iterable[bytes]) -> Tuple[BlendFileHeader, Optional[SDNA], List[Block]]:
+    """Read blocks of the given types from an open, uncompressed blend file.
+
+    Like ``read_blocks``, for callers that keep the file open, e.g. to write
+    to the returned blocks at their ``offset``.
+
+    Raises:
+        ValueError: If the file is not a blend file the walker can read
+    """
+    wanted = set(codes)
+    blocks: List[Block] = []
+    sdna = None
+
+    fileobj.seek(0)
+    header = read_file_header(fileobj)
+    bhead, fields = _bhead_reader(header)
+
+    while True:
+        raw = fileobj.read(bhead.size)
+        if len(raw) < bhead.size:
+            break
+        code, length, sdna_index, count = fields(*bhead.unpack(raw))
+        # Two-letter codes like b"LI" are padded with NUL bytes
+        code = code.partition(b'\0')[0]
+        if code == b'ENDB':
+            break
+        if length < 0:
+            raise ValueError(f"Invalid block length {length}")
+
+        if code == b'DNA1':
+            sdna = get_sdna(fileobj.read(length), header)
+        elif code in wanted:
+            offset = fileobj.tell()
+            blocks.append(Block(code=code, sdna_index=sdna_index, count=count,
+                                data=fileobj.read(length), offset=offset))
+        else:
+            fileobj.seek(length, os.SEEK_CUR)
+
+    return header, sdna, blocks
+
+
+@contextmanager
+def mmap_blocks(blend_file: Union[str, Path],
+                codes: Iterable[bytes]) -> Iterator[Tuple[BlendFileHeader, Optional[SDNA], List[Block]]]:
+    """Memory-map an uncompressed blend file and walk its block headers.
+
+    Block headers are unpacked straight from the mapping and the returned
+    blocks' ``data`` are ``memoryview`` slices of it, so nothing is copied
+    until a field is decoded. The views are released when the context exits.
+
+    Args:
+        blend_file: Path to the blend file
+        codes: Block codes to read, e.g. ``[b"LI"]``
+
+    Yields:
+        Tuple of (file header, SDNA or None if the file has no DNA1 block,
+        blocks in file order)
+
+    Raises:
+        ValueError: If the file is compressed, empty or not a blend file the walker can read
+        OSError: If the file can't be read
+    """
+    wanted = set(codes)
+    blocks: List[Block] = []
+
+    with open(blend_file, 'rb') as fileobj, \
+            mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            if view[:2] == GZIP_MAGIC or view[:4] == ZSTD_MAGIC:
+                raise ValueError("Compressed blend files can't be memory-mapped")
+
+            header = read_file_header(io.BytesIO(view[:17].tobytes()))
+            bhead, fields = _bhead_reader(header)
+            sdna = None
+            offset = header.size
+            end = len(view)
+
+            while offset + bhead.size <= end:
+                code, length, sdna_index, count = fields(*bhead.unpack_from(view, offset))
+                offset += bhead.size
+                # Two-letter codes like b"LI" are padded with NUL bytes
+                code = code.partition(b'\0')[0]
+                if code == b'ENDB':
+                    break
+                if length < 0 or offset + length > end:
+                    raise ValueError(f"Invalid block length {length}")
+
+                if code == b'DNA1':
+                    with view[offset:offset + length] as dna:
+                        sdna = get_sdna(dna, header)
+                elif code in wanted:
+                    blocks.append(Block(code=code, sdna_index=sdna_index, count=count,
+                                        data=view[offset:offset + length], offset=offset))
+                offset += length
+
+            yield header, sdna, blocks
+        finally:
+            # The mapping can only be closed once all views on it are released
+            for block in blocks:
+                block.data.release()
+            view.release()
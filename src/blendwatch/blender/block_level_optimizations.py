@@ -7,25 +7,253 @@ block-level access capabilities to read only the necessary data from .blend file
 
 import logging
 import os
+import struct
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Set
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union, Set
 from blender_asset_tracer import blendfile
+from blendwatch.blender.blend_headers import SDNA, Block, StructLayout, mmap_blocks, read_blocks
 from blendwatch.utils.path_utils import resolve_path
 from blendwatch.utils import bytes_to_string
 
 log = logging.getLogger(__name__)
 
+# Ways the header walker can read a file, see read_library_entries()
+READER_BACKENDS = ("stream", "mmap")
+
+
+def resolve_library_path(blend_file_path: Path, library_path: str) -> str:
+    """Resolve a library path as stored in a blend file to an absolute path.
+    
+    Blender relative paths (starting with ``//``) and paths without a prefix are
+    resolved relative to the blend file's directory, absolute paths are only
+    normalized. This is pure string work and does not touch the filesystem.
+    
+    Args:
+        blend_file_path: Path of the blend file containing the library path
+        library_path: Library path as stored in the blend file
+        
+    Returns:
+        Absolute, normalized library path
+    """
+    base_dir = os.fspath(Path(blend_file_path).parent)
+    
+    # Handle Blender's relative path prefix "//"
+    if library_path.startswith("//"):
+        return os.path.abspath(os.path.normpath(os.path.join(base_dir, library_path[2:])))
+    
+    # For absolute paths, just normalize them
+    library_path = os.path.normpath(library_path)
+    if os.path.isabs(library_path):
+        return library_path
+    
+    # If it's neither a relative path starting with "//" nor an absolute path,
+    # it might be a relative path without the prefix. Treat it as such.
+    return os.path.abspath(os.path.normpath(os.path.join(base_dir, library_path)))
+
+
+def library_field_names(layout: StructLayout) -> Tuple[str, str]:
+    """Get the Library fields holding the stored and the absolute path.
+    
+    Blender 2.93+ stores the path in ``filepath`` and the absolute path in
+    ``filepath_abs``, older versions use ``name`` and ``filepath``.
+    
+    Returns:
+        Tuple of (stored path field, absolute path field)
+    """
+    if "name" in layout.fields:
+        return "name", "filepath"
+    return "filepath", "filepath_abs"
+
+
+def decode_library_block(layout: StructLayout, data: bytes) -> Optional[Tuple[str, str]]:
+    """Decode the stored and the absolute path of a Library block.
+    
+    Args:
+        layout: Layout of the Library struct
+        data: Block data
+        
+    Returns:
+        Tuple of (name, filepath), or None if the block has no path
+    """
+    name_field, filepath_field = library_field_names(layout)
+    name = layout.read_string(data, name_field)
+    filepath = layout.read_string(data, filepath_field) or name
+    
+    if not name or not filepath:
+        return None
+    return bytes_to_string(name), bytes_to_string(filepath)
+
+
+def _decode_library_blocks(sdna: SDNA, blocks: List[Block]) -> List[Tuple[str, str]]:
+    """Decode (name, filepath) of Library blocks read by the header walker."""
+    library_entries = []
+    for block in blocks:
+        try:
+            entry = decode_library_block(sdna.layout(block.sdna_index), block.data)
+        except (IndexError, struct.error) as e:
+            log.debug(f"Could not read library block: {e}")
+            continue
+        if entry is not None:
+            library_entries.append(entry)
+    return library_entries
+
+
+def _walk_and_decode(blend_file: Union[str, Path], codes: List[bytes], backend: str,
+                     decode: Callable[[SDNA, List[Block]], list]) -> Optional[list]:
+    """Read blocks with the header walker and decode them while they are mapped/read."""
+    if backend == "mmap":
+        try:
+            with mmap_blocks(blend_file, codes) as (_, sdna, blocks):
+                if not blocks:
+                    return []
+                if sdna is not None:
+                    return decode(sdna, blocks)
+        except ValueError as e:
+            log.debug(f"Can't memory-map {blend_file} ({e}), reading it instead")
+    
+    try:
+        _, sdna, blocks = read_blocks(blend_file, codes)
+    except ValueError as e:
+        log.debug(f"Header walker can't read {blend_file}: {e}")
+        return None
+    if blocks and sdna is None:
+        return None
+    return decode(sdna, blocks)
+
+
+def read_library_entries(blend_file: Union[str, Path],
+                         backend: str = "stream") -> Optional[List[Tuple[str, str]]]:
+    """Read (name, filepath) of all Library blocks with the header walker.
+    
+    Args:
+        blend_file: Path to the .blend file
+        backend: ``"stream"`` reads with file reads and seeks and handles
+            compressed files. ``"mmap"`` memory-maps the file and decodes
+            through memoryview slices without copying block data; it is meant
+            for uncompressed files on local disks and falls back to
+            ``"stream"`` for anything it can't map.
+        
+    Returns:
+        List of (name, filepath) as stored in the file, or None if the header
+        walker can't read the file
+        
+    Raises:
+        OSError: If the file can't be read
+    """
+    return _walk_and_decode(blend_file, [b"LI"], backend, _decode_library_blocks)
+
+
+@contextmanager
+def _open_blend_file(blend_file: Union[str, Path]) -> Iterator[blendfile.BlendFile]:
+    """Open a blend file with blender-asset-tracer, closing its file cache afterwards.
+    
+    ``blendfile.open_cached()`` keeps every file it opened, with its file
+    handle and parsed blocks, until ``blendfile.close_all_cached()`` is
+    called, which this does when the block exits.
+    
+    Args:
+        blend_file: Path to the blend file
+    """
+    try:
+        yield blendfile.open_cached(Path(blend_file), mode="rb")
+    finally:
+        blendfile.close_all_cached()
+
+
+def _read_library_entries_bat(blend_file: Union[str, Path]) -> List[Tuple[str, str]]:
+    """Read (name, filepath) of all Library blocks using blender-asset-tracer."""
+    library_entries = []
+    
+    with _open_blend_file(blend_file) as bf:
+        # Get only Library blocks using the efficient code_index
+        for lib_block in bf.code_index.get(b"LI", []):
+            try:
+                name = lib_block.get(b"name", default=None)
+                filepath = lib_block.get(b"filepath", default=None) or name
+                
+                if name and filepath:
+                    library_entries.append((bytes_to_string(name), bytes_to_string(filepath)))
+                    
+            except Exception as e:
+                log.debug(f"Could not read library block: {e}")
+                continue
+    
+    return library_entries
+
+
+@dataclass
+class LibraryScan:
+    """Library blocks of a blend file, read once per pipeline run.
+    
+    A scan is produced by ``scan_libraries()`` and handed from stage to stage
+    (discovery, backlink matching, path rewriting), so no stage has to open
+    the file again just to find out what the previous stage already knew.
+    
+    Attributes:
+        path: Path of the blend file
+        library_entries: (name, filepath) of all Library blocks, as stored in the file
+    """
+    path: Path
+    library_entries: List[Tuple[str, str]] = field(default_factory=list)
+    
+    @property
+    def has_libraries(self) -> bool:
+        """Whether the file links any libraries."""
+        return bool(self.library_entries)
+    
+    @property
+    def raw_library_paths(self) -> Dict[str, str]:
+        """Library names mapped to their paths as stored in the file."""
+        return dict(self.library_entries)
+    
+    @property
+    def library_paths(self) -> Dict[str, str]:
+        """Library names mapped to their paths resolved relative to the file, as cached."""
+        return {name: resolve_library_path(self.path, lib_path) for name, lib_path in self.library_entries}
+
+
+def scan_libraries(blend_file: Union[str, Path], backend: str = "stream") -> LibraryScan:
+    """Read the Library blocks of a blend file with a single open.
+    
+    Uses the header walker and falls back to blender-asset-tracer for files
+    the walker can't read.
+    
+    Args:
+        blend_file: Path to the .blend file
+        backend: How the header walker reads the file, see ``READER_BACKENDS``
+        
+    Returns:
+        LibraryScan of the file
+        
+    Raises:
+        OSError: If the file can't be read
+    """
+    library_entries = read_library_entries(blend_file, backend=backend)
+    if library_entries is None:
+        log.debug(f"Header walker can't read {blend_file}, using blender-asset-tracer")
+        library_entries = _read_library_entries_bat(blend_file)
+    return LibraryScan(Path(blend_file), library_entries)
+
 
 class FastLibraryReader:
     """Ultra-fast library reader using block-level optimizations."""
     
-    def __init__(self, blend_file_path: Union[str, Path]):
+    def __init__(self, blend_file_path: Union[str, Path], backend: str = "stream"):
         """Initialize the fast reader.
         
         Args:
             blend_file_path: Path to the .blend file
+            backend: How the header walker reads the file, see ``READER_BACKENDS``
         """
+        if backend not in READER_BACKENDS:
+            raise ValueError(f"Unknown reader backend: {backend}")
         self.blend_file_path = resolve_path(str(blend_file_path))
+        self.backend = backend
         self._cached_libraries: Optional[Dict[str, str]] = None
         self._file_mtime: Optional[float] = None
         self._path_resolution_cache: Dict[str, str] = {}
@@ -34,10 +262,10 @@ class FastLibraryReader:
         """Get library paths with minimal I/O operations.
         
         This implementation uses several optimizations:
-        1. Only reads Library (LI) block headers, not full data
-        2. Uses selective field reading to get only name and filepath
+        1. Walks the block headers and seeks over all block bodies except LI and DNA1
+        2. Decodes only the name and filepath fields of Library blocks
         3. Implements lazy loading with mtime-based cache invalidation
-        4. Avoids reading DNA1 blocks unless absolutely necessary
+        4. Falls back to blender-asset-tracer for files the header walker can't read
         
         Args:
             resolve_paths: If True (default), resolves paths to absolute. If False, returns raw paths.
@@ -58,48 +286,21 @@ class FastLibraryReader:
         library_paths = {}
         
         try:
-            # Use cached blend file opening for persistence
-            with blendfile.open_cached(self.blend_file_path, mode="rb") as bf:
-                # Get only Library blocks using the efficient code_index
-                library_blocks = bf.code_index.get(b"LI", [])
-                
-                if not library_blocks:
-                    # Early return if no libraries
-                    self._cached_libraries = library_paths
-                    self._file_mtime = current_mtime
-                    return library_paths
-                
-                # Process each library block with minimal field access
-                for lib_block in library_blocks:
-                    try:
-                        # Only read the specific fields we need
-                        # This avoids loading the entire block data
-                        name = self._read_library_field(lib_block, b"name")
-                        filepath = self._read_library_field(lib_block, b"filepath", fallback_field=b"name")
-                        
-                        if name and filepath:
-                            # Convert bytes to string with minimal processing
-                            name_str = self._bytes_to_string(name)
-                            filepath_str = self._bytes_to_string(filepath)
-
-                            # Don't normalize Blender relative paths (starting with //)
-                            # as os.path.normpath would incorrectly convert them
-                            if not filepath_str.startswith("//"):
-                                # Only normalize non-Blender paths
-                                filepath_str = os.path.normpath(filepath_str)
-
-                            # Resolve the path efficiently
-                            resolved_path = self._resolve_library_path(filepath_str)
-                            library_paths[name_str] = resolved_path
-                            
-                    except Exception as e:
-                        log.debug(f"Could not read library block: {e}")
-                        continue
-        
+            library_entries = self._read_library_entries()
         except Exception as e:
             log.warning(f"Failed to read libraries from {self.blend_file_path}: {e}")
             return {}
         
+        for name_str, filepath_str in library_entries:
+            # Don't normalize Blender relative paths (starting with //)
+            # as os.path.normpath would incorrectly convert them
+            if not filepath_str.startswith("//"):
+                # Only normalize non-Blender paths
+                filepath_str = os.path.normpath(filepath_str)
+            
+            # Resolve the path efficiently
+            library_paths[name_str] = self._resolve_library_path(filepath_str)
+        
         # Cache the results
         self._cached_libraries = library_paths
         self._file_mtime = current_mtime
@@ -113,101 +314,33 @@ class FastLibraryReader:
         Returns:
             Dictionary mapping library names to their file paths as stored in the .blend file
         """
-        library_paths = {}
-        
         try:
-            # Use cached blend file opening for persistence
-            with blendfile.open_cached(self.blend_file_path, mode="rb") as bf:
-                # Get only Library blocks using the efficient code_index
-                library_blocks = bf.code_index.get(b"LI", [])
-                
-                # Process each library block with minimal field access
-                for lib_block in library_blocks:
-                    try:
-                        # Only read the specific fields we need
-                        name = self._read_library_field(lib_block, b"name")
-                        filepath = self._read_library_field(lib_block, b"filepath", fallback_field=b"name")
-                        
-                        if name and filepath:
-                            # Convert bytes to string with minimal processing
-                            name_str = self._bytes_to_string(name)
-                            filepath_str = self._bytes_to_string(filepath)
-                            library_paths[name_str] = filepath_str
-                            
-                    except Exception:
-                        continue
-        
+            return dict(self._read_library_entries())
         except Exception:
             return {}
-            
-        return library_paths
+    
+    def _read_library_entries(self) -> List[Tuple[str, str]]:
+        """Read (name, filepath) of all Library blocks, as stored in the file.
+        
+        Walks the block headers and reads only the LI and DNA1 blocks.
+        """
+        return scan_libraries(self.blend_file_path, backend=self.backend).library_entries
     
     def _resolve_library_path(self, library_path: str) -> str:
         """Resolve a library path, using a cache to speed up the process."""
         if library_path in self._path_resolution_cache:
             return self._path_resolution_cache[library_path]
 
-        # Handle Blender's relative path prefix "//"
-        if library_path.startswith("//"):
-            try:
-                # Resolve relative to the .blend file's directory
-                base_dir = self.blend_file_path.parent
-                # Use os.path.abspath and os.path.normpath for robust resolution
-                resolved = os.path.abspath(os.path.normpath(os.path.join(base_dir, library_path[2:])))
-                self._path_resolution_cache[library_path] = resolved
-                return resolved
-            except Exception as e:
-                log.debug(f"Could not resolve relative path {library_path}: {e}")
-                # Fallback to the original path on error
-                self._path_resolution_cache[library_path] = library_path
-                return library_path
-        
-        # For absolute paths, just normalize them
-        if os.path.isabs(library_path):
-            try:
-                resolved = os.path.normpath(library_path)
-                self._path_resolution_cache[library_path] = resolved
-                return resolved
-            except Exception:
-                return library_path # Fallback
-
-        # If it's neither a relative path starting with "//" nor an absolute path,
-        # it might be a relative path without the prefix. Treat it as such.
         try:
-            base_dir = self.blend_file_path.parent
-            resolved = os.path.abspath(os.path.normpath(os.path.join(base_dir, library_path)))
-            self._path_resolution_cache[library_path] = resolved
-            return resolved
-        except Exception:
-            # Final fallback
-            return library_path
+            resolved = resolve_library_path(self.blend_file_path, library_path)
+        except Exception as e:
+            log.debug(f"Could not resolve library path {library_path}: {e}")
+            # Fallback to the original path on error
+            resolved = library_path
+
+        self._path_resolution_cache[library_path] = resolved
+        return resolved
 
-    def _read_library_field(self, block, field_name: bytes, fallback_field: Optional[bytes] = None):
-        """Read a specific field from a library block with minimal I/O.
-        
-        Args:
-            block: The library block
-            field_name: Name of the field to read
-            fallback_field: Optional fallback field if primary field doesn't exist
-            
-        Returns:
-            Field value or None if not found
-        """
-        try:
-            # Try the primary field
-            return block[field_name]
-        except KeyError:
-            if fallback_field:
-                try:
-                    return block[fallback_field]
-                except KeyError:
-                    pass
-            return None
-    
-    def _bytes_to_string(self, data) -> str:
-        """Convert bytes to string with minimal processing."""
-        return bytes_to_string(data)
-    
     def _get_file_mtime(self) -> float:
         """Get file modification time."""
         try:
@@ -224,13 +357,18 @@ class FastLibraryReader:
 class StreamingLibraryScanner:
     """Streaming scanner for processing large numbers of blend files efficiently."""
     
-    def __init__(self, max_open_files: int = 10):
+    def __init__(self, max_open_files: int = 10, backend: Optional[str] = None):
         """Initialize the streaming scanner.
         
         Args:
             max_open_files: Maximum number of files to keep open simultaneously
+            backend: Header walker backend to read files with (see ``READER_BACKENDS``).
+                If None, files are opened with blender-asset-tracer.
         """
+        if backend is not None and backend not in READER_BACKENDS:
+            raise ValueError(f"Unknown reader backend: {backend}")
         self.max_open_files = max_open_files
+        self.backend = backend
         self._open_files: Dict[Path, blendfile.BlendFile] = {}
         self._access_order: List[Path] = []
     
@@ -251,21 +389,27 @@ class StreamingLibraryScanner:
         """
         results = {}
         
-        for blend_file in blend_files:
-            try:
-                library_paths = self._get_libraries_from_open_file(blend_file)
-                if library_paths:
-                    results[blend_file] = library_paths
-            except Exception as e:
-                log.warning(f"Failed to scan {blend_file}: {e}")
-                continue
-        
-        # Clean up any remaining open files
-        self._cleanup_open_files()
+        try:
+            for blend_file in blend_files:
+                try:
+                    library_paths = self._get_libraries_from_open_file(blend_file)
+                    if library_paths:
+                        results[blend_file] = library_paths
+                except Exception as e:
+                    log.warning(f"Failed to scan {blend_file}: {e}")
+                    continue
+        finally:
+            # Clean up any remaining open files
+            self._cleanup_open_files()
         return results
     
     def _get_libraries_from_open_file(self, blend_file: Path) -> Dict[str, str]:
         """Get libraries from a file, managing the open file cache."""
+        if self.backend is not None:
+            library_entries = read_library_entries(blend_file, backend=self.backend)
+            if library_entries is not None:
+                return dict(library_entries)
+        
         # Get or open the blend file
         bf = self._get_or_open_file(blend_file)
         if not bf:
@@ -313,9 +457,10 @@ class StreamingLibraryScanner:
         
         # Need to open the file
         try:
-            # Check if we need to close old files first
+            # blender-asset-tracer can only close all of its cached files at
+            # once, so they are closed together when the limit is reached
             if len(self._open_files) >= self.max_open_files:
-                self._close_oldest_file()
+                self._cleanup_open_files()
             
             # Open the new file using the cached approach
             bf = blendfile.open_cached(blend_file, mode="rb")
@@ -327,21 +472,9 @@ class StreamingLibraryScanner:
             log.warning(f"Failed to open {blend_file}: {e}")
             return None
     
-    def _close_oldest_file(self):
-        """Close the least recently used file."""
-        if not self._access_order:
-            return
-        
-        oldest_file = self._access_order.pop(0)
-        if oldest_file in self._open_files:
-            try:
-                # Note: Don't manually close cached files, let blender-asset-tracer handle it
-                del self._open_files[oldest_file]
-            except Exception as e:
-                log.debug(f"Error removing file from cache: {e}")
-    
     def _cleanup_open_files(self):
-        """Clean up all open files."""
+        """Close all open files."""
+        blendfile.close_all_cached()
         self._open_files.clear()
         self._access_order.clear()
     
@@ -370,7 +503,7 @@ class SelectiveBlockReader:
         block_types = set()
         
         try:
-            with blendfile.open_cached(blend_file, mode="rb") as bf:
+            with _open_blend_file(blend_file) as bf:
                 # Just get the keys from code_index - this is very fast
                 block_types = set(bf.code_index.keys())
         except Exception as e:
@@ -382,7 +515,8 @@ class SelectiveBlockReader:
     def has_libraries(blend_file: Path) -> bool:
         """Quick check if a file has any library blocks.
         
-        This is much faster than reading the actual library data.
+        Prefer ``scan_libraries()`` when the library paths are needed
+        afterwards, so the file isn't read twice.
         
         Args:
             blend_file: Path to the blend file
@@ -391,8 +525,7 @@ class SelectiveBlockReader:
             True if file contains library blocks
         """
         try:
-            with blendfile.open_cached(blend_file, mode="rb") as bf:
-                return b"LI" in bf.code_index
+            return scan_libraries(blend_file).has_libraries
         except Exception:
             return False
     
@@ -409,7 +542,7 @@ class SelectiveBlockReader:
         counts = {}
         
         try:
-            with blendfile.open_cached(blend_file, mode="rb") as bf:
+            with _open_blend_file(blend_file) as bf:
                 for block_type, blocks in bf.code_index.items():
                     counts[block_type] = len(blocks)
         except Exception as e:
@@ -420,7 +553,8 @@ class SelectiveBlockReader:
 
 # Utility functions for enhanced performance
 
-def get_libraries_ultra_fast(blend_file: Union[str, Path], resolve_paths: bool = True) -> Dict[str, str]:
+def get_libraries_ultra_fast(blend_file: Union[str, Path], resolve_paths: bool = True,
+                             backend: str = "stream") -> Dict[str, str]:
     """Ultra-fast library reading using all optimizations.
     
     This function combines all the block-level optimizations for maximum speed.
@@ -428,40 +562,300 @@ def get_libraries_ultra_fast(blend_file: Union[str, Path], resolve_paths: bool =
     Args:
         blend_file: Path to the .blend file
         resolve_paths: If True (default), resolves paths to absolute. If False, returns raw paths as stored in the file.
+        backend: How the header walker reads the file, see ``READER_BACKENDS``
         
     Returns:
         Dictionary mapping library names to their file paths
     """
     # Create a reader instance just once
-    reader = FastLibraryReader(blend_file)
+    reader = FastLibraryReader(blend_file, backend=backend)
     
     # Use the same underlying method, but add a parameter to control path resolution
     # This eliminates code duplication and makes the function more maintainable
     return reader.get_library_paths_minimal(resolve_paths=resolve_paths)
 
 
-def batch_scan_libraries(blend_files: List[Path], max_workers: int = 4) -> Dict[Path, Dict[str, str]]:
+# Codes of the ID blocks that store a file path, see read_block_paths(): images,
+# sounds, fonts, movie clips and cache files, plus libraries
+ASSET_BLOCK_CODES = (b"IM", b"SO", b"VF", b"MC", b"CF")
+PATH_BLOCK_CODES = (b"LI",) + ASSET_BLOCK_CODES
+
+# Path stored by fonts that use Blender's default font
+BUILTIN_FONT_PATH = b"<builtin>"
+
+
+class BlockPath(NamedTuple):
+    """A file path stored in an ID block.
+    
+    ``name`` is the ID name without its two-letter prefix, except for Library
+    blocks: those use the name ``read_library_entries()`` reports them under,
+    so they line up with the library dictionaries used everywhere else.
+    """
+    code: str  # Block code, e.g. "IM"
+    name: str
+    path: str  # Path as stored in the file
+
+
+def path_field_name(layout: StructLayout) -> str:
+    """Get the field holding the path of an Image, Sound, VFont, MovieClip or CacheFile.
+    
+    Newer Blender versions call it ``filepath``, older ones ``name``.
+    """
+    return "filepath" if "filepath" in layout.fields else "name"
+
+
+def _read_id_name(sdna: SDNA, layout: StructLayout, data: bytes) -> str:
+    """Read the name of an ID block, without its two-letter prefix."""
+    id_layout = sdna.layout_by_name("ID")
+    id_field = layout.fields.get("id")
+    if id_layout is None or id_field is None:
+        return ""
+    offset = id_field[0]
+    name = id_layout.read_string(data[offset:offset + id_layout.size], "name")
+    return bytes_to_string(name)[2:] if name else ""
+
+
+def _is_packed(layout: StructLayout, data: bytes) -> bool:
+    """Check if an asset block is packed into the blend file.
+    
+    Older files point ``packedfile`` at the packed data, newer images keep
+    it in the ``packedfiles`` list.
+    """
+    for field_name in ("packedfile", "packedfiles"):
+        packed_field = layout.fields.get(field_name)
+        if packed_field is not None and any(data[packed_field[0]:packed_field[0] + packed_field[1]]):
+            return True
+    return False
+
+
+def decode_block_path(sdna: SDNA, block: Block) -> Optional[BlockPath]:
+    """Decode the file path of a path-bearing ID block.
+    
+    Like blender-asset-tracer, packed assets and fonts using Blender's
+    default font are skipped: their stored path isn't read from disk.
+    
+    Args:
+        sdna: SDNA of the file the block was read from
+        block: A block with one of the ``PATH_BLOCK_CODES``
+        
+    Returns:
+        BlockPath of the block, or None if it has no path on disk
+    """
+    layout = sdna.layout(block.sdna_index)
+    code = block.code.decode("ascii")
+    
+    if block.code == b"LI":
+        entry = decode_library_block(layout, block.data)
+        return BlockPath(code, *entry) if entry is not None else None
+    
+    path = layout.read_string(block.data, path_field_name(layout))
+    if not path or path == BUILTIN_FONT_PATH or _is_packed(layout, block.data):
+        return None
+    return BlockPath(code, _read_id_name(sdna, layout, block.data), bytes_to_string(path))
+
+
+def _decode_block_paths(sdna: SDNA, blocks: List[Block]) -> List[BlockPath]:
+    """Decode the paths of blocks read by the header walker."""
+    block_paths = []
+    for block in blocks:
+        try:
+            block_path = decode_block_path(sdna, block)
+        except (IndexError, struct.error) as e:
+            log.debug(f"Could not read {block.code!r} block: {e}")
+            continue
+        if block_path is not None:
+            block_paths.append(block_path)
+    return block_paths
+
+
+def read_block_paths(blend_file: Union[str, Path], codes: Iterable[bytes] = PATH_BLOCK_CODES,
+                     backend: str = "stream") -> Optional[List[BlockPath]]:
+    """Read the file paths of all path-bearing ID blocks in one pass.
+    
+    Library, Image, Sound, VFont, MovieClip and CacheFile blocks are decoded
+    from a single walk over the block headers.
+    
+    Args:
+        blend_file: Path to the .blend file
+        codes: Block codes to read, defaults to ``PATH_BLOCK_CODES``
+        backend: How the header walker reads the file, see ``READER_BACKENDS``
+        
+    Returns:
+        BlockPaths in file order, or None if the header walker can't read the file
+        
+    Raises:
+        OSError: If the file can't be read
+    """
+    return _walk_and_decode(blend_file, list(codes), backend, _decode_block_paths)
+
+
+def _read_block_paths_bat(blend_file: Union[str, Path], codes: Iterable[bytes]) -> List[BlockPath]:
+    """Read the file paths of path-bearing ID blocks using blender-asset-tracer."""
+    block_paths = []
+    
+    with _open_blend_file(blend_file) as bf:
+        for code in codes:
+            if code == b"LI":
+                continue
+            for block in bf.code_index.get(code, []):
+                try:
+                    path = block.get(b"filepath", default=None) or block.get(b"name", default=None)
+                    id_name = block.get((b"id", b"name"), default=b"")
+                    packed = (block.get(b"packedfile", default=0) or
+                              block.get((b"packedfiles", b"first"), default=0))
+                except Exception as e:
+                    log.debug(f"Could not read {code!r} block: {e}")
+                    continue
+                if path and path != BUILTIN_FONT_PATH and not packed:
+                    block_paths.append(BlockPath(code.decode("ascii"), bytes_to_string(id_name)[2:],
+                                                 bytes_to_string(path)))
+    
+    return block_paths
+
+
+def scan_block_paths(blend_file: Union[str, Path], codes: Iterable[bytes] = PATH_BLOCK_CODES,
+                     backend: str = "stream") -> List[BlockPath]:
+    """Read the file paths of all path-bearing ID blocks of a blend file.
+    
+    Like ``read_block_paths()``, falling back to blender-asset-tracer for
+    files the header walker can't read.
+    
+    Raises:
+        OSError: If the file can't be read
+    """
+    codes = list(codes)
+    block_paths = read_block_paths(blend_file, codes, backend=backend)
+    if block_paths is not None:
+        return block_paths
+    
+    log.debug(f"Header walker can't read {blend_file}, using blender-asset-tracer")
+    block_paths = []
+    if b"LI" in codes:
+        block_paths.extend(BlockPath("LI", name, path)
+                           for name, path in _read_library_entries_bat(blend_file))
+    block_paths.extend(_read_block_paths_bat(blend_file, codes))
+    return block_paths
+
+
+def _scan_chunk(chunk: List[Tuple[int, str]]) -> List[Tuple[int, List[Tuple[str, str]]]]:
+    """Read the library entries of a chunk of blend files.
+    
+    Runs in a worker process. Workers are reused for all chunks of a batch,
+    so per-process caches stay warm between chunks.
+    
+    Args:
+        chunk: List of (index, blend file path) pairs
+        
+    Returns:
+        List of (index, library entries) pairs for files with libraries
+    """
+    results = []
+    for index, blend_file in chunk:
+        try:
+            scan = scan_libraries(blend_file)
+        except Exception as e:
+            log.debug(f"Failed to scan {blend_file}: {e}")
+            continue
+        if scan.has_libraries:
+            results.append((index, scan.library_entries))
+    return results
+
+
+def iter_library_scans(blend_files: Iterable[Path], max_workers: Optional[int] = None,
+                       chunk_size: int = 32) -> Iterator[LibraryScan]:
+    """Scan blend files for libraries in worker processes, streaming the results.
+    
+    Parsing blend files is CPU-bound pure Python, so the files are split into
+    chunks that are scanned by a process pool. Only a few chunks per worker are
+    in flight at a time, and results are yielded as soon as a chunk completes,
+    in completion order. Small batches are scanned in-process.
+    
+    Every file is opened once; the yielded scans can be passed on to later
+    stages instead of reading the files again.
+    
+    Args:
+        blend_files: Blend files to scan
+        max_workers: Number of worker processes. If None, uses the CPU count.
+        chunk_size: Number of files sent to a worker at once
+        
+    Yields:
+        LibraryScan of every file that has libraries
+    """
+    blend_files = list(blend_files)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    
+    indexed_files = [(index, str(blend_file)) for index, blend_file in enumerate(blend_files)]
+    pending_chunks = deque(indexed_files[i:i + chunk_size]
+                           for i in range(0, len(indexed_files), chunk_size))
+    
+    if max_workers <= 1 or len(pending_chunks) <= 1:
+        for chunk in pending_chunks:
+            for index, library_entries in _scan_chunk(chunk):
+                yield LibraryScan(Path(blend_files[index]), library_entries)
+        return
+    
+    in_flight = {}
+    try:
+        executor = ProcessPoolExecutor(max_workers=min(max_workers, len(pending_chunks)))
+    except (OSError, NotImplementedError) as e:
+        log.warning(f"Could not start worker processes, scanning in-process: {e}")
+        executor = None
+    
+    if executor is not None:
+        try:
+            while pending_chunks or in_flight:
+                while pending_chunks and len(in_flight) < max_workers * 2:
+                    chunk = pending_chunks.popleft()
+                    in_flight[executor.submit(_scan_chunk, chunk)] = chunk
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results = future.result()
+                    del in_flight[future]
+                    for index, library_entries in results:
+                        yield LibraryScan(Path(blend_files[index]), library_entries)
+        except (OSError, BrokenProcessPool) as e:
+            log.warning(f"Worker processes failed, scanning the rest in-process: {e}")
+            pending_chunks.extendleft(in_flight.values())
+            in_flight.clear()
+        finally:
+            executor.shutdown(wait=not in_flight, cancel_futures=True)
+    
+    # Fallback when the process pool is unavailable
+    for chunk in pending_chunks:
+        for index, library_entries in _scan_chunk(chunk):
+            yield LibraryScan(Path(blend_files[index]), library_entries)
+
+
+def iter_scan_libraries(blend_files: Iterable[Path], max_workers: Optional[int] = None,
+                        chunk_size: int = 32) -> Iterator[Tuple[Path, Dict[str, str]]]:
+    """Scan blend files for libraries, streaming (file, libraries) pairs.
+    
+    See ``iter_library_scans()``.
+    
+    Yields:
+        (blend file, library dictionary) pairs for files that have libraries.
+        Library paths are returned as stored in the files.
+    """
+    for scan in iter_library_scans(blend_files, max_workers=max_workers, chunk_size=chunk_size):
+        yield scan.path, scan.raw_library_paths
+
+
+def batch_scan_libraries(blend_files: List[Path], max_workers: Optional[int] = 4,
+                         chunk_size: int = 32) -> Dict[Path, Dict[str, str]]:
     """Scan multiple blend files in parallel with optimized I/O.
     
     Args:
         blend_files: List of blend files to scan
-        max_workers: Number of worker processes
+        max_workers: Number of worker processes. If None, uses the CPU count.
+        chunk_size: Number of files sent to a worker at once
         
     Returns:
-        Dictionary mapping file paths to their library dictionaries
+        Dictionary mapping file paths to their library dictionaries, only for
+        files that have libraries
     """
-    # Filter files that actually have libraries first
-    files_with_libraries = []
-    for blend_file in blend_files:
-        if SelectiveBlockReader.has_libraries(blend_file):
-            files_with_libraries.append(blend_file)
-    
-    if not files_with_libraries:
-        return {}
-    
-    # Use streaming scanner for efficient batch processing
-    scanner = StreamingLibraryScanner()
-    return scanner.scan_libraries_batch(files_with_libraries)
+    return dict(iter_scan_libraries(blend_files, max_workers=max_workers, chunk_size=chunk_size))
 
 
 # The function is_blend_file_modified_recently was removed as it was unused dead code
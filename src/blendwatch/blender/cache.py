@@ -5,64 +5,156 @@ This module provides caching mechanisms to avoid redundant file I/O operations
 and speed up library path discovery and backlink scanning.
 """
 
-import json
 import logging
 import os
+import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Union
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
+from dataclasses import dataclass, field
+
+from blendwatch.blender.block_level_optimizations import BlockPath, resolve_library_path, scan_block_paths
+from blendwatch.utils.fingerprint import IOBudget, file_fingerprint, fingerprint_read_size
+from blendwatch.utils.path_utils import normalize_path
 
 log = logging.getLogger(__name__)
 
+# (st_dev, st_ino, st_mtime_ns, st_size) of a file
+FileIdentity = Tuple[int, int, int, int]
+
+# (asset path, block name, is sequence, usage type) of a traced dependency
+TracedDependency = Tuple[str, str, bool, str]
+
+
+def _library_key(lib_path: str) -> str:
+    """Normalize a resolved library path into a reverse index key."""
+    return normalize_path(lib_path)
+
+
+def _directory_prefix(directory: str) -> str:
+    """Get the reverse index key prefix shared by all paths below a directory."""
+    return os.path.join(_library_key(directory), '')
+
+
+def _library_basename(lib_path: str) -> str:
+    """Get the file name of a library path, handling both separator styles."""
+    return lib_path.replace('\\', '/').rstrip('/').split('/')[-1]
+
+
+def _library_keys(blend_file: str, raw_library_paths: Dict[str, str],
+                  library_paths: Dict[str, str]) -> Dict[str, Set[str]]:
+    """Compute the reverse index keys of each library of a blend file.
+    
+    A library is keyed by its path and by its name, which holds the path as
+    stored in the file, both resolved relative to the blend file. Both differ
+    when the absolute path written by an older Blender is stale.
+    """
+    base_dir = os.path.dirname(blend_file)
+    keys = {}
+    for name, lib_path in library_paths.items():
+        raw_path = raw_library_paths.get(name)
+        library_keys = {normalize_path(raw_path, base_dir) if raw_path else _library_key(lib_path)}
+        if name:
+            library_keys.add(normalize_path(name, base_dir))
+        keys[name] = library_keys
+    return keys
+
+
+def _asset_keys(blend_file: str, block_paths: List[BlockPath]) -> Dict[str, Set[str]]:
+    """Compute the reverse index keys of the image, sound, ... paths of a blend file.
+    
+    Assets are listed under their path as stored in the file, like libraries
+    under their name, and keyed by that path resolved relative to the blend
+    file.
+    """
+    base_dir = os.path.dirname(blend_file)
+    keys: Dict[str, Set[str]] = {}
+    for block_path in block_paths:
+        keys.setdefault(block_path.path, set()).add(normalize_path(block_path.path, base_dir))
+    return keys
+
+
+def _resolve_library_paths(blend_file: str, raw_library_paths: Dict[str, str]) -> Dict[str, str]:
+    """Resolve raw library paths relative to the blend file's location."""
+    resolved = {}
+    for name, raw_path in raw_library_paths.items():
+        try:
+            resolved[name] = resolve_library_path(Path(blend_file), raw_path)
+        except Exception:
+            resolved[name] = raw_path
+    return resolved
+
 
 @dataclass
 class CachedBlendFile:
     """Cached information about a blend file."""
     path: str
-    mtime: float  # Last modified time
+    mtime_ns: int  # Last modified time in nanoseconds
     size: int  # File size
-    library_paths: Dict[str, str]  # Library name -> library path mapping
+    library_paths: Dict[str, str]  # Library name -> resolved library path mapping
     scan_time: float  # When this was last scanned
-
-
-@dataclass
-class LibraryCache:
-    """Cache for library path information."""
-    files: Dict[str, CachedBlendFile]  # file_path -> cached_info
-    version: str = "1.0"
+    dev: int = 0  # Device the file lives on
+    ino: int = 0  # Inode number of the file
+    raw_library_paths: Dict[str, str] = field(default_factory=dict)  # Library name -> path as stored
+    block_paths: List[BlockPath] = field(default_factory=list)  # Image, sound, ... paths as stored
+    library_keys: Dict[str, Set[str]] = field(default_factory=dict)  # Library name -> canonical keys
+    asset_keys: Dict[str, Set[str]] = field(default_factory=dict)  # Stored asset path -> canonical keys
+    fingerprint: Optional[str] = None  # Content fingerprint, if computed
     
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "version": self.version,
-            "files": {path: asdict(cached_file) for path, cached_file in self.files.items()}
-        }
+    def __post_init__(self):
+        if not self.library_keys and self.library_paths:
+            self.library_keys = _library_keys(self.path, self.raw_library_paths, self.library_paths)
+        if not self.asset_keys and self.block_paths:
+            self.asset_keys = _asset_keys(self.path, self.block_paths)
     
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'LibraryCache':
-        """Create from dictionary (JSON deserialization)."""
-        cache = cls(files={})
-        if data.get("version") != "1.0":
-            log.warning("Cache version mismatch, starting fresh")
-            return cache
-        
-        files_data = data.get("files", {})
-        for path, file_data in files_data.items():
-            cache.files[path] = CachedBlendFile(**file_data)
+    def iter_link_keys(self) -> Iterator[Tuple[str, Set[str]]]:
+        """Iterate the reverse index keys of the libraries, then of the assets.
         
-        return cache
+        Yields:
+            Tuples of (library name or stored asset path, canonical keys)
+        """
+        yield from self.library_keys.items()
+        yield from self.asset_keys.items()
+    
+    @property
+    def identity(self) -> FileIdentity:
+        """Identity of the file contents, independent of the file's path."""
+        return (self.dev, self.ino, self.mtime_ns, self.size)
 
 
 class BlendFileCache:
-    """High-performance cache for blend file library information."""
+    """High-performance cache for blend file library information.
+    
+    Entries are stored in a SQLite database (WAL mode) and keyed by file
+    identity, i.e. device, inode, nanosecond mtime and size. Paths are a
+    secondary index pointing at those entries, so a moved or renamed blend
+    file is found again under its new path without being re-parsed.
+    
+    Rows are read lazily, changes are kept in memory until ``save()`` and then
+    written as incremental upserts and deletes, so several processes can
+    share the same cache directory.
     
-    def __init__(self, cache_dir: Optional[Path] = None):
+    When subscribed to a ``FileWatcher``, entries are invalidated from its
+    modify/move/delete events, so entries verified less than
+    ``max_staleness`` seconds ago are trusted without a ``stat()`` call. A
+    periodic verify sweep catches anything the watcher missed.
+    """
+    
+    SCHEMA_VERSION = 10
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_staleness: float = 60.0,
+                 fingerprint_rate: float = 0.0):
         """Initialize the cache.
         
         Args:
             cache_dir: Directory to store cache files. If None, uses temp directory.
+            max_staleness: While subscribed to a watcher, how long (seconds) a
+                verified entry is trusted without checking the file on disk
+            fingerprint_rate: Bytes per second that may be read to fingerprint
+                files while they are scanned anyway. 0 only fingerprints files
+                when ``get_fingerprint()`` asks for it.
         """
         if cache_dir is None:
             import tempfile
@@ -70,48 +162,438 @@ class BlendFileCache:
         
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_file = self.cache_dir / "library_cache.json"
+        self.cache_file = self.cache_dir / "library_cache.db"
+        self._fingerprint_budget = IOBudget(fingerprint_rate) if fingerprint_rate > 0 else None
+        
+        # The connection is shared between scanner threads
+        self._lock = threading.RLock()
+        self._conn = self._open_database()
+        
+        # Entries read from (or about to be written to) the database, by path
+        self._entries: Dict[str, CachedBlendFile] = {}
+        self._identity_index: Dict[FileIdentity, str] = {}
+        # Pending changes, flushed by save()
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
         
-        # In-memory cache
-        self._cache: LibraryCache = self._load_cache()
+        # Watcher subscription: path -> monotonic time the entry was last verified
+        self.max_staleness = max_staleness
+        self._verified: Dict[str, float] = {}
+        self._watcher = None
+        self._verify_stop: Optional[threading.Event] = None
+        self._verify_thread: Optional[threading.Thread] = None
         
         # Performance metrics
         self._cache_hits = 0
         self._cache_misses = 0
+        self._moves_tracked = 0
+        self._stats_skipped = 0
     
-    def _load_cache(self) -> LibraryCache:
-        """Load cache from disk."""
-        if not self.cache_file.exists():
-            return LibraryCache(files={})
+    def _open_database(self) -> sqlite3.Connection:
+        """Open the cache database, creating or upgrading the schema."""
+        conn = sqlite3.connect(str(self.cache_file), timeout=30.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         
-        try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return LibraryCache.from_dict(data)
-        except (json.JSONDecodeError, KeyError) as e:
-            log.warning(f"Failed to load cache: {e}, starting fresh")
-            return LibraryCache(files={})
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            if version != 0:
+                log.warning("Cache schema version mismatch, starting fresh")
+            with conn:
+                for table in ("libraries", "paths", "entry_paths", "entry_libraries", "entries", "files",
+                              "trace_deps", "trace_files", "traces"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self._create_schema(conn)
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        
+        return conn
+    
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        """Create the cache tables and indexes."""
+        # File contents, keyed by identity
+        conn.execute("""
+            CREATE TABLE entries (
+                id INTEGER PRIMARY KEY,
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                scan_time REAL NOT NULL,
+                fingerprint TEXT,
+                last_path TEXT,
+                UNIQUE (dev, ino, mtime_ns, size)
+            )
+        """)
+        # Library paths as stored in the file, independent of its location
+        conn.execute("""
+            CREATE TABLE entry_libraries (
+                entry_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                raw_path TEXT NOT NULL
+            )
+        """)
+        # Paths of other path-bearing ID blocks (images, sounds, ...) as stored in the file
+        conn.execute("""
+            CREATE TABLE entry_paths (
+                entry_id INTEGER NOT NULL,
+                code TEXT NOT NULL,
+                name TEXT NOT NULL,
+                raw_path TEXT NOT NULL
+            )
+        """)
+        # Secondary path index
+        conn.execute("""
+            CREATE TABLE paths (
+                path TEXT PRIMARY KEY,
+                entry_id INTEGER NOT NULL
+            )
+        """)
+        # Library and asset paths resolved for each path, used for reverse lookups.
+        # Assets are listed under their stored path, see _asset_keys().
+        conn.execute("""
+            CREATE TABLE libraries (
+                file_path TEXT NOT NULL,
+                code TEXT NOT NULL,
+                name TEXT NOT NULL,
+                lib_path TEXT NOT NULL,
+                lib_key TEXT NOT NULL,
+                lib_basename TEXT NOT NULL
+            )
+        """)
+        # Dependency traces, keyed by the identity of the traced file
+        conn.execute("""
+            CREATE TABLE traces (
+                id INTEGER PRIMARY KEY,
+                root_path TEXT NOT NULL,
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                trace_time REAL NOT NULL,
+                UNIQUE (dev, ino, mtime_ns, size)
+            )
+        """)
+        # Libraries a trace depends on, with their identity at trace time (NULL if missing)
+        conn.execute("""
+            CREATE TABLE trace_files (
+                trace_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                dev INTEGER,
+                ino INTEGER,
+                mtime_ns INTEGER,
+                size INTEGER
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE trace_deps (
+                trace_id INTEGER NOT NULL,
+                asset_path TEXT NOT NULL,
+                block_name TEXT NOT NULL,
+                is_sequence INTEGER NOT NULL,
+                usage_type TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX idx_entries_last_path ON entries(last_path)")
+        conn.execute("CREATE INDEX idx_traces_root ON traces(root_path)")
+        conn.execute("CREATE INDEX idx_trace_files_trace ON trace_files(trace_id)")
+        conn.execute("CREATE INDEX idx_trace_deps_trace ON trace_deps(trace_id)")
+        conn.execute("CREATE INDEX idx_entry_libraries_entry ON entry_libraries(entry_id)")
+        conn.execute("CREATE INDEX idx_entry_paths_entry ON entry_paths(entry_id)")
+        conn.execute("CREATE INDEX idx_paths_entry ON paths(entry_id)")
+        conn.execute("CREATE INDEX idx_libraries_file ON libraries(file_path)")
+        conn.execute("CREATE INDEX idx_libraries_key ON libraries(lib_key)")
+        conn.execute("CREATE INDEX idx_libraries_basename ON libraries(lib_basename)")
+    
+    @staticmethod
+    def _write_entry(conn: sqlite3.Connection, cached_file: CachedBlendFile):
+        """Upsert a single entry, its path and its library rows."""
+        identity = cached_file.identity
+        conn.execute(
+            "INSERT OR IGNORE INTO entries (dev, ino, mtime_ns, size, scan_time) VALUES (?, ?, ?, ?, ?)",
+            identity + (cached_file.scan_time,)
+        )
+        entry_id = conn.execute(
+            "SELECT id FROM entries WHERE dev = ? AND ino = ? AND mtime_ns = ? AND size = ?",
+            identity
+        ).fetchone()[0]
+        # The last path is kept after the path row is deleted, to know what a missing file was
+        conn.execute("UPDATE entries SET last_path = ?, fingerprint = COALESCE(?, fingerprint) WHERE id = ?",
+                     (cached_file.path, cached_file.fingerprint, entry_id))
+        
+        conn.execute("DELETE FROM entry_libraries WHERE entry_id = ?", (entry_id,))
+        conn.executemany(
+            "INSERT INTO entry_libraries (entry_id, name, raw_path) VALUES (?, ?, ?)",
+            [(entry_id, name, raw_path) for name, raw_path in cached_file.raw_library_paths.items()]
+        )
+        conn.execute("DELETE FROM entry_paths WHERE entry_id = ?", (entry_id,))
+        conn.executemany(
+            "INSERT INTO entry_paths (entry_id, code, name, raw_path) VALUES (?, ?, ?, ?)",
+            [(entry_id,) + tuple(block_path) for block_path in cached_file.block_paths]
+        )
+        
+        conn.execute("INSERT OR REPLACE INTO paths (path, entry_id) VALUES (?, ?)",
+                     (cached_file.path, entry_id))
+        conn.execute("DELETE FROM libraries WHERE file_path = ?", (cached_file.path,))
+        asset_codes = {block_path.path: block_path.code for block_path in cached_file.block_paths}
+        conn.executemany(
+            "INSERT INTO libraries (file_path, code, name, lib_path, lib_key, lib_basename) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(cached_file.path, "LI", name, lib_path, key, _library_basename(key))
+             for name, lib_path in cached_file.library_paths.items()
+             for key in sorted(cached_file.library_keys.get(name, ()))] +
+            [(cached_file.path, asset_codes[stored_path], stored_path, key, key, _library_basename(key))
+             for stored_path, keys in cached_file.asset_keys.items()
+             for key in sorted(keys)]
+        )
     
     def _save_cache(self):
-        """Save cache to disk."""
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self._cache.to_dict(), f, indent=2)
-        except Exception as e:
-            log.warning(f"Failed to save cache: {e}")
+        """Write pending changes to the database in a single transaction."""
+        with self._lock:
+            if not self._dirty and not self._deleted:
+                return
+            
+            try:
+                with self._conn:
+                    for file_str in self._deleted:
+                        self._conn.execute("DELETE FROM libraries WHERE file_path = ?", (file_str,))
+                        self._conn.execute("DELETE FROM paths WHERE path = ?", (file_str,))
+                    for file_str in self._dirty:
+                        self._write_entry(self._conn, self._entries[file_str])
+            except sqlite3.Error as e:
+                log.warning(f"Failed to save cache: {e}")
+                return
+            
+            self._dirty.clear()
+            self._deleted.clear()
+    
+    def _load_entry(self, entry_id: int, path: str, identity: FileIdentity,
+                    scan_time: float, fingerprint: Optional[str] = None) -> CachedBlendFile:
+        """Build an entry from its database rows."""
+        raw_library_paths = dict(self._conn.execute(
+            "SELECT name, raw_path FROM entry_libraries WHERE entry_id = ?", (entry_id,)
+        ).fetchall())
+        library_paths = {}
+        library_keys: Dict[str, Set[str]] = {}
+        asset_keys: Dict[str, Set[str]] = {}
+        for code, name, lib_path, key in self._conn.execute(
+            "SELECT code, name, lib_path, lib_key FROM libraries WHERE file_path = ? ORDER BY rowid", (path,)
+        ):
+            if code == "LI":
+                library_paths[name] = lib_path
+                library_keys.setdefault(name, set()).add(key)
+            else:
+                asset_keys.setdefault(name, set()).add(key)
+        block_paths = [BlockPath(*row) for row in self._conn.execute(
+            "SELECT code, name, raw_path FROM entry_paths WHERE entry_id = ? ORDER BY rowid", (entry_id,)
+        )]
+        
+        dev, ino, mtime_ns, size = identity
+        return CachedBlendFile(
+            path=path,
+            mtime_ns=mtime_ns,
+            size=size,
+            library_paths=library_paths,
+            scan_time=scan_time,
+            dev=dev,
+            ino=ino,
+            raw_library_paths=raw_library_paths,
+            block_paths=block_paths,
+            library_keys=library_keys,
+            asset_keys=asset_keys,
+            fingerprint=fingerprint
+        )
+    
+    def _get_entry(self, file_str: str) -> Optional[CachedBlendFile]:
+        """Get the cached entry for a path, reading it from the database if needed."""
+        with self._lock:
+            if file_str in self._deleted:
+                return None
+            cached_file = self._entries.get(file_str)
+            if cached_file is not None:
+                return cached_file
+            
+            row = self._conn.execute(
+                "SELECT e.id, e.dev, e.ino, e.mtime_ns, e.size, e.scan_time, e.fingerprint "
+                "FROM paths p JOIN entries e ON e.id = p.entry_id WHERE p.path = ?",
+                (file_str,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            cached_file = self._load_entry(row[0], file_str, tuple(row[1:5]), row[5], row[6])
+            self._remember_entry(cached_file)
+            return cached_file
+    
+    def _find_entry_by_identity(self, identity: FileIdentity) -> Optional[CachedBlendFile]:
+        """Find an entry with the given identity, under any path."""
+        if not identity[1]:
+            # Without inode numbers the identity is not meaningful
+            return None
+        
+        with self._lock:
+            file_str = self._identity_index.get(identity)
+            if file_str is not None and file_str in self._entries:
+                return self._entries[file_str]
+            
+            row = self._conn.execute(
+                "SELECT e.id, e.scan_time, p.path, e.fingerprint FROM entries e JOIN paths p ON p.entry_id = e.id "
+                "WHERE e.dev = ? AND e.ino = ? AND e.mtime_ns = ? AND e.size = ?",
+                identity
+            ).fetchone()
+            if row is None or row[2] in self._deleted:
+                return None
+            
+            return self._load_entry(row[0], row[2], identity, row[1], row[3])
+    
+    def _remember_entry(self, cached_file: CachedBlendFile):
+        """Keep an entry in memory."""
+        self._entries[cached_file.path] = cached_file
+        self._identity_index[cached_file.identity] = cached_file.path
+    
+    def _put_entry(self, cached_file: CachedBlendFile):
+        """Store an entry in memory and mark it for writing."""
+        with self._lock:
+            self._remember_entry(cached_file)
+            self._dirty.add(cached_file.path)
+            self._deleted.discard(cached_file.path)
+    
+    def _remove_entry(self, file_str: str):
+        """Drop an entry from memory and mark it for deletion."""
+        with self._lock:
+            cached_file = self._entries.pop(file_str, None)
+            if cached_file is not None and self._identity_index.get(cached_file.identity) == file_str:
+                del self._identity_index[cached_file.identity]
+            self._verified.pop(file_str, None)
+            self._dirty.discard(file_str)
+            self._deleted.add(file_str)
     
-    def _get_file_info(self, file_path: Path) -> Tuple[float, int]:
-        """Get file modification time and size."""
+    def _repoint_entry(self, cached_file: CachedBlendFile, new_path: str) -> CachedBlendFile:
+        """Store an existing entry under a new path without re-parsing the file.
+        
+        Relative library paths are resolved again for the new location.
+        """
+        moved_file = CachedBlendFile(
+            path=new_path,
+            mtime_ns=cached_file.mtime_ns,
+            size=cached_file.size,
+            library_paths=_resolve_library_paths(new_path, cached_file.raw_library_paths),
+            scan_time=cached_file.scan_time,
+            dev=cached_file.dev,
+            ino=cached_file.ino,
+            raw_library_paths=dict(cached_file.raw_library_paths),
+            block_paths=list(cached_file.block_paths),
+            fingerprint=cached_file.fingerprint
+        )
+        self._put_entry(moved_file)
+        self._moves_tracked += 1
+        return moved_file
+    
+    def get_known_paths(self) -> Set[str]:
+        """Get the paths of all cached blend files."""
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT path FROM paths")}
+            known.update(self._dirty)
+            known.difference_update(self._deleted)
+            return known
+    
+    def get_files_with_libraries(self) -> Set[str]:
+        """Get the paths of all cached blend files that link libraries."""
+        with self._lock:
+            linking = {row[0] for row in self._conn.execute(
+                "SELECT DISTINCT file_path FROM libraries WHERE code = 'LI'"
+            )}
+            linking.difference_update(self._dirty)
+            linking.difference_update(self._deleted)
+            linking.update(file_str for file_str in self._dirty if self._entries[file_str].library_paths)
+            return linking
+    
+    def _get_file_identity(self, file_path: Path) -> Optional[FileIdentity]:
+        """Get the identity of a file, or None if it can't be accessed."""
         try:
-            stat = file_path.stat()
-            return stat.st_mtime, stat.st_size
+            stat = os.stat(file_path)
         except OSError:
-            return 0.0, 0
+            return None
+        return (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
     
     def _is_file_changed(self, file_path: Path, cached_file: CachedBlendFile) -> bool:
         """Check if file has changed since last cache."""
-        mtime, size = self._get_file_info(file_path)
-        return mtime != cached_file.mtime or size != cached_file.size
+        return self._get_file_identity(file_path) != cached_file.identity
+    
+    def _get_cached_file(self, blend_file: Path, force_refresh: bool = False) -> Optional[CachedBlendFile]:
+        """Get the up-to-date entry for a blend file, reading the file on a cache miss.
+        
+        On a miss all path-bearing ID blocks are read in a single pass, so
+        library and image/sound/... paths are cached together.
+        """
+        file_str = str(blend_file)
+        
+        if not force_refresh and self._is_trusted(file_str):
+            cached_file = self._get_entry(file_str)
+            if cached_file is not None:
+                self._cache_hits += 1
+                self._stats_skipped += 1
+                return cached_file
+        
+        identity = self._get_file_identity(blend_file)
+        if identity is None:
+            self.invalidate_file(blend_file)
+            return None
+        
+        if not force_refresh:
+            # Check if file hasn't changed
+            cached_file = self._get_entry(file_str)
+            if cached_file is not None and cached_file.identity == identity:
+                self._cache_hits += 1
+                self._mark_verified(file_str)
+                return cached_file
+            
+            # The same file may be cached under the path it was moved from
+            original = self._find_entry_by_identity(identity)
+            if original is not None and original.path != file_str:
+                self._cache_hits += 1
+                moved_file = self._repoint_entry(original, file_str)
+                if not os.path.lexists(original.path):
+                    self._remove_entry(original.path)
+                log.debug(f"Re-pointed cache entry {original.path} -> {file_str}")
+                self._mark_verified(file_str)
+                return moved_file
+        
+        # Cache miss - need to read file
+        self._cache_misses += 1
+        
+        try:
+            block_paths = scan_block_paths(blend_file)
+        except Exception as e:
+            log.warning(f"Failed to read {blend_file}: {e}")
+            return None
+        
+        raw_library_paths = {block_path.name: block_path.path
+                             for block_path in block_paths if block_path.code == "LI"}
+        
+        # Fingerprint the file while it is being read anyway, as far as the budget allows
+        dev, ino, mtime_ns, size = identity
+        fingerprint = None
+        if self._fingerprint_budget is not None and \
+                self._fingerprint_budget.try_acquire(fingerprint_read_size(size)):
+            fingerprint = file_fingerprint(blend_file, size)
+        
+        # Update cache
+        cached_file = CachedBlendFile(
+            path=file_str,
+            mtime_ns=mtime_ns,
+            size=size,
+            library_paths=_resolve_library_paths(file_str, raw_library_paths),
+            scan_time=time.time(),
+            dev=dev,
+            ino=ino,
+            raw_library_paths=raw_library_paths,
+            block_paths=[block_path for block_path in block_paths if block_path.code != "LI"],
+            fingerprint=fingerprint
+        )
+        self._put_entry(cached_file)
+        self._mark_verified(file_str)
+        return cached_file
     
     def get_library_paths(self, blend_file: Path, force_refresh: bool = False) -> Optional[Dict[str, str]]:
         """Get library paths for a blend file, using cache when possible.
@@ -123,112 +605,654 @@ class BlendFileCache:
         Returns:
             Dictionary of library paths, or None if file can't be read
         """
-        file_str = str(blend_file)
+        cached_file = self._get_cached_file(blend_file, force_refresh)
+        return cached_file.library_paths if cached_file is not None else None
+    
+    def get_block_paths(self, blend_file: Path, force_refresh: bool = False,
+                        resolve_paths: bool = True) -> Optional[List[BlockPath]]:
+        """Get the paths of all path-bearing ID blocks of a blend file, using cache when possible.
         
-        # Check cache
-        if not force_refresh and file_str in self._cache.files:
-            cached_file = self._cache.files[file_str]
+        Covers Library, Image, Sound, VFont, MovieClip and CacheFile blocks.
+        
+        Args:
+            blend_file: Path to the blend file
+            force_refresh: If True, ignore cache and re-scan file
+            resolve_paths: If True (default), resolves paths to absolute. If False,
+                returns paths as stored in the file.
             
-            # Check if file hasn't changed
-            if not self._is_file_changed(blend_file, cached_file):
-                self._cache_hits += 1
-                return cached_file.library_paths
+        Returns:
+            List of BlockPaths, libraries first, or None if file can't be read
+        """
+        cached_file = self._get_cached_file(blend_file, force_refresh)
+        if cached_file is None:
+            return None
         
-        # Cache miss - need to read file
-        self._cache_misses += 1
+        if resolve_paths:
+            block_paths = [BlockPath("LI", name, lib_path)
+                           for name, lib_path in cached_file.library_paths.items()]
+            for block_path in cached_file.block_paths:
+                try:
+                    path = resolve_library_path(Path(cached_file.path), block_path.path)
+                except Exception:
+                    path = block_path.path
+                block_paths.append(block_path._replace(path=path))
+            return block_paths
+        
+        block_paths = [BlockPath("LI", name, raw_path)
+                       for name, raw_path in cached_file.raw_library_paths.items()]
+        return block_paths + list(cached_file.block_paths)
+    
+    def get_fingerprint(self, blend_file: Path) -> Optional[str]:
+        """Get the content fingerprint of a blend file, computing it if needed.
+        
+        Args:
+            blend_file: Path to the blend file
+        
+        Returns:
+            The fingerprint, or None if the file can't be read
+        """
+        cached_file = self._get_cached_file(blend_file)
+        if cached_file is None:
+            return None
+        if cached_file.fingerprint is None:
+            fingerprint = file_fingerprint(blend_file, cached_file.size)
+            if fingerprint is None:
+                return None
+            with self._lock:
+                cached_file.fingerprint = fingerprint
+                self._put_entry(cached_file)
+        return cached_file.fingerprint
+
+    def get_last_known_entry(self, blend_file: Union[str, Path]) -> Optional[CachedBlendFile]:
+        """Get the entry a path was last cached with, without checking the file.
+        
+        Unlike the other getters this also answers for files that no longer
+        exist, e.g. to know the size and fingerprint of a missing library.
+        
+        Args:
+            blend_file: Path the file was cached under
+        
+        Returns:
+            The last entry cached for the path, or None if it was never cached
+        """
+        file_str = str(blend_file)
+        cached_file = self._get_entry(file_str)
+        if cached_file is not None:
+            return cached_file
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, dev, ino, mtime_ns, size, scan_time, fingerprint FROM entries "
+                "WHERE last_path = ? ORDER BY scan_time DESC LIMIT 1",
+                (file_str,)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._load_entry(row[0], file_str, tuple(row[1:5]), row[5], row[6])
+
+    def get_dependency_trace(self, blend_file: Union[str, Path]) -> Optional[List[TracedDependency]]:
+        """Get the memoized dependency trace of a blend file.
+        
+        A trace is only returned while the blend file and every library it
+        went through still have the identity they had when it was traced,
+        and libraries that were missing are still missing.
+        
+        Args:
+            blend_file: Path of the traced blend file
+        
+        Returns:
+            The traced dependencies in trace order, or None if there is no
+            valid trace
+        """
+        file_str = str(blend_file)
+        identity = self._get_file_identity(Path(file_str))
+        if identity is None:
+            return None
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM traces WHERE dev = ? AND ino = ? AND mtime_ns = ? AND size = ? AND root_path = ?",
+                identity + (file_str,)
+            ).fetchone()
+            if row is None:
+                return None
+            trace_id = row[0]
+            trace_files = self._conn.execute(
+                "SELECT path, dev, ino, mtime_ns, size FROM trace_files WHERE trace_id = ?", (trace_id,)
+            ).fetchall()
+        
+        for path, *library_identity in trace_files:
+            current = self._get_file_identity(Path(path))
+            if current != (tuple(library_identity) if library_identity[0] is not None else None):
+                log.debug(f"Dependency trace of {file_str} is outdated, {path} changed")
+                return None
+        
+        with self._lock:
+            return [(asset_path, block_name, bool(is_sequence), usage_type)
+                    for asset_path, block_name, is_sequence, usage_type in self._conn.execute(
+                        "SELECT asset_path, block_name, is_sequence, usage_type FROM trace_deps "
+                        "WHERE trace_id = ? ORDER BY rowid", (trace_id,)
+                    )]
+    
+    def put_dependency_trace(self, blend_file: Union[str, Path], identity: FileIdentity,
+                             library_files: Sequence[Union[str, Path]],
+                             dependencies: Sequence[TracedDependency]):
+        """Memoize the dependency trace of a blend file.
+        
+        Traces are written right away, unlike entries, as redoing one means
+        reading every library again.
+        
+        Args:
+            blend_file: Path of the traced blend file
+            identity: Identity the blend file had before it was traced
+            library_files: Blend files the trace went through or tried to,
+                whose identity is recorded to validate the trace later
+            dependencies: The traced dependencies, in trace order
+        """
+        file_str = str(blend_file)
+        library_rows = []
+        for path in sorted({str(path) for path in library_files} - {file_str}):
+            library_identity = self._get_file_identity(Path(path))
+            library_rows.append((path,) + (library_identity or (None, None, None, None)))
         
         try:
-            # Use the ultra-fast library reader for better performance
-            from blendwatch.blender.library_writer import get_blend_file_libraries
-            library_paths = get_blend_file_libraries(blend_file)
-            
-            # Update cache
-            mtime, size = self._get_file_info(blend_file)
-            self._cache.files[file_str] = CachedBlendFile(
-                path=file_str,
-                mtime=mtime,
-                size=size,
-                library_paths=library_paths,
-                scan_time=time.time()
+            with self._lock, self._conn:
+                # Only the latest trace of a path is useful
+                old_ids = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM traces WHERE root_path = ? OR (dev = ? AND ino = ? AND mtime_ns = ? AND size = ?)",
+                    (file_str,) + identity
+                )]
+                for table, column in (("trace_deps", "trace_id"), ("trace_files", "trace_id"), ("traces", "id")):
+                    self._conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", [(i,) for i in old_ids])
+                
+                trace_id = self._conn.execute(
+                    "INSERT INTO traces (root_path, dev, ino, mtime_ns, size, trace_time) VALUES (?, ?, ?, ?, ?, ?)",
+                    (file_str,) + identity + (time.time(),)
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO trace_files (trace_id, path, dev, ino, mtime_ns, size) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(trace_id,) + row for row in library_rows]
+                )
+                self._conn.executemany(
+                    "INSERT INTO trace_deps (trace_id, asset_path, block_name, is_sequence, usage_type) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(trace_id, asset_path, block_name, int(is_sequence), usage_type)
+                     for asset_path, block_name, is_sequence, usage_type in dependencies]
+                )
+        except sqlite3.Error as e:
+            log.warning(f"Failed to store dependency trace of {file_str}: {e}")
+
+    def move_file(self, old_path: Union[str, Path], new_path: Union[str, Path]) -> bool:
+        """Re-point a cache entry after a blend file was moved or renamed.
+        
+        Args:
+            old_path: Path the file was moved from
+            new_path: Path the file was moved to
+            
+        Returns:
+            True if an entry was re-pointed, False if the old path wasn't cached
+        """
+        old_str = str(old_path)
+        cached_file = self._get_entry(old_str)
+        if cached_file is None:
+            return False
+        
+        verified_at = self._verified.get(old_str)
+        self._repoint_entry(cached_file, str(new_path))
+        self._remove_entry(old_str)
+        if verified_at is not None:
+            self._verified[str(new_path)] = verified_at
+        return True
+    
+    def move_directory(self, old_dir: Union[str, Path], new_dir: Union[str, Path]) -> int:
+        """Re-point all cache entries below a directory that was moved.
+        
+        Args:
+            old_dir: Directory the files were moved from
+            new_dir: Directory the files were moved to
+            
+        Returns:
+            Number of entries re-pointed
+        """
+        old_prefix = os.path.join(str(old_dir), '')
+        new_prefix = os.path.join(str(new_dir), '')
+        
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM paths WHERE substr(path, 1, ?) = ?",
+                (len(old_prefix), old_prefix)
+            ).fetchall()
+            old_paths = {row[0] for row in rows}
+            old_paths.update(p for p in self._dirty if p.startswith(old_prefix))
+            old_paths.difference_update(self._deleted)
+        
+        moved = 0
+        for old_path in old_paths:
+            if self.move_file(old_path, new_prefix + old_path[len(old_prefix):]):
+                moved += 1
+        return moved
+    
+    def _is_trusted(self, file_str: str) -> bool:
+        """Check if an entry can be used without checking the file on disk."""
+        if self._watcher is None:
+            return False
+        verified_at = self._verified.get(file_str)
+        return verified_at is not None and time.monotonic() - verified_at <= self.max_staleness
+    
+    def _mark_verified(self, file_str: str):
+        """Record that an entry was just checked against the file on disk."""
+        if self._watcher is not None:
+            self._verified[file_str] = time.monotonic()
+    
+    def mark_stale(self, file_path: Union[str, Path]):
+        """Make the next read of a file check it on disk again."""
+        self._verified.pop(str(file_path), None)
+    
+    def handle_watcher_event(self, event_data: Dict):
+        """Update the cache from a ``FileWatcher`` event.
+        
+        Args:
+            event_data: Event data as passed to watcher listeners
+        """
+        event_type = event_data.get('type', '')
+        
+        if event_type == 'file_modified':
+            self.mark_stale(event_data['path'])
+        elif event_type == 'file_deleted':
+            self.invalidate_file(Path(event_data['path']))
+        elif event_type == 'directory_deleted':
+            prefix = os.path.join(event_data['path'], '')
+            for file_str in list(self._verified):
+                if file_str.startswith(prefix):
+                    self.mark_stale(file_str)
+        elif 'old_path' in event_data and 'new_path' in event_data:
+            if event_data.get('is_directory'):
+                self.move_directory(event_data['old_path'], event_data['new_path'])
+            elif not self.move_file(event_data['old_path'], event_data['new_path']):
+                # E.g. a save that replaces the file with a temporary one
+                self.mark_stale(event_data['old_path'])
+                self.mark_stale(event_data['new_path'])
+    
+    def subscribe(self, watcher, verify_interval: Optional[float] = 300.0):
+        """Keep the cache up to date from a file watcher's events.
+        
+        While subscribed, recently verified entries are trusted without a
+        ``stat()`` call, and all trusted entries are verified every
+        ``verify_interval`` seconds on a background thread.
+        
+        Args:
+            watcher: ``FileWatcher`` to receive events from
+            verify_interval: Seconds between verify sweeps, None to disable them
+        """
+        self.unsubscribe()
+        self._watcher = watcher
+        watcher.add_listener(self.handle_watcher_event)
+        
+        if verify_interval:
+            self._verify_stop = threading.Event()
+            self._verify_thread = threading.Thread(
+                target=self._verify_loop,
+                args=(self._verify_stop, verify_interval),
+                name="blendwatch-cache-verify",
+                daemon=True
             )
+            self._verify_thread.start()
+    
+    def unsubscribe(self):
+        """Stop receiving watcher events and check files on every read again."""
+        if self._verify_stop is not None:
+            self._verify_stop.set()
+            self._verify_thread.join()
+            self._verify_stop = None
+            self._verify_thread = None
+        
+        if self._watcher is not None:
+            self._watcher.remove_listener(self.handle_watcher_event)
+            self._watcher = None
+        self._verified.clear()
+    
+    def _verify_loop(self, stop: threading.Event, interval: float):
+        """Run verify sweeps until stopped."""
+        while not stop.wait(interval):
+            try:
+                self.verify_entries()
+            except Exception as e:
+                log.warning(f"Cache verify sweep failed: {e}")
+    
+    def verify_entries(self) -> int:
+        """Check all trusted entries against the files on disk.
+        
+        Returns:
+            Number of entries that were found to be out of date
+        """
+        stale = 0
+        for file_str in list(self._verified):
+            cached_file = self._get_entry(file_str)
+            if cached_file is None:
+                self.mark_stale(file_str)
+                continue
             
-            return library_paths
+            if self._is_file_changed(Path(file_str), cached_file):
+                self.mark_stale(file_str)
+                stale += 1
+            else:
+                self._mark_verified(file_str)
+        
+        if stale:
+            log.debug(f"Verify sweep found {stale} changed files")
+        return stale
+    
+    def _get_candidates(self, keys: Set[str], basenames: Set[str]) -> Set[str]:
+        """Get cached blend files with a library matching any of the keys or file names."""
+        with self._lock:
+            candidates = set()
+            for column, values in (("lib_key", list(keys)), ("lib_basename", list(basenames))):
+                # Stay below SQLite's limit on the number of query parameters
+                for start in range(0, len(values), 500):
+                    chunk = values[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT file_path FROM libraries WHERE {column} IN ({', '.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    candidates.update(row[0] for row in rows)
             
-        except Exception as e:
-            log.warning(f"Failed to read {blend_file}: {e}")
-            return None
+            # Overlay the changes that have not been saved yet
+            candidates.difference_update(self._dirty)
+            candidates.difference_update(self._deleted)
+            for file_str in self._dirty:
+                if any(key in keys or _library_basename(key) in basenames
+                       for _, link_keys in self._entries[file_str].iter_link_keys() for key in link_keys):
+                    candidates.add(file_str)
+        
+        return candidates
     
-    def get_files_linking_to(self, target_path: str, search_files: List[Path]) -> List[Path]:
-        """Find all files that link to a target path.
+    def get_candidate_files(self, target_path: str, match_basename: bool = False) -> Set[str]:
+        """Get cached blend files whose libraries reference a target path.
+        
+        This is a pure index lookup: it does not touch the filesystem, so the
+        candidates still need to be checked for freshness.
         
         Args:
             target_path: Path to find links to
+            match_basename: Also match libraries with the same file name in
+                another directory
+            
+        Returns:
+            Set of blend file paths (as strings) referencing the target
+        """
+        key = _library_key(target_path)
+        return self._get_candidates({key}, {_library_basename(key)} if match_basename else set())
+    
+    def iter_links_to_targets(self, target_paths: Sequence[str], search_files: List[Path],
+                              match_basename: bool = False,
+                              key_transform: Optional[Callable[[str], str]] = None,
+                              known_paths: Optional[Set[str]] = None
+                              ) -> Iterator[Tuple[Path, Mapping[str, str], Dict[str, List[str]]]]:
+        """Yield the files linking to any of several target paths as they are checked.
+        
+        The targets' canonical keys are looked up in the reverse index in one
+        query, and the search files are checked in a single pass, so the cost
+        doesn't grow with the number of targets times the number of files.
+        Files that have never been scanned are read when the pass reaches
+        them; of the cached files only the index candidates are checked for
+        freshness, all others are trusted until they are invalidated.
+        
+        Args:
+            target_paths: Paths to find links to
+            search_files: List of blend files to search
+            match_basename: Also match libraries with the same file name in
+                another directory
+            key_transform: Applied to the cached keys and the target keys before
+                comparing them, e.g. for case folding. The index can't be used
+                then, so every search file is checked.
+            known_paths: Paths of the cached files from ``get_known_paths()``,
+                to share them between calls. Files read by this call are added.
+            
+        Yields:
+            Tuples of (blend file, read-only view of its resolved library paths,
+            {target path: names of the libraries and stored paths of the assets
+            referencing it})
+        """
+        targets_by_key: Dict[str, List[str]] = {}
+        for target_path in target_paths:
+            key = _library_key(target_path)
+            if key_transform is not None:
+                key = key_transform(key)
+            targets_by_key.setdefault(key, []).append(target_path)
+        targets_by_basename: Dict[str, List[str]] = {}
+        if match_basename:
+            for key, targets in targets_by_key.items():
+                targets_by_basename.setdefault(_library_basename(key), []).extend(targets)
+        
+        if known_paths is None:
+            known_paths = self.get_known_paths()
+        candidates = None
+        if key_transform is None:
+            candidates = self._get_candidates(set(targets_by_key), set(targets_by_basename))
+        
+        for blend_file in search_files:
+            file_str = str(blend_file)
+            if candidates is not None and file_str in known_paths and file_str not in candidates:
+                continue
+            
+            # Reads unknown files, re-indexes known ones if they changed on disk
+            cached_file = self._get_cached_file(blend_file)
+            if cached_file is None:
+                continue
+            known_paths.add(file_str)
+            
+            linked: Dict[str, List[str]] = {}
+            for name, keys in cached_file.iter_link_keys():
+                if key_transform is not None:
+                    keys = {key_transform(key) for key in keys}
+                
+                linked_targets = set()
+                for key in keys:
+                    linked_targets.update(targets_by_key.get(key, ()))
+                    if match_basename:
+                        linked_targets.update(targets_by_basename.get(_library_basename(key), ()))
+                for target_path in linked_targets:
+                    linked.setdefault(target_path, []).append(name)
+            
+            if linked:
+                yield blend_file, MappingProxyType(cached_file.library_paths), linked
+    
+    def find_links_to_targets(self, target_paths: Sequence[str], search_files: List[Path],
+                              match_basename: bool = False,
+                              key_transform: Optional[Callable[[str], str]] = None
+                              ) -> Dict[str, Dict[Path, List[str]]]:
+        """Find the libraries of each file that link to any of several target paths.
+        
+        See ``iter_links_to_targets()`` for how the files are searched.
+        
+        Args:
+            target_paths: Paths to find links to
             search_files: List of blend files to search
+            match_basename: Also match libraries with the same file name in
+                another directory
+            key_transform: Applied to the cached keys and the target keys before
+                comparing them, e.g. for case folding
             
         Returns:
-            List of blend files that link to the target
+            Dictionary mapping each target path to a dictionary of linking blend
+            files and the names of their libraries that reference the target
+        """
+        matches: Dict[str, Dict[Path, List[str]]] = {target_path: {} for target_path in target_paths}
+        for blend_file, _, linked in self.iter_links_to_targets(target_paths, search_files,
+                                                                match_basename, key_transform):
+            for target_path, names in linked.items():
+                matches[target_path][blend_file] = names
+        return matches
+    
+    def _get_candidates_under(self, prefix: str) -> Set[str]:
+        """Get cached blend files with a library key starting with a prefix."""
+        # The key index is sorted, so this is a range scan. The upper bound is
+        # the prefix with its trailing separator replaced by the next character.
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_path FROM libraries WHERE lib_key >= ? AND lib_key < ?",
+                (prefix, upper)
+            ).fetchall()
+            candidates = {row[0] for row in rows}
+            
+            # Overlay the changes that have not been saved yet
+            candidates.difference_update(self._dirty)
+            candidates.difference_update(self._deleted)
+            for file_str in self._dirty:
+                if any(key.startswith(prefix)
+                       for _, link_keys in self._entries[file_str].iter_link_keys() for key in link_keys):
+                    candidates.add(file_str)
+        
+        return candidates
+    
+    def iter_links_under_directory(self, directory: str, search_files: List[Path],
+                                   key_transform: Optional[Callable[[str], str]] = None,
+                                   known_paths: Optional[Set[str]] = None
+                                   ) -> Iterator[Tuple[Path, Mapping[str, str], List[str]]]:
+        """Yield the files linking to anything below a directory as they are checked.
+        
+        The candidates are found with a range scan over the sorted key index,
+        so the lookup costs O(log n + results) instead of one query per file
+        in the directory. Files that have never been scanned are read when
+        the pass reaches them.
+        
+        Args:
+            directory: Directory to find links into
+            search_files: List of blend files to search
+            key_transform: Applied to the cached keys and the directory key before
+                comparing them, e.g. for case folding. The index can't be used
+                then, so every search file is checked.
+            known_paths: Paths of the cached files from ``get_known_paths()``,
+                to share them between calls. Files read by this call are added.
+            
+        Yields:
+            Tuples of (blend file, read-only view of its resolved library paths,
+            names of the libraries and stored paths of the assets below the directory)
         """
-        linking_files = []
-        target_name = Path(target_path).name
+        prefix = _directory_prefix(directory)
+        if known_paths is None:
+            known_paths = self.get_known_paths()
+        candidates = None
+        if key_transform is None:
+            candidates = self._get_candidates_under(prefix)
+        else:
+            prefix = os.path.join(key_transform(prefix.rstrip(os.sep) or prefix), '')
         
         for blend_file in search_files:
-            library_paths = self.get_library_paths(blend_file)
-            if library_paths is None:
+            file_str = str(blend_file)
+            if candidates is not None and file_str in known_paths and file_str not in candidates:
+                continue
+            
+            # Reads unknown files, re-indexes known ones if they changed on disk
+            cached_file = self._get_cached_file(blend_file)
+            if cached_file is None:
                 continue
+            known_paths.add(file_str)
             
-            # Check if any library path matches the target
-            for lib_path in library_paths.values():
-                if self._paths_match(target_path, lib_path, target_name):
-                    linking_files.append(blend_file)
-                    break
+            names = []
+            for name, keys in cached_file.iter_link_keys():
+                if key_transform is not None:
+                    keys = {key_transform(key) for key in keys}
+                if any(key.startswith(prefix) for key in keys):
+                    names.append(name)
+            if names:
+                yield blend_file, MappingProxyType(cached_file.library_paths), names
+    
+    def find_links_under_directory(self, directory: str, search_files: List[Path],
+                                   key_transform: Optional[Callable[[str], str]] = None
+                                   ) -> Dict[Path, List[str]]:
+        """Find the libraries of each file that link to anything below a directory.
+        
+        See ``iter_links_under_directory()`` for how the files are searched.
         
-        return linking_files
+        Args:
+            directory: Directory to find links into
+            search_files: List of blend files to search
+            key_transform: Applied to the cached keys and the directory key before
+                comparing them, e.g. for case folding
+            
+        Returns:
+            Dictionary mapping each linking blend file to the names of its
+            libraries below the directory
+        """
+        return {blend_file: names for blend_file, _, names
+                in self.iter_links_under_directory(directory, search_files, key_transform)}
     
-    def _paths_match(self, target_path: str, lib_path: str, target_name: str) -> bool:
-        """Check if library path matches target path."""
-        # Exact match
-        if target_path == lib_path:
-            return True
+    def get_matching_libraries(self, target_path: str, search_files: List[Path],
+                               match_basename: bool = False,
+                               key_transform: Optional[Callable[[str], str]] = None
+                               ) -> Dict[Path, List[str]]:
+        """Find the libraries of each file that link to a target path.
         
-        # Filename match
-        if target_name in lib_path:
-            return True
+        See ``find_links_to_targets()`` for how the files are searched.
         
-        # Try resolving relative paths
-        if lib_path.startswith('//'):
-            # This is complex and slow, so only do it if needed
-            try:
-                # Remove the '//' prefix
-                relative_part = lib_path[2:]
-                # This would need the blend file's directory to resolve properly
-                # For now, just do a simple filename comparison
-                lib_name = relative_part.split('/')[-1].split('\\')[-1]
-                if lib_name == target_name:
-                    return True
-            except Exception:
-                pass
-        
-        return False
+        Args:
+            target_path: Path to find links to
+            search_files: List of blend files to search
+            match_basename: Also match libraries with the same file name in
+                another directory
+            key_transform: Applied to the cached keys and the target key before
+                comparing them, e.g. for case folding
+            
+        Returns:
+            Dictionary mapping each linking blend file to the names of its
+            libraries that reference the target
+        """
+        return self.find_links_to_targets([target_path], search_files, match_basename,
+                                          key_transform)[target_path]
+    
+    def get_files_linking_to(self, target_path: str, search_files: List[Path],
+                             match_basename: bool = False) -> List[Path]:
+        """Find all files that link to a target path.
+        
+        Args:
+            target_path: Path to find links to
+            search_files: List of blend files to search
+            match_basename: Also match libraries with the same file name in
+                another directory
+            
+        Returns:
+            List of blend files that link to the target
+        """
+        return list(self.get_matching_libraries(target_path, search_files, match_basename))
     
     def invalidate_file(self, blend_file: Path):
         """Remove a file from cache (e.g., if it was modified)."""
         file_str = str(blend_file)
-        if file_str in self._cache.files:
-            del self._cache.files[file_str]
+        if self._get_entry(file_str) is not None:
+            self._remove_entry(file_str)
     
     def cleanup_cache(self, max_age_days: int = 30):
         """Remove old cache entries."""
         cutoff_time = time.time() - (max_age_days * 24 * 60 * 60)
+        self._save_cache()
+        
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.path, e.scan_time FROM paths p JOIN entries e ON e.id = p.entry_id"
+            ).fetchall()
         
         to_remove = []
-        for file_path, cached_file in self._cache.files.items():
+        for file_path, scan_time in rows:
             # Remove if file doesn't exist or cache is too old
             if (not Path(file_path).exists() or 
-                cached_file.scan_time < cutoff_time):
+                scan_time < cutoff_time):
                 to_remove.append(file_path)
         
         for file_path in to_remove:
-            del self._cache.files[file_path]
+            self._remove_entry(file_path)
+        self._save_cache()
+        
+        # Drop contents no path points at anymore
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM entries WHERE id NOT IN (SELECT entry_id FROM paths)")
+                self._conn.execute("DELETE FROM entry_libraries WHERE entry_id NOT IN (SELECT id FROM entries)")
+                self._conn.execute("DELETE FROM entry_paths WHERE entry_id NOT IN (SELECT id FROM entries)")
+                self._conn.execute("DELETE FROM traces WHERE trace_time < ?", (cutoff_time,))
+                self._conn.execute("DELETE FROM trace_files WHERE trace_id NOT IN (SELECT id FROM traces)")
+                self._conn.execute("DELETE FROM trace_deps WHERE trace_id NOT IN (SELECT id FROM traces)")
         
         log.info(f"Cleaned up {len(to_remove)} old cache entries")
     
@@ -237,19 +1261,48 @@ class BlendFileCache:
         total_requests = self._cache_hits + self._cache_misses
         hit_rate = (self._cache_hits / total_requests * 100) if total_requests > 0 else 0
         
+        with self._lock:
+            indexed_libraries = self._conn.execute(
+                "SELECT COUNT(DISTINCT lib_key) FROM libraries WHERE code = 'LI'"
+            ).fetchone()[0]
+            dependency_traces = self._conn.execute("SELECT COUNT(*) FROM traces").fetchone()[0]
+        
         return {
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
             "hit_rate_percent": round(hit_rate, 1),
-            "cached_files": len(self._cache.files)
+            "cached_files": len(self.get_known_paths()),
+            "indexed_libraries": indexed_libraries,
+            "dependency_traces": dependency_traces,
+            "moves_tracked": self._moves_tracked,
+            "stats_skipped": self._stats_skipped,
+            "pending_writes": len(self._dirty) + len(self._deleted)
         }
     
     def save(self):
-        """Save cache to disk."""
+        """Save pending cache changes to disk."""
+        self._save_cache()
+    
+    def close(self):
+        """Save pending changes and close the database connection."""
+        self.unsubscribe()
         self._save_cache()
+        with self._lock:
+            self._conn.close()
     
     def clear(self):
         """Clear all cache data."""
-        self._cache = LibraryCache(files={})
+        with self._lock:
+            with self._conn:
+                for table in ("libraries", "paths", "entry_libraries", "entry_paths", "entries",
+                              "trace_deps", "trace_files", "traces"):
+                    self._conn.execute(f"DELETE FROM {table}")
+            self._entries.clear()
+            self._identity_index.clear()
+            self._verified.clear()
+            self._dirty.clear()
+            self._deleted.clear()
         self._cache_hits = 0
         self._cache_misses = 0
+        self._moves_tracked = 0
+        self._stats_skipped = 0
@@ -7,11 +7,15 @@ without opening them in Blender, using optimized block-level I/O operations.
 
 import logging
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from blender_asset_tracer import blendfile
 from blender_asset_tracer.bpathlib import BlendPath
-from blendwatch.utils.path_utils import resolve_path, get_relative_path, bytes_to_string
-from .block_level_optimizations import get_libraries_ultra_fast, SelectiveBlockReader
+from blendwatch.utils.path_utils import resolve_path, get_relative_path, bytes_to_string, normalize_path
+from .blend_headers import GZIP_MAGIC, ZSTD_MAGIC, walk_blocks
+from .block_level_optimizations import (
+    PATH_BLOCK_CODES, BlockPath, LibraryScan, decode_block_path, get_libraries_ultra_fast,
+    library_field_names, path_field_name, scan_block_paths, scan_libraries
+)
 
 log = logging.getLogger(__name__)
 
@@ -36,6 +40,7 @@ class LibraryPathWriter:
             raise ValueError(f"Path must be a file, not a directory: {self.blend_file_path}")
         if not self.blend_file_path.suffix.lower() == '.blend':
             raise ValueError(f"File must be a .blend file: {self.blend_file_path}")
+        self._base_dir = str(self.blend_file_path.parent)
     
     def get_library_paths(self) -> Dict[str, str]:
         """Get all library paths in the blend file using optimized I/O.
@@ -43,7 +48,22 @@ class LibraryPathWriter:
         Returns:
             Dictionary mapping library names to their file paths
         """
-        return get_libraries_ultra_fast(self.blend_file_path, resolve_paths=False)
+        try:
+            return self.scan().raw_library_paths
+        except Exception as e:
+            log.warning(f"Failed to read libraries from {self.blend_file_path}: {e}")
+            return {}
+    
+    def scan(self) -> LibraryScan:
+        """Read the Library blocks of the blend file with a single open.
+        
+        The scan can be passed to ``update_library_paths()`` so the file
+        isn't read again before it is written.
+        
+        Returns:
+            LibraryScan of the blend file
+        """
+        return scan_libraries(self.blend_file_path)
     
     def update_library_path(self, old_path: str, new_path: str, relative: bool = False) -> bool:
         """Update a single library path.
@@ -58,12 +78,18 @@ class LibraryPathWriter:
         """
         return self.update_library_paths({old_path: new_path}, relative=relative) > 0
     
-    def update_library_paths(self, path_mapping: Dict[str, str], relative: bool = False) -> int:
+    def update_library_paths(self, path_mapping: Dict[str, str], relative: bool = False,
+                             scan: Optional[LibraryScan] = None) -> int:
         """Update multiple library paths using optimized matching and I/O.
         
+        The file is read at most once to find the libraries to update, and
+        opened for writing only if there is something to update.
+        
         Args:
             path_mapping: Dictionary mapping old paths to new paths
             relative: If True, convert absolute paths to relative format (default: False)
+            scan: Library scan of this file from an earlier stage. If None,
+                the file is scanned here.
             
         Returns:
             Number of library paths that were updated
@@ -72,16 +98,21 @@ class LibraryPathWriter:
             log.debug("No path mapping provided")
             return 0
 
-        # Fast pre-check: does this file even have libraries?
-        if not SelectiveBlockReader.has_libraries(self.blend_file_path):
+        if scan is None:
+            try:
+                scan = self.scan()
+            except Exception as e:
+                log.warning(f"Failed to read libraries from {self.blend_file_path}: {e}")
+                return 0
+
+        if not scan.has_libraries:
             log.debug("File has no libraries, skipping update")
             return 0
 
         log.debug(f"Updating library paths in {self.blend_file_path}")
         log.debug(f"Path mapping: {path_mapping}")
         
-        # First, check what actually needs updating using fast read
-        current_paths = self.get_library_paths()
+        current_paths = scan.raw_library_paths
         log.debug(f"Found {len(current_paths)} libraries: {current_paths}")
         
         # Find matches using comprehensive strategy
@@ -99,6 +130,79 @@ class LibraryPathWriter:
         # Perform the actual updates
         return self._write_library_updates(libraries_to_update, relative)
     
+    def get_block_paths(self, codes: Iterable[bytes] = PATH_BLOCK_CODES) -> List[BlockPath]:
+        """Get the paths of all path-bearing ID blocks in the blend file, as stored.
+        
+        Args:
+            codes: Block codes to read, defaults to ``PATH_BLOCK_CODES``
+            
+        Returns:
+            List of BlockPaths in file order
+        """
+        try:
+            return scan_block_paths(self.blend_file_path, codes)
+        except Exception as e:
+            log.warning(f"Failed to read paths from {self.blend_file_path}: {e}")
+            return []
+    
+    def update_block_paths(self, path_mapping: Dict[str, str], relative: bool = False,
+                           codes: Iterable[bytes] = PATH_BLOCK_CODES,
+                           block_paths: Optional[List[BlockPath]] = None) -> int:
+        """Update the paths of libraries, images, sounds, fonts, movie clips and cache files.
+        
+        The whole mapping is applied in one pass: the file is read once to
+        find the affected blocks, then all of them are written in a single
+        ``r+b`` session.
+        
+        Args:
+            path_mapping: Dictionary mapping old paths to new paths
+            relative: If True, convert absolute paths to relative format (default: False)
+            codes: Block codes to update, defaults to ``PATH_BLOCK_CODES``
+            block_paths: Block paths of this file from an earlier stage, as
+                stored. If None, the file is read here.
+            
+        Returns:
+            Number of blocks that were updated
+        """
+        if not path_mapping:
+            log.debug("No path mapping provided")
+            return 0
+        
+        codes = list(codes)
+        if block_paths is None:
+            block_paths = self.get_block_paths(codes)
+        wanted = {code.decode('ascii') for code in codes}
+        block_paths = [block_path for block_path in block_paths if block_path.code in wanted]
+        
+        updates = self._find_matching_block_paths(block_paths, path_mapping)
+        if not updates:
+            log.debug("No blocks found that need updating")
+            return 0
+        
+        log.info(f"Found {len(updates)} paths to update in {self.blend_file_path}")
+        return self._write_block_updates(updates, relative)
+    
+    def update_blocks(self, updates: Dict[BlockPath, str], relative: bool = False) -> int:
+        """Update the paths of exactly the given blocks.
+        
+        Unlike ``update_block_paths()``, no path matching strategies are
+        applied: only blocks whose code, name and stored path equal one of
+        the given block paths are written. For callers that already matched
+        the blocks themselves, e.g. from cached block paths.
+        
+        Args:
+            updates: Dictionary mapping block paths, as stored, to their new path
+            relative: If True, convert absolute paths to relative format (default: False)
+            
+        Returns:
+            Number of blocks that were updated
+        """
+        if not updates:
+            return 0
+        
+        log.info(f"Updating {len(updates)} block paths in {self.blend_file_path}")
+        return self._write_block_updates(updates, relative)
+    
     def update_library_path_by_name(self, library_name: str, new_path: str) -> bool:
         """Update a library path by its name/identifier.
         
@@ -130,8 +234,13 @@ class LibraryPathWriter:
         converted_count = 0
         path_mapping = {}
         
-        # Get current library paths
-        current_paths = self.get_library_paths()
+        # Get current library paths, the scan is reused for the update
+        try:
+            scan = self.scan()
+        except Exception as e:
+            log.warning(f"Failed to read libraries from {self.blend_file_path}: {e}")
+            return 0
+        current_paths = scan.raw_library_paths
         
         for name, filepath in current_paths.items():
             # Skip if already relative
@@ -150,7 +259,7 @@ class LibraryPathWriter:
         
         # Apply the updates
         if path_mapping:
-            self.update_library_paths(path_mapping)
+            self.update_library_paths(path_mapping, scan=scan)
         
         return converted_count
     
@@ -171,8 +280,13 @@ class LibraryPathWriter:
         converted_count = 0
         path_mapping = {}
         
-        # Get current library paths
-        current_paths = self.get_library_paths()
+        # Get current library paths, the scan is reused for the update
+        try:
+            scan = self.scan()
+        except Exception as e:
+            log.warning(f"Failed to read libraries from {self.blend_file_path}: {e}")
+            return 0
+        current_paths = scan.raw_library_paths
         
         for name, filepath in current_paths.items():
             # Only process relative paths (those starting with //)
@@ -188,7 +302,7 @@ class LibraryPathWriter:
         
         # Apply the updates
         if path_mapping:
-            self.update_library_paths(path_mapping)
+            self.update_library_paths(path_mapping, scan=scan)
         
         return converted_count
 
@@ -203,7 +317,42 @@ class LibraryPathWriter:
             Dictionary mapping library names to (old_path, new_path) tuples
         """
         libraries_to_update = {}
+        normalized_mapping, flexible_mapping = self._build_match_tables(path_mapping)
+        
+        # Check each library for matches
+        for name, current_filepath in current_paths.items():
+            new_path = self._find_path_match(current_filepath, path_mapping, normalized_mapping, flexible_mapping)
+            if new_path is not None:
+                libraries_to_update[name] = (current_filepath, new_path)
+        
+        return libraries_to_update
+    
+    def _find_matching_block_paths(self, block_paths: List[BlockPath],
+                                   path_mapping: Dict[str, str]) -> Dict[BlockPath, str]:
+        """Find block paths that need updating, with the same strategies as for libraries.
+        
+        Args:
+            block_paths: Paths of the path-bearing ID blocks in the blend file, as stored
+            path_mapping: Dictionary mapping old paths to new paths
+            
+        Returns:
+            Dictionary mapping block paths to their new path
+        """
+        normalized_mapping, flexible_mapping = self._build_match_tables(path_mapping)
         
+        updates = {}
+        for block_path in block_paths:
+            new_path = self._find_path_match(block_path.path, path_mapping, normalized_mapping, flexible_mapping)
+            if new_path is not None:
+                updates[block_path] = new_path
+        return updates
+    
+    def _build_match_tables(self, path_mapping: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Build the lookup tables used by ``_find_path_match``.
+        
+        Returns:
+            Tuple of (normalized mapping, flexible mapping)
+        """
         # Create comprehensive mapping with multiple representations
         flexible_mapping = {}
         normalized_mapping = {}
@@ -216,12 +365,9 @@ class LibraryPathWriter:
             flexible_mapping[old_path] = new_path
             
             # Add normalized path mapping
-            try:
-                normalized_old = str(Path(old_path).resolve())
-                normalized_mapping[normalized_old] = new_path
-                flexible_mapping[normalized_old] = new_path
-            except (OSError, ValueError):
-                pass
+            normalized_old = self._normalize(old_path)
+            normalized_mapping[normalized_old] = new_path
+            flexible_mapping[normalized_old] = new_path
             
             # Add filename-based mapping
             old_filename = None
@@ -238,13 +384,7 @@ class LibraryPathWriter:
             # Add case-insensitive mapping (Windows)
             flexible_mapping[old_path.lower()] = new_path
         
-        # Check each library for matches
-        for name, current_filepath in current_paths.items():
-            new_path = self._find_path_match(current_filepath, path_mapping, normalized_mapping, flexible_mapping)
-            if new_path is not None:
-                libraries_to_update[name] = (current_filepath, new_path)
-        
-        return libraries_to_update
+        return normalized_mapping, flexible_mapping
     
     def _find_path_match(self, current_filepath: str, path_mapping: Dict[str, str], 
                         normalized_mapping: Dict[str, str], flexible_mapping: Dict[str, str]) -> Optional[str]:
@@ -256,19 +396,10 @@ class LibraryPathWriter:
             return path_mapping[current_filepath]
         
         # Strategy 2: Normalized path match
-        try:
-            if current_filepath.startswith('//'):
-                rel_part = current_filepath[2:]
-                blend_dir = self.blend_file_path.parent
-                normalized_current = str((blend_dir / rel_part).resolve())
-            else:
-                normalized_current = str(Path(current_filepath).resolve())
-            
-            if normalized_current in normalized_mapping:
-                log.debug(f"Strategy 2 match: {current_filepath} (normalized: {normalized_current}) -> {normalized_mapping[normalized_current]}")
-                return normalized_mapping[normalized_current]
-        except (OSError, ValueError):
-            pass
+        normalized_current = self._normalize(current_filepath)
+        if normalized_current in normalized_mapping:
+            log.debug(f"Strategy 2 match: {current_filepath} (normalized: {normalized_current}) -> {normalized_mapping[normalized_current]}")
+            return normalized_mapping[normalized_current]
         
         # Strategy 3: Case-insensitive match
         current_lower = current_filepath.lower()
@@ -291,20 +422,14 @@ class LibraryPathWriter:
         
         # Strategy 5: Resolve relative path and check again
         if current_filepath.startswith('//'):
-            try:
-                relative_path = current_filepath[2:]
-                blend_dir = self.blend_file_path.parent
-                resolved_path = (blend_dir / relative_path).resolve()
-                resolved_str = str(resolved_path)
-                
-                if resolved_str in path_mapping:
-                    log.debug(f"Strategy 5 match: {current_filepath} (resolved: {resolved_str}) -> {path_mapping[resolved_str]}")
-                    return path_mapping[resolved_str]
-                elif resolved_str.lower() in flexible_mapping:
-                    log.debug(f"Strategy 5 case-insensitive match: {current_filepath} (resolved: {resolved_str}) -> {flexible_mapping[resolved_str.lower()]}")
-                    return flexible_mapping[resolved_str.lower()]
-            except (OSError, ValueError):
-                pass
+            resolved_str = normalized_current
+            
+            if resolved_str in path_mapping:
+                log.debug(f"Strategy 5 match: {current_filepath} (resolved: {resolved_str}) -> {path_mapping[resolved_str]}")
+                return path_mapping[resolved_str]
+            elif resolved_str.lower() in flexible_mapping:
+                log.debug(f"Strategy 5 case-insensitive match: {current_filepath} (resolved: {resolved_str}) -> {flexible_mapping[resolved_str.lower()]}")
+                return flexible_mapping[resolved_str.lower()]
         
         return None
     
@@ -318,52 +443,177 @@ class LibraryPathWriter:
         Returns:
             Number of libraries updated
         """
+        return self._write_block_updates(self._library_block_updates(libraries_to_update), relative)
+    
+    @staticmethod
+    def _library_block_updates(libraries_to_update: Dict[str, tuple]) -> Dict[BlockPath, str]:
+        """Convert library updates keyed by name into block path updates."""
+        return {BlockPath("LI", name, old_path): new_path
+                for name, (old_path, new_path) in libraries_to_update.items()}
+    
+    def _write_block_updates(self, updates: Dict[BlockPath, str], relative: bool) -> int:
+        """Write path updates of any path-bearing ID blocks to the blend file.
+        
+        All updates are applied in a single ``r+b`` session. Uncompressed
+        files are patched in place; compressed files go through
+        blender-asset-tracer, which recompresses them.
+        
+        Args:
+            updates: Dictionary mapping block paths, as stored, to their new path
+            relative: Whether to convert paths to relative format
+            
+        Returns:
+            Number of blocks updated
+        """
+        try:
+            return self._write_block_updates_in_place(updates, relative)
+        except ValueError as e:
+            log.debug(f"Can't patch {self.blend_file_path} in place ({e}), using blender-asset-tracer")
+            return self._write_block_updates_bat(updates, relative)
+    
+    def _write_block_updates_in_place(self, updates: Dict[BlockPath, str], relative: bool) -> int:
+        """Overwrite the path fields of ID blocks in an uncompressed file.
+        
+        Field offsets come from the shared SDNA layout cache, so the DNA is
+        only parsed for the first file of each Blender version.
+        
+        Raises:
+            ValueError: If the file is compressed or can't be read by the header walker
+        """
         updated_count = 0
+        codes = {block_path.code.encode('ascii') for block_path in updates}
         
-        with blendfile.BlendFile(self.blend_file_path, mode="r+b") as bf:
-            libraries = bf.code_index.get(b"LI", [])
+        with open(self.blend_file_path, "r+b") as fileobj:
+            magic = fileobj.read(4)
+            if magic[:2] == GZIP_MAGIC or magic == ZSTD_MAGIC:
+                raise ValueError("file is compressed")
             
-            for library in libraries:
-                try:
-                    # Get current filepath and name
-                    try:
-                        current_filepath = library[b"filepath"]
-                    except KeyError:
-                        current_filepath = library[b"name"]
-                    
-                    current_name = library[b"name"]
-                    
-                    # Convert to strings
-                    current_filepath_str = bytes_to_string(current_filepath) if isinstance(current_filepath, bytes) else str(current_filepath).rstrip('\x00')
-                    current_name_str = bytes_to_string(current_name) if isinstance(current_name, bytes) else bytes_to_string(current_name)
-                    
-                    # Check if this library needs updating
-                    if current_name_str in libraries_to_update:
-                        old_path, new_path = libraries_to_update[current_name_str]
-                        
-                        # Convert to relative if requested
-                        if relative:
-                            new_path = self._convert_to_relative_path(new_path)
-                        
-                        # Update the library
-                        new_path_bytes = new_path.encode('utf-8') + b'\x00'
-                        
-                        try:
-                            library[b"filepath"] = new_path_bytes
-                            if not current_name_str.startswith('//'):
-                                library[b"name"] = new_path_bytes
-                        except KeyError:
-                            library[b"name"] = new_path_bytes
-                        
-                        updated_count += 1
-                        log.info(f"Updated library path: {current_filepath_str} -> {new_path}")
+            _, sdna, blocks = walk_blocks(fileobj, codes)
+            if blocks and sdna is None:
+                raise ValueError("file has ID blocks but no DNA1 block")
+            
+            for block in blocks:
+                block_path = decode_block_path(sdna, block)
+                if block_path is None or block_path not in updates:
+                    continue
+                
+                new_path = updates[block_path]
+                
+                # Convert to relative if requested
+                if relative:
+                    new_path = self._convert_to_relative_path(new_path)
                 
-                except (KeyError, UnicodeDecodeError) as e:
-                    log.warning(f"Could not update library: {e}")
+                layout = sdna.layout(block.sdna_index)
+                if block.code == b"LI":
+                    # Same fields as the blender-asset-tracer code path: the absolute
+                    # path, and the stored path, which Blender loads the library from
+                    name_field, filepath_field = library_field_names(layout)
+                    field_values = {name_field: self._library_stored_path(block_path.name, new_path)}
+                    if filepath_field in layout.fields:
+                        field_values[filepath_field] = new_path
+                else:
+                    field_values = {path_field_name(layout): new_path}
+                field_bytes = {name: value.encode('utf-8') for name, value in field_values.items()}
+                
+                if any(len(value) >= layout.fields[name][1] for name, value in field_bytes.items()):
+                    log.warning(f"Could not update {block_path.code} block: path too long: {new_path}")
                     continue
+                
+                for name, value in field_bytes.items():
+                    field_offset, field_size, _ = layout.fields[name]
+                    fileobj.seek(block.offset + field_offset)
+                    fileobj.write(value.ljust(field_size, b'\x00'))
+                
+                updated_count += 1
+                log.info(f"Updated {block_path.code} path: {block_path.path} -> {new_path}")
+        
+        return updated_count
+    
+    def _write_block_updates_bat(self, updates: Dict[BlockPath, str], relative: bool) -> int:
+        """Write path updates of ID blocks through blender-asset-tracer."""
+        updated_count = 0
+        codes = {block_path.code.encode('ascii') for block_path in updates}
+        
+        with blendfile.BlendFile(self.blend_file_path, mode="r+b") as bf:
+            for code in codes:
+                for block in bf.code_index.get(code, []):
+                    try:
+                        if code == b"LI":
+                            updated = self._update_library_block_bat(block, updates, relative)
+                        else:
+                            updated = self._update_block_bat(block, updates, relative)
+                    except (KeyError, UnicodeDecodeError) as e:
+                        log.warning(f"Could not update {code.decode()} block: {e}")
+                        continue
+                    if updated:
+                        updated_count += 1
         
         return updated_count
     
+    def _update_library_block_bat(self, library, updates: Dict[BlockPath, str], relative: bool) -> bool:
+        """Update a Library block through blender-asset-tracer, if it has an update."""
+        # Blender 2.93+ stores the path in "filepath" and the absolute path in
+        # "filepath_abs", older versions use "name" and "filepath"
+        if library.dna_type.has_field(b"name"):
+            stored_field, absolute_field = b"name", b"filepath"
+        else:
+            stored_field, absolute_field = b"filepath", b"filepath_abs"
+        
+        current_name_str = bytes_to_string(library[stored_field])
+        current_filepath_str = current_name_str
+        if library.dna_type.has_field(absolute_field):
+            current_filepath_str = bytes_to_string(library[absolute_field]) or current_name_str
+        
+        new_path = updates.get(BlockPath("LI", current_name_str, current_filepath_str))
+        if new_path is None:
+            return False
+        
+        # Convert to relative if requested
+        if relative:
+            new_path = self._convert_to_relative_path(new_path)
+        
+        # Update the library
+        library[stored_field] = self._library_stored_path(current_name_str, new_path).encode('utf-8') + b'\x00'
+        if library.dna_type.has_field(absolute_field):
+            library[absolute_field] = new_path.encode('utf-8') + b'\x00'
+        
+        log.info(f"Updated library path: {current_filepath_str} -> {new_path}")
+        return True
+    
+    def _update_block_bat(self, block, updates: Dict[BlockPath, str], relative: bool) -> bool:
+        """Update an Image, Sound, ... block through blender-asset-tracer, if it has an update."""
+        field_name = b"filepath"
+        current_path = block.get(field_name, default=None)
+        if current_path is None:
+            field_name = b"name"
+            current_path = block[field_name]
+        
+        code = block.code.decode('ascii')
+        id_name = bytes_to_string(block.get((b"id", b"name"), default=b""))[2:]
+        current_path_str = bytes_to_string(current_path)
+        
+        new_path = updates.get(BlockPath(code, id_name, current_path_str))
+        if new_path is None:
+            return False
+        
+        # Convert to relative if requested
+        if relative:
+            new_path = self._convert_to_relative_path(new_path)
+        
+        block[field_name] = new_path.encode('utf-8') + b'\x00'
+        log.info(f"Updated {code} path: {current_path_str} -> {new_path}")
+        return True
+    
+    def _library_stored_path(self, current_stored_path: str, new_path: str) -> str:
+        """Get the path to store in a library's name, keeping it relative if it was."""
+        if current_stored_path.startswith('//') and not new_path.startswith('//'):
+            return self._convert_to_relative_path(new_path)
+        return new_path
+    
+    def _normalize(self, path: str) -> str:
+        """Normalize a path relative to this blend file, with string operations only."""
+        return normalize_path(path, self._base_dir)
+    
     def _convert_to_relative_path(self, absolute_path: str) -> str:
         """Convert an absolute path to Blender relative format if possible."""
         try:
@@ -398,19 +648,10 @@ class LibraryPathWriter:
                 found_match = True
                 
             if not found_match:
-                try:
-                    if current_filepath.startswith('//'):
-                        rel_part = current_filepath[2:]
-                        blend_dir = self.blend_file_path.parent
-                        normalized_current = str((blend_dir / rel_part).resolve())
-                    else:
-                        normalized_current = str(Path(current_filepath).resolve())
-                        
-                    if normalized_current in path_mapping:
-                        log.info(f"✓ NORMALIZED match for '{current_filepath}' (normalized: '{normalized_current}') -> '{path_mapping[normalized_current]}'")
-                        found_match = True
-                except (OSError, ValueError) as e:
-                    log.info(f"  Could not normalize '{current_filepath}': {e}")
+                normalized_current = self._normalize(current_filepath)
+                if normalized_current in path_mapping:
+                    log.info(f"✓ NORMALIZED match for '{current_filepath}' (normalized: '{normalized_current}') -> '{path_mapping[normalized_current]}'")
+                    found_match = True
                     
             if not found_match:
                 current_filename = None
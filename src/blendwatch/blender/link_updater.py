@@ -4,12 +4,16 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 from pathlib import Path
-from typing import Iterable, List, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from blender_asset_tracer.cli.common import shorten
 from blendwatch.blender.backlinks import BacklinkScanner
+from blendwatch.blender.block_level_optimizations import ASSET_BLOCK_CODES, resolve_library_path
+from blendwatch.blender.cache import BlendFileCache
 from blendwatch.blender.library_writer import LibraryPathWriter, update_blend_file_paths
+from blendwatch.utils.path_utils import resolve_path
 
 log = logging.getLogger(__name__)
 
@@ -60,6 +64,81 @@ def parse_move_log_simple(log_file: Union[str, Path]) -> List[Move]:
     return moves
 
 
+def _track_blend_moves(scanner: BacklinkScanner, moves: List[Move]) -> None:
+    """Re-point cached entries of moved blend files so they aren't re-parsed."""
+    for old_path, new_path in moves:
+        if old_path.lower().endswith('.blend'):
+            scanner.cache.move_file(old_path, new_path)
+
+
+def _is_asset_move(old_path: str) -> bool:
+    """Whether a move is of an image, sound or other non-blend asset."""
+    return Path(old_path).suffix.lower() not in ('', '.blend')
+
+
+def _apply_asset_moves(scanner: BacklinkScanner, moves: List[Move], *,
+                       dry_run: bool, verbose: bool, relative: bool) -> int:
+    """Rewrite image, sound, font, movie clip and cache file paths for moved assets.
+    
+    All moves are matched against the cached block paths of every blend file
+    at once, so each affected file is written in a single session, however
+    many of its references moved.
+    
+    Returns:
+        Number of block paths updated
+    """
+    # Later moves of the same file win
+    asset_moves: Dict[str, str] = {}
+    for old_path, new_path in moves:
+        if _is_asset_move(old_path):
+            asset_moves[os.path.normcase(os.path.normpath(old_path))] = new_path
+    if not asset_moves:
+        return 0
+    
+    wanted = {code.decode('ascii') for code in ASSET_BLOCK_CODES}
+    total_updates = 0
+    cwd = Path.cwd()
+    
+    for blend_file in scanner.find_blend_files():
+        block_paths = scanner.cache.get_block_paths(blend_file, resolve_paths=False)
+        if not block_paths:
+            continue
+        
+        # The blocks are matched here, so only exactly these get written
+        updates = {}
+        for block_path in block_paths:
+            if block_path.code not in wanted:
+                continue
+            resolved = resolve_library_path(blend_file, block_path.path)
+            new_path = asset_moves.get(os.path.normcase(resolved))
+            if new_path is not None:
+                updates[block_path] = new_path
+        if not updates:
+            continue
+        
+        if dry_run:
+            total_updates += len(updates)
+            if verbose:
+                for new_path in updates.values():
+                    print(f"Would update {shorten(cwd, Path(blend_file))} -> {shorten(cwd, Path(new_path))}")
+            continue
+        
+        try:
+            writer = LibraryPathWriter(blend_file)
+            updated = writer.update_blocks(updates, relative=relative)
+        except Exception as e:
+            log.warning(f"Could not update {blend_file}: {e}")
+            continue
+        
+        if updated:
+            total_updates += updated
+            scanner.cache.invalidate_file(blend_file)
+            if verbose:
+                print(f"Updated {updated} asset paths in {shorten(cwd, Path(blend_file))}")
+    
+    return total_updates
+
+
 def apply_move_log_incremental(
     log_file: Union[str, Path],
     search_directory: Union[str, Path],
@@ -68,9 +147,13 @@ def apply_move_log_incremental(
     dry_run: bool = False,
     verbose: bool = False,
     relative: bool = False,
+    cache: Optional[BlendFileCache] = None,
 ) -> Tuple[int, int]:
     """Update library paths for move operations from a specific position in the log.
 
+    Moves of images, sounds and other non-blend assets are applied to the
+    matching ID blocks, one write per affected blend file.
+
     Parameters
     ----------
     log_file:
@@ -85,11 +168,13 @@ def apply_move_log_incremental(
         Print information about every update performed.
     relative:
         If True, write library paths in relative format (default: False).
+    cache:
+        Library cache to search with, e.g. one kept up to date by a watcher.
 
     Returns
     -------
     Tuple[int, int]
-        (Number of library paths updated, new position in log file)
+        (Number of library and asset paths updated, new position in log file)
     """
     moves, new_position = parse_move_log(log_file, start_position)
     if not moves:
@@ -98,20 +183,25 @@ def apply_move_log_incremental(
     # Optimize by collecting unique old paths to avoid redundant backlink searches
     move_map = {}  # old_path -> list of new_paths
     for old_path, new_path in moves:
+        if _is_asset_move(old_path):
+            continue
         if old_path not in move_map:
             move_map[old_path] = []
         move_map[old_path].append(new_path)
 
-    scanner = BacklinkScanner(search_directory)
+    scanner = BacklinkScanner(search_directory, cache=cache)
+    _track_blend_moves(scanner, moves)
     total_updates = 0
 
+    # Find the backlinks of all moved files in a single pass
+    backlinks = scanner.find_backlinks_to_multiple_files(list(move_map)) if move_map else {}
+
     # Process each unique old path once
     for old_path, new_paths in move_map.items():
         if verbose:
             print(f"Processing moves for: {old_path} -> {new_paths}")
         
-        # Find backlinks once for this old path
-        results = scanner.find_backlinks_to_file(old_path)
+        results = backlinks.get(resolve_path(old_path), [])
         
         # Apply updates for each new path (in case there are multiple renames)
         for new_path in new_paths:
@@ -156,6 +246,8 @@ def apply_move_log_incremental(
                 except Exception as e:
                     log.warning(f"Could not update {result.blend_file}: {e}")
 
+    total_updates += _apply_asset_moves(scanner, moves, dry_run=dry_run, verbose=verbose, relative=relative)
+
     # Save cache for next time
     scanner.save_cache()
     
@@ -178,6 +270,9 @@ def apply_move_log(
 ) -> int:
     """Update library paths for all move operations recorded in ``log_file``.
 
+    Moves of images, sounds and other non-blend assets are applied to the
+    matching ID blocks, one write per affected blend file.
+
     Parameters
     ----------
     log_file:
@@ -194,7 +289,7 @@ def apply_move_log(
     Returns
     -------
     int
-        Number of library paths updated
+        Number of library and asset paths updated
     """
     log_path = Path(log_file)
     if not log_path.exists() or log_path.stat().st_size == 0:
@@ -221,9 +316,12 @@ def apply_move_log(
         return 0
 
     scanner = BacklinkScanner(search_directory)
+    _track_blend_moves(scanner, moves)
     total_updates = 0
 
     for old_path, new_path in moves:
+        if _is_asset_move(old_path):
+            continue
         results = scanner.find_backlinks_to_file(old_path)
         for result in results:
             try:
@@ -258,4 +356,5 @@ def apply_move_log(
             except Exception as e:
                 log.warning(f"Could not update {result.blend_file}: {e}")
 
+    total_updates += _apply_asset_moves(scanner, moves, dry_run=dry_run, verbose=verbose, relative=relative)
     return total_updates
@@ -0,0 +1,213 @@
+"""
+Relinking for BlendWatch.
+
+This module finds new locations for broken library links after files were
+moved without BlendWatch watching, using the file index instead of searching
+the filesystem for every broken link. Libraries are found by file name, or
+by content fingerprint if they were renamed as well.
+"""
+
+import logging
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from blendwatch.blender.cache import BlendFileCache
+from blendwatch.blender.library_writer import LibraryPathWriter
+from blendwatch.blender.validation import BrokenLink
+from blendwatch.core.file_index import FileIndex, FileInfo, default_snapshot_file
+
+log = logging.getLogger(__name__)
+
+
+class Relink(NamedTuple):
+    """New locations found for a broken library link."""
+    link: BrokenLink
+    candidates: List[str]  # Existing files that could be the library, best first
+    ambiguous: bool  # Whether the best candidates rank the same
+
+    @property
+    def new_path(self) -> Optional[str]:
+        """The path to relink to, or None if there is no clear best candidate."""
+        if self.candidates and not self.ambiguous:
+            return self.candidates[0]
+        return None
+
+
+def load_file_index(search_directory: Union[str, Path], extensions: Sequence[str],
+                    ignore_patterns: Optional[List[str]] = None,
+                    fingerprint_rate: float = 0.0) -> Tuple[FileIndex, bool]:
+    """Get a file index of a directory, from its snapshot if there is one.
+
+    The snapshot is written by the file index of a running watcher. Without
+    one, the directory tree is walked once.
+
+    Args:
+        search_directory: Directory to index
+        extensions: File extensions to index, ``.blend`` is always included
+        ignore_patterns: List of regex patterns for paths to ignore
+        fingerprint_rate: Bytes per second that may be read to fingerprint
+            candidates, 0 for no limit
+
+    Returns:
+        Tuple of (file index, whether it was loaded from a snapshot)
+    """
+    search_directory = str(search_directory)
+    file_index = FileIndex(search_directory, sorted(set(extensions) | {'.blend'}), rescan_interval=0,
+                           ignore_patterns=ignore_patterns,
+                           snapshot_file=default_snapshot_file(search_directory),
+                           fingerprint_rate=fingerprint_rate)
+    if file_index.load_snapshot():
+        return file_index, True
+
+    file_index.rescan()
+    return file_index, False
+
+
+def _shared_parents(old_path: str, new_path: str) -> int:
+    """Count the parent directory names two paths end with, ignoring case."""
+    old_parents = Path(old_path).parent.parts[::-1]
+    new_parents = Path(new_path).parent.parts[::-1]
+    count = 0
+    for old_part, new_part in zip(old_parents, new_parents):
+        if old_part.casefold() != new_part.casefold():
+            break
+        count += 1
+    return count
+
+
+def _known_file(path: str, file_index: FileIndex, cache: Optional[BlendFileCache]) -> Optional[FileInfo]:
+    """Get what was known about a missing file, from the file index or the cache."""
+    known = file_index.get_file_info(path)
+    if cache is None or (known is not None and known.checksum is not None):
+        return known
+
+    # Libraries are blend files, so the cache may have fingerprinted them
+    entry = cache.get_last_known_entry(path)
+    if entry is None or entry.fingerprint is None or (known is not None and known.size != entry.size):
+        return known
+    return FileInfo(path=path, size=entry.size, mtime=entry.mtime_ns / 1e9, checksum=entry.fingerprint)
+
+
+def _rank_candidates(link: BrokenLink, known: Optional[FileInfo],
+                     file_index: FileIndex) -> Tuple[List[str], bool]:
+    """Rank the indexed files that could be the missing target of a link.
+
+    Candidates have the same file name, ignoring case, or the content
+    fingerprint the target had. They rank by matching that fingerprint, by
+    matching the size the target had, by exact file name, by how many parent
+    directories they share with the old location and by how close their
+    mtime is.
+
+    Returns:
+        Tuple of (candidate paths, best first, whether the best two tie)
+    """
+    name = os.path.basename(link.resolved_path)
+    excluded = {os.path.normcase(link.resolved_path), os.path.normcase(str(link.blend_file))}
+    fingerprint = known.checksum if known is not None else None
+
+    candidates = {info.path: info for info in file_index.find_by_name(name)}
+    if fingerprint is not None:
+        # Also finds the target if it was renamed
+        for info in file_index.find_by_fingerprint(fingerprint, known.size):
+            candidates.setdefault(info.path, info)
+
+    ranked = []
+    for candidate in candidates.values():
+        # The index may be a snapshot from before the move
+        if os.path.normcase(candidate.path) in excluded or not os.path.isfile(candidate.path):
+            continue
+
+        same_size = known is not None and candidate.size == known.size
+        key = (
+            same_size and fingerprint is not None and file_index.get_fingerprint(candidate.path) == fingerprint,
+            same_size,
+            os.path.basename(candidate.path) == name,
+            _shared_parents(link.resolved_path, candidate.path),
+            -abs(candidate.mtime - known.mtime) if known is not None else 0.0,
+        )
+        ranked.append((key, candidate.path))
+
+    ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    ambiguous = len(ranked) > 1 and ranked[0][0][:4] == ranked[1][0][:4]
+    return [path for _, path in ranked], ambiguous
+
+
+def plan_relinks(broken: Dict[Path, List[BrokenLink]], file_index: FileIndex,
+                 cache: Optional[BlendFileCache] = None, rescan_missing: bool = False) -> List[Relink]:
+    """Find new locations for broken library links.
+
+    Args:
+        broken: Broken links per blend file, as found by ``find_broken_links()``
+        file_index: Index to look up candidates in
+        cache: Cache to look up the last known size and fingerprint of missing
+            libraries in, when the index doesn't have them
+        rescan_missing: If True, rescan the index once when a link has no
+            candidates, e.g. because it was loaded from an old snapshot
+
+    Returns:
+        List of Relinks, one per broken library link
+    """
+    links = [link for blend_file in sorted(broken) for link in broken[blend_file] if link.code == "LI"]
+    # What was known about the targets before they went missing, a rescan forgets it
+    known = {link.resolved_path: _known_file(link.resolved_path, file_index, cache) for link in links}
+
+    plan = [Relink(link, *_rank_candidates(link, known[link.resolved_path], file_index)) for link in links]
+    if rescan_missing and any(not relink.candidates for relink in plan):
+        log.info("Rescanning file index for broken links without candidates")
+        file_index.rescan()
+        plan = [relink if relink.candidates else
+                Relink(relink.link, *_rank_candidates(relink.link, known[relink.link.resolved_path], file_index))
+                for relink in plan]
+    return plan
+
+
+def apply_relinks(plan: List[Relink], cache: BlendFileCache, relative: bool = False,
+                  dry_run: bool = False) -> int:
+    """Rewrite broken library links to their best candidate.
+
+    Links without a clear best candidate are left alone. All relinks of a
+    blend file are written in a single session.
+
+    Args:
+        plan: Relinks from ``plan_relinks()``
+        cache: Cache the links were read from, invalidated for updated files
+        relative: If True, write the new paths in relative format
+        dry_run: If True, only count the links that would be updated
+
+    Returns:
+        Number of library paths updated
+    """
+    by_file: Dict[Path, List[Relink]] = defaultdict(list)
+    for relink in plan:
+        if relink.new_path is not None:
+            by_file[relink.link.blend_file].append(relink)
+
+    if dry_run:
+        return sum(len(relinks) for relinks in by_file.values())
+
+    total_updates = 0
+    for blend_file, relinks in by_file.items():
+        block_paths = cache.get_block_paths(blend_file, resolve_paths=False)
+        if not block_paths:
+            continue
+
+        # Only the libraries in the plan are written, not others with the same file name.
+        # Blender loads a library from its name, which is the stored path of the link
+        new_paths = {(relink.link.name, relink.link.stored_path): relink.new_path for relink in relinks}
+        updates = {block_path: new_paths[block_path.name, block_path.name] for block_path in block_paths
+                   if block_path.code == "LI" and (block_path.name, block_path.name) in new_paths}
+
+        try:
+            writer = LibraryPathWriter(blend_file)
+            updated = writer.update_blocks(updates, relative=relative)
+        except Exception as e:
+            log.warning(f"Could not relink {blend_file}: {e}")
+            continue
+
+        if updated:
+            total_updates += updated
+            cache.invalidate_file(blend_file)
+
+    return total_updates
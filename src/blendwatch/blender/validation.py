@@ -0,0 +1,288 @@
+"""
+Link validation for BlendWatch.
+
+This module finds broken library and asset links across a whole project,
+using the paths stored in the blend file cache instead of tracing every
+file's dependencies.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+import string
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Pattern, Set
+
+from blendwatch.blender.cache import BlendFileCache
+from blendwatch.utils.path_utils import normalize_path
+
+log = logging.getLogger(__name__)
+
+# Whether file names that differ only in case are the same file
+_CASE_INSENSITIVE = os.name == 'nt' or sys.platform == 'darwin'
+
+# Blender's tile tokens: <UDIM> is 1001, 1002, ..., <UVTILE> is u1_v1, u2_v1, ...
+_TILE_TOKENS = {"<UDIM>": r"\d{4}", "<UVTILE>": r"u\d+_v\d+"}
+
+# Codes of the ID blocks that can store an image sequence or tile set
+_SEQUENCE_CODES = {"IM", "MC"}
+
+
+class BrokenLink(NamedTuple):
+    """A path stored in a blend file that doesn't exist on disk."""
+    blend_file: Path
+    code: str  # ID block code, e.g. "LI" for libraries or "IM" for images
+    name: str  # Library or ID block name
+    stored_path: str  # Path as stored in the blend file
+    resolved_path: str  # Absolute path that was checked
+
+
+def _sequence_pattern(name: str) -> Optional[Pattern[str]]:
+    """Get a pattern matching the file names of an image sequence or tile set.
+
+    Args:
+        name: File name of the sequence as stored, with tile tokens, a glob
+            pattern or the frame number of one of its files
+
+    Returns:
+        Compiled pattern, or None if the name isn't a sequence
+    """
+    flags = re.IGNORECASE if _CASE_INSENSITIVE else 0
+    tokens = [token for token in _TILE_TOKENS if token in name]
+    if tokens:
+        parts = re.split("(%s)" % "|".join(map(re.escape, tokens)), name)
+        return re.compile("".join(_TILE_TOKENS.get(part, re.escape(part)) for part in parts), flags)
+
+    if any(char in name for char in "*?["):
+        return re.compile(fnmatch.translate(name), flags)
+
+    # The path of one frame, e.g. render_0001.png, matches every frame
+    stem, suffix = os.path.splitext(name)
+    stem_no_digits = stem.rstrip(string.digits)
+    if stem_no_digits == stem:
+        return None
+    return re.compile(re.escape(stem_no_digits) + r"\d+" + re.escape(suffix), flags)
+
+
+class DirectoryListingCache:
+    """Checks whether paths exist with one directory listing per directory.
+
+    Each directory is listed at most once, however many of its entries are
+    checked, and the listings can be filled from several threads.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        # Directory -> names in it, None if it can't be listed
+        self._listings: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._folded: Dict[str, FrozenSet[str]] = {}
+
+    def _listing(self, directory: str) -> Optional[FrozenSet[str]]:
+        """Get the names in a directory, listing it on first use."""
+        with self._lock:
+            if directory in self._listings:
+                return self._listings[directory]
+
+        try:
+            listing: Optional[FrozenSet[str]] = frozenset(os.listdir(directory))
+        except OSError:
+            listing = None
+
+        with self._lock:
+            self._listings[directory] = listing
+        return listing
+
+    def list_directories(self, directories: Iterable[str], max_workers: int = 4):
+        """List several directories up front, in parallel.
+
+        Args:
+            directories: Directories to list
+            max_workers: Number of threads listing directories
+        """
+        pending = [directory for directory in set(directories) if directory not in self._listings]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self._listing, pending))
+
+    def exists(self, path: str) -> bool:
+        """Check if an absolute, normalized path exists.
+
+        Args:
+            path: Path to check
+
+        Returns:
+            True if the path exists
+        """
+        directory, name = os.path.split(path)
+        if not name:
+            return os.path.isdir(path)
+
+        listing = self._listing(directory)
+        if listing is None:
+            return False
+        if name in listing:
+            return True
+
+        # On case-insensitive filesystems the stored case may differ from the
+        # listed one, only then is the path checked on its own
+        with self._lock:
+            folded = self._folded.get(directory)
+            if folded is None:
+                folded = self._folded[directory] = frozenset(entry.casefold() for entry in listing)
+        return name.casefold() in folded and os.path.exists(path)
+
+    def sequence_files(self, path: str) -> List[str]:
+        """Find the files of an image sequence or tile set in its directory listing.
+
+        Frame and tile numbers are matched against the listing, so however
+        many files a sequence has, only its directory is read.
+
+        Args:
+            path: Absolute, normalized path of the sequence, with tile tokens
+                like ``<UDIM>``, a glob pattern or the path of one frame
+
+        Returns:
+            Paths of the files in the sequence, sorted
+        """
+        directory, name = os.path.split(path)
+        pattern = _sequence_pattern(name)
+        listing = self._listing(directory)
+        if pattern is None or listing is None:
+            return []
+        return sorted(os.path.join(directory, entry) for entry in listing if pattern.fullmatch(entry))
+
+    def asset_exists(self, path: str, is_sequence: bool = False) -> bool:
+        """Check if an asset exists, or any file of it for sequences and tile sets.
+
+        Args:
+            path: Absolute, normalized path of the asset
+            is_sequence: Whether the path is an image sequence or tile set
+
+        Returns:
+            True if the asset exists
+        """
+        if self.exists(path):
+            return True
+        return is_sequence and bool(self.sequence_files(path))
+
+
+class StatCache:
+    """Stats each path at most once.
+
+    Files needed by many blend files are only stat'ed once per run, and the
+    stats can be filled from several threads.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        # Path -> its stat result, None if it can't be stat'ed
+        self._stats: Dict[str, Optional[os.stat_result]] = {}
+
+    def _stat(self, path: str) -> Optional[os.stat_result]:
+        """Stat a path on first use."""
+        with self._lock:
+            if path in self._stats:
+                return self._stats[path]
+
+        try:
+            stat: Optional[os.stat_result] = os.stat(path)
+        except OSError:
+            stat = None
+
+        with self._lock:
+            self._stats[path] = stat
+        return stat
+
+    def stat_many(self, paths: Iterable[str], max_workers: int = 4):
+        """Stat several paths up front, in parallel.
+
+        Args:
+            paths: Paths to stat
+            max_workers: Number of threads calling stat
+        """
+        pending = [path for path in set(paths) if path not in self._stats]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self._stat, pending))
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        """Get the stat result of a path.
+
+        Args:
+            path: Path to stat
+
+        Returns:
+            The stat result, or None if the path doesn't exist or can't be accessed
+        """
+        return self._stat(path)
+
+
+def _stored_links(cache: BlendFileCache, blend_file: Path) -> List[BrokenLink]:
+    """Get all library and asset paths of a blend file, resolved, as link candidates."""
+    block_paths = cache.get_block_paths(blend_file, resolve_paths=False)
+    if not block_paths:
+        return []
+
+    base_dir = str(blend_file.parent)
+    links = []
+    for block_path in block_paths:
+        # Blender loads libraries from the path stored as their name
+        stored_path = block_path.name if block_path.code == "LI" and block_path.name else block_path.path
+        if not stored_path:
+            # E.g. generated images
+            continue
+        links.append(BrokenLink(
+            blend_file=blend_file,
+            code=block_path.code,
+            name=block_path.name,
+            stored_path=stored_path,
+            resolved_path=normalize_path(stored_path, base_dir)
+        ))
+    return links
+
+
+def find_broken_links(blend_files: List[Path], cache: BlendFileCache,
+                      max_workers: int = 4) -> Dict[Path, List[BrokenLink]]:
+    """Find library and asset paths that don't exist, across many blend files.
+
+    The paths are read from the cache, so only files that were never cached
+    or changed on disk are parsed. Every target is checked once, however many
+    files link to it, and existence is checked against one listing per
+    directory.
+
+    Args:
+        blend_files: Blend files to validate
+        cache: Cache to read the stored paths from
+        max_workers: Number of threads reading files and listing directories
+
+    Returns:
+        Dictionary mapping each blend file with broken links to those links
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        links_per_file = list(executor.map(lambda blend_file: _stored_links(cache, blend_file), blend_files))
+
+    targets: Set[str] = {link.resolved_path for links in links_per_file for link in links}
+    # Sequences and tile sets exist if any of their files does, like in find_missing_dependencies()
+    sequences: Set[str] = {link.resolved_path for links in links_per_file for link in links
+                           if link.code in _SEQUENCE_CODES
+                           and _sequence_pattern(os.path.basename(link.resolved_path)) is not None}
+    listings = DirectoryListingCache()
+    listings.list_directories((os.path.dirname(target) for target in targets), max_workers=max_workers)
+    missing = {target for target in targets if not listings.asset_exists(target, target in sequences)}
+    log.info(f"Checked {len(targets)} unique link targets in {len(blend_files)} files, "
+             f"{len(missing)} missing")
+
+    broken = {}
+    for links in links_per_file:
+        broken_links = [link for link in links if link.resolved_path in missing]
+        if broken_links:
+            broken[broken_links[0].blend_file] = broken_links
+    return broken
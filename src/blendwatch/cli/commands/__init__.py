@@ -10,6 +10,9 @@ from .update_links import update_links_command, update_alias
 from .backlinks import backlinks_command, links_alias
 from .sync import sync_command, auto_alias
 from .status import status_command
+from .validate import validate_command
+from .relink import relink_command
+from .manifest import manifest_command
 
 __all__ = [
     'watch_command', 'watch_alias',
@@ -19,4 +22,7 @@ __all__ = [
     'backlinks_command', 'links_alias',
     'sync_command', 'auto_alias',
     'status_command',
+    'validate_command',
+    'relink_command',
+    'manifest_command',
 ]
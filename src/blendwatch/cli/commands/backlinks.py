@@ -11,7 +11,7 @@ import click
 from colorama import Fore, Style
 from blender_asset_tracer.cli.common import shorten
 
-from blendwatch.blender.backlinks import BacklinkScanner
+from blendwatch.blender.backlinks import BacklinkResult, BacklinkScanner, TransitiveBacklinks
 from blendwatch.core.config import load_default_config
 from blendwatch.cli.utils import load_config_with_fallback, check_file_exists, check_directory_exists, handle_cli_exception
 
@@ -24,16 +24,25 @@ from blendwatch.cli.utils import load_config_with_fallback, check_file_exists, c
 @click.option('--max-workers', '-w', default=4, type=int,
               help='Number of parallel threads for scanning (default: 4)')
 @click.option('--output-format', '-f', 
-              type=click.Choice(['json', 'table'], case_sensitive=False),
+              type=click.Choice(['json', 'ndjson', 'table'], case_sensitive=False),
               default='table',
-              help='Output format (default: table)')
+              help='Output format (default: table). Table and ndjson rows are printed as they are found.')
+@click.option('--match-basename', is_flag=True,
+              help='Also match libraries with the same file name in other directories')
+@click.option('--recursive', '-r', is_flag=True,
+              help='Also find files that link to the target through other libraries')
+@click.option('--max-depth', type=click.IntRange(min=1),
+              help='With --recursive, maximum number of links between a file and the target')
 @click.option('--verbose', '-v', is_flag=True,
               help='Enable verbose output')
 def backlinks_command(target_asset: str, search_directory: str, config: Optional[str], 
-                      max_workers: int, output_format: str, verbose: bool):
+                      max_workers: int, output_format: str, match_basename: bool,
+                      recursive: bool, max_depth: Optional[int], verbose: bool):
     """Find all blend files that link to the target asset.
     
-    TARGET_ASSET: Path to the asset file to find backlinks for
+    TARGET_ASSET: Path to the library or asset file (image, sound, font, movie
+    clip or cache file) to find backlinks for, or a directory to find links
+    to anything below it
     SEARCH_DIRECTORY: Directory to search for blend files (default: current directory)
     """
     
@@ -51,6 +60,8 @@ def backlinks_command(target_asset: str, search_directory: str, config: Optional
     
     # Load configuration with fallback
     config_obj = load_config_with_fallback(config, search_path, verbose)
+    if match_basename:
+        config_obj.match_basename = True
     
     try:
         cwd = Path.cwd()
@@ -69,39 +80,43 @@ def backlinks_command(target_asset: str, search_directory: str, config: Optional
         if verbose:
             click.echo(f"Scanning for backlinks to {target_path.name}...")
         
-        results = scanner.find_backlinks_to_file(target_path, max_workers=max_workers)
-        
-        if verbose:
-            click.echo(f"Scan completed. Found {len(results)} backlinks.")
+        if recursive:
+            _output_transitive_backlinks(scanner.find_transitive_backlinks(target_path, max_depth=max_depth),
+                                         output_format, cwd)
+            return
         
+        if target_path.is_dir():
+            results = scanner.iter_backlinks_to_directory(target_path)
+        else:
+            results = scanner.iter_backlinks_to_file(target_path)
         
-        # Output results
+        # Output results as they are found
         if output_format == 'json':
-            # Convert results to JSON-serializable format
-            json_results = []
+            # A JSON document can only be printed once it is complete
+            click.echo(json.dumps([_backlink_to_json(result) for result in results], indent=2))
+        elif output_format == 'ndjson':
             for result in results:
-                json_results.append({
-                    'blend_file': str(result.blend_file),
-                    'library_paths': result.library_paths,
-                    'matching_libraries': result.matching_libraries
-                })
-            click.echo(json.dumps(json_results, indent=2))
+                click.echo(json.dumps(_backlink_to_json(result)))
         else:  # table format
-            if results:
-                click.echo(f"\n{Fore.GREEN}Found {len(results)} backlinks to {target_path.name}:{Style.RESET_ALL}\n")
+            count = 0
+            for count, result in enumerate(results, 1):
+                if count == 1:
+                    click.echo(f"\n{Fore.GREEN}Backlinks to {target_path.name}:{Style.RESET_ALL}\n")
+                
+                rel_path = shorten(cwd, result.blend_file)
+                click.echo(f"{Fore.YELLOW}{count:2d}.{Style.RESET_ALL} {Fore.CYAN}{result.blend_file.name}{Style.RESET_ALL}")
+                click.echo(f"     Path: {rel_path}")
+                click.echo(f"     Links: {Fore.MAGENTA}{', '.join(result.matching_libraries)}{Style.RESET_ALL}")
                 
-                for i, result in enumerate(results, 1):
-                    rel_path = shorten(cwd, result.blend_file)
-                    click.echo(f"{Fore.YELLOW}{i:2d}.{Style.RESET_ALL} {Fore.CYAN}{result.blend_file.name}{Style.RESET_ALL}")
-                    click.echo(f"     Path: {rel_path}")
-                    click.echo(f"     Libraries: {Fore.MAGENTA}{', '.join(result.matching_libraries)}{Style.RESET_ALL}")
-                    
-                    if verbose:
-                        click.echo(f"     All library paths:")
-                        for lib_name, lib_path in result.library_paths.items():
-                            marker = Fore.GREEN + "→ " + Style.RESET_ALL if lib_name in result.matching_libraries else "  "
-                            click.echo(f"       {marker}{lib_name}: {lib_path}")
-                    click.echo()
+                if verbose:
+                    click.echo(f"     All library paths:")
+                    for lib_name, lib_path in result.library_paths.items():
+                        marker = Fore.GREEN + "→ " + Style.RESET_ALL if lib_name in result.matching_libraries else "  "
+                        click.echo(f"       {marker}{lib_name}: {lib_path}")
+                click.echo()
+            
+            if count:
+                click.echo(f"{Fore.GREEN}Found {count} backlinks to {target_path.name}{Style.RESET_ALL}")
             else:
                 click.echo(f"{Fore.YELLOW}No backlinks found for {target_path.name}{Style.RESET_ALL}")
     
@@ -109,6 +124,61 @@ def backlinks_command(target_asset: str, search_directory: str, config: Optional
         handle_cli_exception(e, verbose)
 
 
+def _backlink_to_json(result: BacklinkResult) -> dict:
+    """Convert a backlink result to a JSON-serializable dictionary."""
+    return {
+        'blend_file': str(result.blend_file),
+        'library_paths': dict(result.library_paths),
+        'matching_libraries': result.matching_libraries
+    }
+
+
+def _output_transitive_backlinks(result: TransitiveBacklinks, output_format: str, cwd: Path):
+    """Print the files depending on a target, nearest first."""
+    # File -> files in the result it links to directly
+    links_to = {}
+    for node, dependents in result.edges.items():
+        for dependent in dependents:
+            links_to.setdefault(dependent, []).append(node)
+    dependents = sorted(result.depths, key=lambda path: (result.depths[path], str(path)))
+    
+    rows = [{
+        'blend_file': str(blend_file),
+        'depth': result.depths[blend_file],
+        'links_to': [str(path) for path in links_to.get(blend_file, [])]
+    } for blend_file in dependents]
+    
+    if output_format == 'json':
+        click.echo(json.dumps({
+            'target': str(result.target),
+            'dependents': rows,
+            'cycles': [[str(path) for path in cycle] for cycle in result.cycles],
+            'truncated': result.truncated
+        }, indent=2))
+        return
+    if output_format == 'ndjson':
+        for row in rows:
+            click.echo(json.dumps(row))
+        return
+    
+    if not dependents:
+        click.echo(f"{Fore.YELLOW}No files depend on {result.target.name}{Style.RESET_ALL}")
+        return
+    
+    click.echo(f"\n{Fore.GREEN}Found {len(dependents)} files depending on {result.target.name}:{Style.RESET_ALL}\n")
+    for i, blend_file in enumerate(dependents, 1):
+        click.echo(f"{Fore.YELLOW}{i:2d}.{Style.RESET_ALL} {Fore.CYAN}{blend_file.name}{Style.RESET_ALL} "
+                   f"(depth {result.depths[blend_file]})")
+        click.echo(f"     Path: {shorten(cwd, blend_file)}")
+        via = ', '.join(path.name for path in links_to.get(blend_file, []))
+        click.echo(f"     Links to: {Fore.MAGENTA}{via}{Style.RESET_ALL}")
+    
+    for cycle in result.cycles:
+        click.echo(f"{Fore.RED}Link cycle: {' -> '.join(path.name for path in reversed(cycle))}{Style.RESET_ALL}")
+    if result.truncated:
+        click.echo(f"{Fore.YELLOW}Stopped at the maximum depth, more files may depend on the target{Style.RESET_ALL}")
+
+
 # Alias command
 @click.command()
 @click.argument('target_asset', type=click.Path())
@@ -118,9 +188,15 @@ def backlinks_command(target_asset: str, search_directory: str, config: Optional
 @click.option('--max-workers', '-w', default=4, type=int,
               help='Number of parallel threads for scanning (default: 4)')
 @click.option('--output-format', '-f', 
-              type=click.Choice(['json', 'table'], case_sensitive=False),
+              type=click.Choice(['json', 'ndjson', 'table'], case_sensitive=False),
               default='table',
-              help='Output format (default: table)')
+              help='Output format (default: table). Table and ndjson rows are printed as they are found.')
+@click.option('--match-basename', is_flag=True,
+              help='Also match libraries with the same file name in other directories')
+@click.option('--recursive', '-r', is_flag=True,
+              help='Also find files that link to the target through other libraries')
+@click.option('--max-depth', type=click.IntRange(min=1),
+              help='With --recursive, maximum number of links between a file and the target')
 @click.option('--verbose', '-v', is_flag=True,
               help='Enable verbose output')
 @click.pass_context
@@ -5,14 +5,16 @@ This command provides comprehensive dependency analysis using blender-asset-trac
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import click
 
 from blender_asset_tracer.cli.common import humanize_bytes, shorten
 
 from blendwatch.blender.backlinks import BacklinkScanner, DependencyInfo
+from blendwatch.blender.validation import DirectoryListingCache
 from blendwatch.core.config import load_default_config
 from blendwatch.cli.utils import load_config_with_fallback
 from blendwatch.utils.path_utils import resolve_path
@@ -21,10 +23,12 @@ log = logging.getLogger(__name__)
 
 
 @click.command()
-@click.argument('blend_file', type=click.Path(exists=True, path_type=Path))
+@click.argument('blend_files', nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path))
 @click.option('--search-dir', '-d', 
               type=click.Path(exists=True, file_okay=False, path_type=Path),
               help='Directory to search for blend files (defaults to current directory)')
+@click.option('--all', '-a', 'all_files', is_flag=True,
+              help='Analyze every blend file in the search directory')
 @click.option('--show-missing', '-m', is_flag=True,
               help='Only show missing dependencies')
 @click.option('--by-type', '-t', is_flag=True,
@@ -36,9 +40,9 @@ log = logging.getLogger(__name__)
 @click.option('--config-file', '-c',
               type=click.Path(exists=True, path_type=Path),
               help='Path to configuration file')
-def deps(blend_file: Path, search_dir: Optional[Path], show_missing: bool, 
+def deps(blend_files: Tuple[Path, ...], search_dir: Optional[Path], all_files: bool, show_missing: bool, 
          by_type: bool, summary: bool, verbose: bool, config_file: Optional[Path]):
-    """Analyze dependencies of a blend file using blender-asset-tracer.
+    """Analyze dependencies of blend files using blender-asset-tracer.
     
     This command provides comprehensive dependency analysis including:
     - Library files (.blend)
@@ -47,7 +51,10 @@ def deps(blend_file: Path, search_dir: Optional[Path], show_missing: bool,
     - Sound files
     - Other asset types
     
-    BLEND_FILE: Path to the blend file to analyze
+    Traces are memoized in the cache, so libraries shared by many files
+    are only read again after they changed.
+    
+    BLEND_FILES: Paths to the blend files to analyze
     """
     
     try:
@@ -64,30 +71,16 @@ def deps(blend_file: Path, search_dir: Optional[Path], show_missing: bool,
         # Initialize scanner
         scanner = BacklinkScanner(search_dir, config)
         
-        # Show summary only
-        if summary:
-            with click.progressbar(label=f"Analyzing dependencies for {shorten(Path.cwd(), blend_file)}", 
-                                 length=1, show_eta=False, show_percent=False) as bar:
-                dep_summary = scanner.get_dependency_summary(blend_file)
-                bar.update(1)
-            
-            click.echo(f"\nDependency Summary for {blend_file.name}:")
-            click.echo("=" * 50)
-            
-            total_deps = sum(dep_summary.values())
-            if total_deps == 0:
-                click.echo("No dependencies found.")
-                return
-            
-            for dep_type, count in sorted(dep_summary.items()):
-                click.echo(f"  {dep_type:20} {count:4d}")
-            
-            click.echo(f"  {'Total':20} {total_deps:4d}")
-            return
+        blend_files = [resolve_path(str(blend_file)) for blend_file in blend_files]
+        if all_files:
+            blend_files.extend(blend_file for blend_file in scanner.find_blend_files()
+                               if blend_file not in blend_files)
+        if not blend_files:
+            raise click.UsageError("Give one or more blend files, or use --all")
         
         # Progress callback for long operations
         progress_cb = None
-        if verbose:
+        if verbose and not summary:
             from blender_asset_tracer.trace.progress import Callback
             
             class ProgressReporter(Callback):
@@ -96,49 +89,40 @@ def deps(blend_file: Path, search_dir: Optional[Path], show_missing: bool,
             
             progress_cb = ProgressReporter()
         
-        # Get dependencies
-        if show_missing:
-            dependencies = scanner.find_missing_dependencies(blend_file)
-            if not dependencies:
-                click.echo(f"✓ All dependencies found for {blend_file.name}")
-                return
-            
-            click.echo(f"Missing dependencies for {blend_file.name}:")
-            click.echo("=" * 50)
+        # Trace every file once, the views below all reuse the memoized traces
+        if summary:
+            label = (f"Analyzing dependencies for {shorten(Path.cwd(), blend_files[0])}" if len(blend_files) == 1
+                     else f"Analyzing dependencies for {len(blend_files)} files")
+            with click.progressbar(label=label, length=1, show_eta=False, show_percent=False) as bar:
+                results = scanner.find_all_dependencies_batch(blend_files)
+                bar.update(1)
         else:
-            dependencies = scanner.find_all_dependencies(blend_file, progress_cb)
-            click.echo(f"Dependencies for {blend_file.name}:")
-            click.echo("=" * 50)
-        
-        if not dependencies:
-            click.echo("No dependencies found.")
-            return
+            results = scanner.find_all_dependencies_batch(blend_files, progress_cb)
         
-        # Group by type if requested
-        if by_type:
-            by_type_dict = {}
-            for dep in dependencies:
-                dep_type = dep.usage_type
-                if dep.is_sequence:
-                    dep_type += "_sequence"
-                
-                if dep_type not in by_type_dict:
-                    by_type_dict[dep_type] = []
-                by_type_dict[dep_type].append(dep)
+        # One listing per directory for the whole run, however many files and frames are checked
+        listings = DirectoryListingCache()
+        for index, blend_file in enumerate(blend_files):
+            if index:
+                click.echo()
             
-            for dep_type, deps in sorted(by_type_dict.items()):
-                click.echo(f"\n{dep_type.upper()} ({len(deps)} files):")
-                click.echo("-" * 30)
-                
-                for dep in deps:
-                    _display_dependency(dep, verbose)
-        else:
-            # Show all dependencies in order
-            for dep in dependencies:
-                _display_dependency(dep, verbose)
+            dependencies = results.get(blend_file)
+            if dependencies is None:
+                click.echo(f"Error: Could not analyze dependencies of {blend_file}", err=True)
+            elif summary:
+                _display_summary(blend_file, scanner.get_dependency_summary(blend_file))
+            elif show_missing:
+                _display_dependencies(blend_file, scanner.find_missing_dependencies(blend_file, listings),
+                                      listings, True, by_type, verbose)
+            else:
+                _display_dependencies(blend_file, dependencies, listings, False, by_type, verbose)
         
-        click.echo(f"\nTotal: {len(dependencies)} dependencies")
+        if len(blend_files) > 1:
+            click.echo(f"\nAnalyzed {len(results)} of {len(blend_files)} files")
+        if len(results) < len(blend_files):
+            raise click.Abort()
         
+    except (click.Abort, click.UsageError):
+        raise
     except FileNotFoundError as e:
         click.echo(f"Error: {e}", err=True)
         raise click.Abort()
@@ -148,11 +132,71 @@ def deps(blend_file: Path, search_dir: Optional[Path], show_missing: bool,
         raise click.Abort()
 
 
-def _display_dependency(dep: DependencyInfo, verbose: bool):
+def _display_summary(blend_file: Path, dep_summary: Dict[str, int]):
+    """Display the dependency type counts of a blend file."""
+    click.echo(f"\nDependency Summary for {blend_file.name}:")
+    click.echo("=" * 50)
+    
+    total_deps = sum(dep_summary.values())
+    if total_deps == 0:
+        click.echo("No dependencies found.")
+        return
+    
+    for dep_type, count in sorted(dep_summary.items()):
+        click.echo(f"  {dep_type:20} {count:4d}")
+    
+    click.echo(f"  {'Total':20} {total_deps:4d}")
+
+
+def _display_dependencies(blend_file: Path, dependencies: List[DependencyInfo], listings: DirectoryListingCache,
+                          show_missing: bool, by_type: bool, verbose: bool):
+    """Display the (missing) dependencies of a blend file."""
+    if show_missing:
+        if not dependencies:
+            click.echo(f"✓ All dependencies found for {blend_file.name}")
+            return
+        
+        click.echo(f"Missing dependencies for {blend_file.name}:")
+        click.echo("=" * 50)
+    else:
+        click.echo(f"Dependencies for {blend_file.name}:")
+        click.echo("=" * 50)
+    
+    if not dependencies:
+        click.echo("No dependencies found.")
+        return
+    
+    # Group by type if requested
+    if by_type:
+        by_type_dict = {}
+        for dep in dependencies:
+            dep_type = dep.usage_type
+            if dep.is_sequence:
+                dep_type += "_sequence"
+            
+            if dep_type not in by_type_dict:
+                by_type_dict[dep_type] = []
+            by_type_dict[dep_type].append(dep)
+        
+        for dep_type, deps in sorted(by_type_dict.items()):
+            click.echo(f"\n{dep_type.upper()} ({len(deps)} files):")
+            click.echo("-" * 30)
+            
+            for dep in deps:
+                _display_dependency(dep, listings, verbose)
+    else:
+        # Show all dependencies in order
+        for dep in dependencies:
+            _display_dependency(dep, listings, verbose)
+    
+    click.echo(f"\nTotal: {len(dependencies)} dependencies")
+
+
+def _display_dependency(dep: DependencyInfo, listings: DirectoryListingCache, verbose: bool):
     """Display a single dependency with appropriate formatting."""
     
     # Color coding for different states
-    if not dep.asset_path.exists():
+    if not listings.asset_exists(os.path.normpath(str(dep.asset_path)), dep.is_sequence):
         status = click.style("✗ MISSING", fg="red", bold=True)
     else:
         status = click.style("✓", fg="green")
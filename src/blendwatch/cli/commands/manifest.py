@@ -0,0 +1,97 @@
+"""
+Manifest command for BlendWatch CLI
+"""
+
+import sys
+import json
+from pathlib import Path
+from typing import Optional, Tuple
+
+import click
+from colorama import Fore, Style
+
+from blendwatch.blender.backlinks import BacklinkScanner, ManifestEntry
+from blendwatch.cli.utils import load_config_with_fallback, handle_cli_exception
+from blendwatch.utils.path_utils import resolve_path
+
+
+@click.command()
+@click.argument('blend_files', nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option('--search-dir', '-d',
+              type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help='Directory to search for blend files (defaults to current directory)')
+@click.option('--all', '-a', 'all_files', is_flag=True,
+              help='Build manifests of every blend file in the search directory')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, path_type=Path),
+              help='Write the manifest to this file instead of standard output')
+@click.option('--config', '-c', type=click.Path(),
+              help='Path to configuration file (TOML)')
+@click.option('--max-workers', '-w', default=8, type=click.IntRange(min=1),
+              help='Number of parallel threads for listing directories and checking files (default: 8)')
+@click.option('--verbose', '-v', is_flag=True,
+              help='Enable verbose output')
+def manifest_command(blend_files: Tuple[Path, ...], search_dir: Optional[Path], all_files: bool,
+                     output: Optional[Path], config: Optional[str], max_workers: int, verbose: bool):
+    """Write the files needed to render blend files as NDJSON.
+
+    Each line holds a blend file, one file it needs (itself, libraries,
+    textures, sequence frames, ...), its size and mtime. Dependencies come
+    from the memoized traces, so only files that changed are read again.
+
+    Exits with status 1 if any needed file is missing.
+
+    BLEND_FILES: Paths to the blend files, e.g. the shots to render
+    """
+    search_path = (search_dir or Path.cwd()).resolve()
+    config_obj = load_config_with_fallback(config, search_path, verbose)
+
+    missing, failed = 0, []
+    try:
+        scanner = BacklinkScanner(search_path, config=config_obj)
+        blend_files = [resolve_path(str(blend_file)) for blend_file in blend_files]
+        if all_files:
+            blend_files.extend(blend_file for blend_file in scanner.find_blend_files()
+                               if blend_file not in blend_files)
+        if not blend_files:
+            raise click.UsageError("Give one or more blend files, or use --all")
+
+        manifests = scanner.build_manifests(blend_files, max_workers=max_workers)
+
+        out = open(output, 'w', encoding='utf-8') if output else None
+        try:
+            for blend_file in blend_files:
+                for entry in manifests.get(blend_file, []):
+                    click.echo(json.dumps(_manifest_entry_to_json(blend_file, entry)), file=out)
+        finally:
+            if out is not None:
+                out.close()
+
+        missing = sum(entry.size is None for manifest in manifests.values() for entry in manifest)
+        failed = [blend_file for blend_file in blend_files if blend_file not in manifests]
+        for blend_file in failed:
+            click.echo(f"{Fore.RED}Could not trace dependencies of {blend_file}{Style.RESET_ALL}", err=True)
+        if missing:
+            click.echo(f"{Fore.RED}{missing} needed files are missing{Style.RESET_ALL}", err=True)
+        if verbose or output:
+            total = sum(len(manifest) for manifest in manifests.values())
+            click.echo(f"{Fore.GREEN}Listed {total} files for {len(manifests)} blend files{Style.RESET_ALL}",
+                       err=True)
+    except click.UsageError:
+        raise
+    except Exception as e:
+        handle_cli_exception(e, verbose)
+
+    if missing or failed:
+        sys.exit(1)
+
+
+def _manifest_entry_to_json(blend_file: Path, entry: ManifestEntry) -> dict:
+    """Convert a manifest entry to a JSON-serializable dictionary."""
+    return {
+        'blend_file': str(blend_file),
+        'path': entry.path,
+        'type': entry.usage_type,
+        'size': entry.size,
+        'mtime': entry.mtime,
+        'missing': entry.size is None
+    }
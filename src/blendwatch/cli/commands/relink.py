@@ -0,0 +1,109 @@
+"""
+Relink command for BlendWatch CLI
+"""
+
+import sys
+import json
+from pathlib import Path
+from typing import Optional
+
+import click
+from colorama import Fore, Style
+from blender_asset_tracer.cli.common import shorten
+
+from blendwatch.blender.backlinks import BacklinkScanner
+from blendwatch.blender.relink import Relink, apply_relinks, load_file_index, plan_relinks
+from blendwatch.cli.utils import load_config_with_fallback, check_directory_exists, handle_cli_exception
+
+
+@click.command()
+@click.argument('search_directory', type=click.Path(), default='.', required=False)
+@click.option('--config', '-c', type=click.Path(),
+              help='Path to configuration file (TOML)')
+@click.option('--max-workers', '-w', default=4, type=click.IntRange(min=1),
+              help='Number of parallel threads for reading files and checking paths (default: 4)')
+@click.option('--dry-run', is_flag=True, help='Show the relink plan without modifying files')
+@click.option('--relative', is_flag=True, help='Write library paths in relative format (e.g., //path/to/file.blend)')
+@click.option('--output-format', '-f',
+              type=click.Choice(['json', 'table'], case_sensitive=False),
+              default='table',
+              help='Output format of the relink plan (default: table)')
+@click.option('--verbose', '-v', is_flag=True,
+              help='Enable verbose output')
+def relink_command(search_directory: str, config: Optional[str], max_workers: int, dry_run: bool,
+                   relative: bool, output_format: str, verbose: bool):
+    """Find new locations for broken library links and relink them.
+
+    Files with the same name or contents are looked up in the file index
+    snapshot kept by a running watcher, or in a single scan of the directory
+    without one.
+    Links with several equally good candidates are listed but not changed.
+
+    SEARCH_DIRECTORY: Directory to search for blend files (default: current directory)
+    """
+    search_path = Path(search_directory).resolve()
+    if not check_directory_exists(search_path, "search directory"):
+        sys.exit(1)
+
+    config_obj = load_config_with_fallback(config, search_path, verbose)
+
+    try:
+        cwd = Path.cwd()
+        scanner = BacklinkScanner(search_path, config=config_obj)
+        broken = scanner.find_broken_links(max_workers=max_workers)
+
+        file_index, from_snapshot = load_file_index(search_path, config_obj.extensions, config_obj.ignore_dirs,
+                                                    fingerprint_rate=config_obj.fingerprint_io_rate * 1024 * 1024)
+        if verbose:
+            source = "snapshot" if from_snapshot else "scan"
+            click.echo(f"{Fore.CYAN}Indexed {file_index.get_file_count()} files from {source}{Style.RESET_ALL}")
+        plan = plan_relinks(broken, file_index, scanner.cache, rescan_missing=from_snapshot)
+
+        if output_format == 'json':
+            click.echo(json.dumps([_relink_to_json(relink) for relink in plan], indent=2))
+        elif not plan:
+            click.echo(f"{Fore.GREEN}No broken library links found{Style.RESET_ALL}")
+        else:
+            for relink in plan:
+                _display_relink(relink, cwd, verbose)
+
+        updated = apply_relinks(plan, scanner.cache, relative=relative, dry_run=dry_run)
+        scanner.save_cache()
+        if output_format != 'json':
+            if dry_run:
+                click.echo(f"{Fore.CYAN}Would relink {updated} of {len(plan)} library paths{Style.RESET_ALL}")
+            else:
+                click.echo(f"{Fore.GREEN}Relinked {updated} of {len(plan)} library paths{Style.RESET_ALL}")
+    except Exception as e:
+        handle_cli_exception(e, verbose)
+
+
+def _relink_to_json(relink: Relink) -> dict:
+    """Convert a relink to a JSON-serializable dictionary."""
+    return {
+        'blend_file': str(relink.link.blend_file),
+        'name': relink.link.name,
+        'stored_path': relink.link.stored_path,
+        'new_path': relink.new_path,
+        'candidates': relink.candidates,
+        'ambiguous': relink.ambiguous
+    }
+
+
+def _display_relink(relink: Relink, cwd: Path, verbose: bool):
+    """Display a single relink of the plan."""
+    link = relink.link
+    click.echo(f"{Fore.CYAN}{shorten(cwd, link.blend_file)}{Style.RESET_ALL}: {link.name}")
+    if relink.new_path is not None:
+        click.echo(f"     {Fore.GREEN}→ {shorten(cwd, Path(relink.new_path))}{Style.RESET_ALL}")
+        # The runners-up are only interesting when asked for
+        others = relink.candidates[1:] if verbose else []
+    elif relink.candidates:
+        click.echo(f"     {Fore.YELLOW}Ambiguous, not relinked:{Style.RESET_ALL}")
+        others = relink.candidates
+    else:
+        click.echo(f"     {Fore.RED}No candidates found{Style.RESET_ALL}")
+        others = []
+
+    for candidate in others:
+        click.echo(f"       {shorten(cwd, Path(candidate))}")
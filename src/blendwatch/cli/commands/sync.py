@@ -12,6 +12,7 @@ from colorama import Fore, Style
 from blender_asset_tracer.cli.common import shorten
 
 from blendwatch.core.watcher import FileWatcher
+from blendwatch.blender.cache import BlendFileCache
 from blendwatch.blender.link_updater import apply_move_log_incremental
 from blendwatch.cli.utils import load_config_with_fallback, handle_cli_exception
 
@@ -53,6 +54,8 @@ def sync_command(watch_path: str, update_dir: Optional[str], config: Optional[st
     # Load configuration with fallback
     config_obj = load_config_with_fallback(config, watch_dir, verbose)
     
+    watcher = None
+    cache = None
     try:
         # Start the file watcher
         watcher = FileWatcher(
@@ -61,9 +64,16 @@ def sync_command(watch_path: str, update_dir: Optional[str], config: Optional[st
             ignore_dirs=config_obj.ignore_dirs,
             output_file=str(log_file),
             verbose=verbose,
-            recursive=True
+            recursive=True,
+            fingerprint_rate=config_obj.fingerprint_io_rate * 1024 * 1024
         )
         
+        # Keep the library cache up to date from the watcher's events, so
+        # cached blend files don't have to be checked on disk on every update
+        cache = BlendFileCache(max_staleness=config_obj.cache_max_staleness,
+                               fingerprint_rate=config_obj.fingerprint_io_rate * 1024 * 1024)
+        cache.subscribe(watcher, verify_interval=config_obj.cache_verify_interval)
+        
         watcher.start()
         click.echo(f"{Fore.YELLOW}Press Ctrl+C to stop auto-sync...{Style.RESET_ALL}")
         
@@ -87,7 +97,8 @@ def sync_command(watch_path: str, update_dir: Optional[str], config: Optional[st
                         updated, new_position = apply_move_log_incremental(
                             str(log_file), str(update_directory), 
                             start_position=last_processed_position,
-                            dry_run=dry_run, verbose=verbose, relative=relative
+                            dry_run=dry_run, verbose=verbose, relative=relative,
+                            cache=cache
                         )
                         if updated > 0:
                             if dry_run:
@@ -111,6 +122,13 @@ def sync_command(watch_path: str, update_dir: Optional[str], config: Optional[st
         click.echo(f"{Fore.GREEN}Auto-sync stopped.{Style.RESET_ALL}")
     except Exception as e:
         handle_cli_exception(e, verbose)
+    finally:
+        # Also on errors, so no watcher or verify thread is left running and
+        # pending cache writes are saved
+        if watcher is not None and watcher.is_alive():
+            watcher.stop()
+        if cache is not None:
+            cache.close()
 
 
 # Alias command
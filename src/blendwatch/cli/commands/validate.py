@@ -0,0 +1,95 @@
+"""
+Validate command for BlendWatch CLI
+"""
+
+import sys
+import json
+from pathlib import Path
+from typing import Optional
+
+import click
+from colorama import Fore, Style
+from blender_asset_tracer.cli.common import shorten
+
+from blendwatch.blender.backlinks import BacklinkScanner
+from blendwatch.blender.validation import BrokenLink
+from blendwatch.cli.utils import load_config_with_fallback, check_directory_exists, handle_cli_exception
+
+
+@click.command()
+@click.argument('search_directory', type=click.Path(), default='.', required=False)
+@click.option('--config', '-c', type=click.Path(),
+              help='Path to configuration file (TOML)')
+@click.option('--max-workers', '-w', default=4, type=click.IntRange(min=1),
+              help='Number of parallel threads for reading files and checking paths (default: 4)')
+@click.option('--output-format', '-f',
+              type=click.Choice(['json', 'ndjson', 'table'], case_sensitive=False),
+              default='table',
+              help='Output format (default: table)')
+@click.option('--verbose', '-v', is_flag=True,
+              help='Enable verbose output')
+def validate_command(search_directory: str, config: Optional[str], max_workers: int,
+                     output_format: str, verbose: bool):
+    """Find broken library and asset links in all blend files.
+
+    Exits with status 1 if any broken links are found.
+
+    SEARCH_DIRECTORY: Directory to search for blend files (default: current directory)
+    """
+    search_path = Path(search_directory).resolve()
+    if not check_directory_exists(search_path, "search directory"):
+        sys.exit(1)
+
+    config_obj = load_config_with_fallback(config, search_path, verbose)
+
+    try:
+        cwd = Path.cwd()
+        if verbose:
+            click.echo(f"{Fore.GREEN}Validating links...{Style.RESET_ALL}")
+            click.echo(f"{Fore.CYAN}Search directory: {shorten(cwd, search_path)}{Style.RESET_ALL}")
+            click.echo(f"{Fore.CYAN}Max workers: {max_workers}{Style.RESET_ALL}")
+
+        scanner = BacklinkScanner(search_path, config=config_obj)
+        broken = scanner.find_broken_links(max_workers=max_workers)
+        blend_files = sorted(broken)
+
+        if output_format == 'json':
+            click.echo(json.dumps([{
+                'blend_file': str(blend_file),
+                'broken_links': [_broken_link_to_json(link) for link in broken[blend_file]]
+            } for blend_file in blend_files], indent=2))
+        elif output_format == 'ndjson':
+            for blend_file in blend_files:
+                for link in broken[blend_file]:
+                    click.echo(json.dumps(_broken_link_to_json(link)))
+        else:  # table format
+            if not broken:
+                click.echo(f"{Fore.GREEN}No broken links found{Style.RESET_ALL}")
+            for i, blend_file in enumerate(blend_files, 1):
+                click.echo(f"{Fore.YELLOW}{i:2d}.{Style.RESET_ALL} {Fore.CYAN}{blend_file.name}{Style.RESET_ALL}")
+                click.echo(f"     Path: {shorten(cwd, blend_file)}")
+                for link in broken[blend_file]:
+                    click.echo(f"     {Fore.RED}✗{Style.RESET_ALL} [{link.code}] {link.name}: {link.stored_path}")
+                    if verbose:
+                        click.echo(f"         Checked: {link.resolved_path}")
+                click.echo()
+            if broken:
+                total = sum(len(links) for links in broken.values())
+                click.echo(f"{Fore.RED}Found {total} broken links in {len(broken)} files{Style.RESET_ALL}")
+
+    except Exception as e:
+        handle_cli_exception(e, verbose)
+
+    if broken:
+        sys.exit(1)
+
+
+def _broken_link_to_json(link: BrokenLink) -> dict:
+    """Convert a broken link to a JSON-serializable dictionary."""
+    return {
+        'blend_file': str(link.blend_file),
+        'code': link.code,
+        'name': link.name,
+        'stored_path': link.stored_path,
+        'resolved_path': link.resolved_path
+    }
@@ -83,7 +83,8 @@ def watch_command(path: str, extensions: tuple, ignore_dirs: tuple, config: Opti
         ignore_dirs=ignore_patterns,
         output_file=output,
         verbose=verbose,
-        recursive=recursive
+        recursive=recursive,
+        fingerprint_rate=config_obj.fingerprint_io_rate * 1024 * 1024
     )
     
     try:
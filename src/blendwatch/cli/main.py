@@ -15,6 +15,9 @@ from blendwatch.cli.commands.backlinks import backlinks_command, links_alias
 from blendwatch.cli.commands.sync import sync_command, auto_alias
 from blendwatch.cli.commands.status import status_command
 from blendwatch.cli.commands.deps import deps
+from blendwatch.cli.commands.validate import validate_command
+from blendwatch.cli.commands.relink import relink_command
+from blendwatch.cli.commands.manifest import manifest_command
 
 # Initialize colorama for cross-platform colored output
 init()
@@ -42,6 +45,18 @@ def main():
       
       # Analyze dependencies of a blend file
       blendwatch deps my_file.blend
+      
+      # Summarize the dependencies of every blend file in a directory
+      blendwatch deps --all --search-dir shots/ --summary
+      
+      # Find broken links in all blend files
+      blendwatch validate
+      
+      # Relink libraries moved while nothing was watching
+      blendwatch relink --dry-run
+      
+      # List every file a shot needs before submitting it to a render farm
+      blendwatch manifest shots/sh010.blend -o sh010.ndjson
     
     Use 'blendwatch COMMAND --help' for detailed help on any command.
     """
@@ -57,6 +72,9 @@ main.add_command(backlinks_command, name='backlinks')
 main.add_command(sync_command, name='sync')
 main.add_command(status_command, name='status')
 main.add_command(deps, name='deps')
+main.add_command(validate_command, name='validate')
+main.add_command(relink_command, name='relink')
+main.add_command(manifest_command, name='manifest')
 
 # Register aliases
 main.add_command(watch_alias, name='w')
@@ -27,6 +27,12 @@ class Config:
     log_level: str = 'info'
     buffer_size: int = 100
     debounce_delay: float = 0.1
+    cache_max_staleness: float = 60.0
+    cache_verify_interval: float = 300.0
+    case_insensitive_paths: bool = False
+    resolve_symlinks: bool = False
+    match_basename: bool = False
+    fingerprint_io_rate: float = 0.0
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Config':
@@ -37,7 +43,13 @@ class Config:
             output_format=data.get('output_format', 'toml'),
             log_level=data.get('log_level', 'info'),
             buffer_size=data.get('buffer_size', 100),
-            debounce_delay=data.get('debounce_delay', 0.1)
+            debounce_delay=data.get('debounce_delay', 0.1),
+            cache_max_staleness=data.get('cache_max_staleness', 60.0),
+            cache_verify_interval=data.get('cache_verify_interval', 300.0),
+            case_insensitive_paths=data.get('case_insensitive_paths', False),
+            resolve_symlinks=data.get('resolve_symlinks', False),
+            match_basename=data.get('match_basename', False),
+            fingerprint_io_rate=data.get('fingerprint_io_rate', 0.0)
         )
 
 
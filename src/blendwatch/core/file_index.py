@@ -13,7 +13,10 @@ Key functionality:
 - Provides correlation between file deletions and creations to detect moves
 """
 
+import hashlib
+import json
 import os
+import tempfile
 import time
 import threading
 from pathlib import Path
@@ -22,6 +25,7 @@ from dataclasses import dataclass
 from collections import defaultdict
 
 import click
+from ..utils.fingerprint import IOBudget, file_fingerprint, fingerprint_read_size
 from ..utils.logging_utils import setup_logger
 
 logger = setup_logger(__name__)
@@ -33,7 +37,7 @@ class FileInfo:
     path: str
     size: int
     mtime: float
-    checksum: Optional[str] = None  # For future use if needed
+    checksum: Optional[str] = None  # Content fingerprint, computed lazily
     
     def __hash__(self):
         return hash((self.path, self.size, self.mtime))
@@ -46,6 +50,15 @@ class FileInfo:
                 abs(self.mtime - other.mtime) < 1.0)  # Allow 1 second tolerance
 
 
+def default_snapshot_file(watch_path: str) -> Path:
+    """Get the snapshot file of the file index of a directory.
+    
+    Snapshots are kept next to the blend file cache, one per watched directory.
+    """
+    digest = hashlib.sha1(os.path.normcase(os.path.abspath(watch_path)).encode('utf-8')).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / "blendwatch_cache" / f"file_index_{digest}.json"
+
+
 class FileIndex:
     """
     File index that tracks all files with specific extensions in a directory tree.
@@ -55,7 +68,9 @@ class FileIndex:
     FileCreatedEvent for files in the destination, but no proper move events.
     """
     
-    def __init__(self, watch_path: str, extensions: List[str], rescan_interval: int = 300, ignore_patterns: Optional[List[str]] = None):
+    def __init__(self, watch_path: str, extensions: List[str], rescan_interval: int = 300,
+                 ignore_patterns: Optional[List[str]] = None, snapshot_file: Optional[Path] = None,
+                 fingerprint_rate: float = 0.0):
         """
         Initialize the file index.
         
@@ -64,15 +79,25 @@ class FileIndex:
             extensions: List of file extensions to track (e.g., ['.blend', '.py'])
             rescan_interval: How often to rescan the directory tree (seconds)
             ignore_patterns: List of regex patterns for paths to ignore
+            snapshot_file: File the index is saved to after each rescan, so other
+                processes can use it without walking the directory tree
+            fingerprint_rate: Bytes per second the background rescan thread may
+                read to fingerprint files. 0 disables background fingerprinting,
+                fingerprints are then only computed when needed.
         """
         self.watch_path = Path(watch_path)
         self.extensions = set(ext.lower() for ext in extensions)
         self.rescan_interval = rescan_interval
         self.ignore_patterns = ignore_patterns or []
+        self.snapshot_file = Path(snapshot_file) if snapshot_file is not None else None
+        self._fingerprint_budget = IOBudget(fingerprint_rate) if fingerprint_rate > 0 else None
         
         # Current file index: path -> FileInfo
         self.current_files: Dict[str, FileInfo] = {}
         
+        # Name index: case-folded file name -> paths of current files
+        self._by_name: Dict[str, Set[str]] = defaultdict(set)
+        
         # Files that have been deleted recently (for correlation)
         # path -> (FileInfo, deletion_time)
         self.recent_deletions: Dict[str, Tuple[FileInfo, float]] = {}
@@ -116,6 +141,7 @@ class FileIndex:
             self._rescan_thread.join(timeout=5.0)
             self._rescan_thread = None
         
+        self.save_snapshot()
         logger.info("File index system stopped")
     
     def rescan(self, show_progress: bool = False):
@@ -244,8 +270,17 @@ class FileIndex:
                     for path in created_files:
                         logger.debug(f"  Created: {path}")
                 
+                # Fingerprints stay valid as long as the file is unchanged
+                for path, file_info in new_files.items():
+                    old_info = self.current_files.get(path)
+                    if (old_info is not None and old_info.checksum and
+                            old_info.size == file_info.size and old_info.mtime == file_info.mtime):
+                        file_info.checksum = old_info.checksum
+                
                 self.current_files = new_files
+                self._rebuild_name_index()
             
+            self.save_snapshot()
             elapsed = time.time() - start_time
             logger.info(f"Rescan completed: {file_count} files indexed in {elapsed:.2f}s")
             
@@ -254,13 +289,37 @@ class FileIndex:
     
     def _rescan_loop(self):
         """Background thread loop for periodic rescanning"""
-        while not self._stop_event.wait(self.rescan_interval):
+        while True:
+            if self._fingerprint_budget is not None:
+                try:
+                    self._fingerprint_pending()
+                except Exception as e:
+                    logger.error(f"Error fingerprinting files: {e}")
+            
+            if self._stop_event.wait(self.rescan_interval):
+                break
             try:
                 self.rescan()
                 self._cleanup_old_events()
             except Exception as e:
                 logger.error(f"Error in rescan loop: {e}")
     
+    def _fingerprint_pending(self):
+        """Fingerprint files that don't have one yet, within the fingerprint I/O budget"""
+        with self._lock:
+            pending = [info for info in self.current_files.values() if info.checksum is None]
+        
+        count = 0
+        for file_info in pending:
+            if not self._fingerprint_budget.acquire(fingerprint_read_size(file_info.size), self._stop_event):
+                break
+            if self._compute_fingerprint(file_info) is not None:
+                count += 1
+        
+        if count:
+            logger.debug(f"Fingerprinted {count} files")
+            self.save_snapshot()
+    
     def _cleanup_old_events(self):
         """Clean up old events that are outside the correlation window"""
         current_time = time.time()
@@ -283,6 +342,174 @@ class FileIndex:
             for path in old_creations:
                 del self.recent_creations[path]
     
+    def _add_file(self, file_info: FileInfo):
+        """Add a file to the index. Must be called with the lock held."""
+        self.current_files[file_info.path] = file_info
+        self._by_name[os.path.basename(file_info.path).casefold()].add(file_info.path)
+    
+    def _remove_file(self, file_path: str):
+        """Remove a file from the index. Must be called with the lock held."""
+        del self.current_files[file_path]
+        name = os.path.basename(file_path).casefold()
+        paths = self._by_name.get(name)
+        if paths is not None:
+            paths.discard(file_path)
+            if not paths:
+                del self._by_name[name]
+    
+    def _rebuild_name_index(self):
+        """Rebuild the name index from the current files. Must be called with the lock held."""
+        self._by_name = defaultdict(set)
+        for file_path in self.current_files:
+            self._by_name[os.path.basename(file_path).casefold()].add(file_path)
+    
+    def save_snapshot(self) -> bool:
+        """Save the current files to the snapshot file, if there is one.
+        
+        Returns:
+            True if the snapshot was written
+        """
+        if self.snapshot_file is None:
+            return False
+        
+        with self._lock:
+            files = [[info.path, info.size, info.mtime, info.checksum] for info in self.current_files.values()]
+        data = {'watch_path': str(self.watch_path), 'saved': time.time(), 'files': files}
+        
+        try:
+            self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.snapshot_file.with_name(f"{self.snapshot_file.name}.{os.getpid()}.tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_file, self.snapshot_file)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not save file index snapshot {self.snapshot_file}: {e}")
+            return False
+    
+    def load_snapshot(self, max_age: Optional[float] = None) -> bool:
+        """Load the current files from the snapshot file instead of rescanning.
+        
+        Entries may be out of date, callers should check that a file still
+        exists before relying on it.
+        
+        Args:
+            max_age: Ignore snapshots older than this many seconds
+            
+        Returns:
+            True if a snapshot of this directory was loaded
+        """
+        if self.snapshot_file is None or not self.snapshot_file.exists():
+            return False
+        
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if Path(data['watch_path']) != self.watch_path:
+                return False
+            if max_age is not None and time.time() - data['saved'] > max_age:
+                return False
+            files = {entry[0]: FileInfo(*entry) for entry in data['files']}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not load file index snapshot {self.snapshot_file}: {e}")
+            return False
+        
+        with self._lock:
+            self.current_files = files
+            self._rebuild_name_index()
+        logger.info(f"Loaded {len(files)} files from snapshot {self.snapshot_file}")
+        return True
+    
+    def find_by_name(self, name: str) -> List[FileInfo]:
+        """
+        Find tracked files with a file name, ignoring case.
+        
+        Args:
+            name: File name to look up, without directory
+            
+        Returns:
+            List of FileInfo of the matching files
+        """
+        with self._lock:
+            return [self.current_files[path] for path in self._by_name.get(name.casefold(), ())]
+    
+    def _compute_fingerprint(self, file_info: FileInfo) -> Optional[str]:
+        """Fingerprint a file and remember it, if the file is unchanged since it was indexed"""
+        try:
+            if Path(file_info.path).stat().st_mtime != file_info.mtime:
+                return None
+        except OSError:
+            return None
+        
+        fingerprint = file_fingerprint(file_info.path, file_info.size)
+        if fingerprint is not None:
+            file_info.checksum = fingerprint
+        return fingerprint
+    
+    def get_fingerprint(self, file_path: str) -> Optional[str]:
+        """
+        Get the content fingerprint of a tracked file, computing it if needed.
+        
+        Args:
+            file_path: Path of the file
+            
+        Returns:
+            The fingerprint, or None if the file isn't tracked or changed since
+        """
+        with self._lock:
+            file_info = self.current_files.get(file_path)
+        if file_info is None:
+            return None
+        if file_info.checksum is not None:
+            return file_info.checksum
+        return self._compute_fingerprint(file_info)
+    
+    def find_by_fingerprint(self, fingerprint: str, size: int) -> List[FileInfo]:
+        """
+        Find tracked files with a content fingerprint.
+        
+        Only files of the same size are fingerprinted, if they weren't already.
+        With a fingerprint I/O rate, those reads wait for the budget like the
+        background fingerprinting does. Without one, at most
+        ``fingerprint_read_size(size)`` bytes are read per same-size file.
+        
+        Args:
+            fingerprint: Fingerprint to look up
+            size: Size of the fingerprinted file
+            
+        Returns:
+            List of FileInfo of the matching files
+        """
+        with self._lock:
+            same_size = [info for info in self.current_files.values() if info.size == size]
+        
+        matches = []
+        for info in same_size:
+            if info.checksum is None:
+                if self._fingerprint_budget is not None and \
+                        not self._fingerprint_budget.acquire(fingerprint_read_size(size), self._stop_event):
+                    break
+                self._compute_fingerprint(info)
+            if info.checksum == fingerprint:
+                matches.append(info)
+        return matches
+    
+    def get_file_info(self, file_path: str) -> Optional[FileInfo]:
+        """
+        Get what is known about a file, also if it was deleted recently.
+        
+        Args:
+            file_path: Path of the file
+            
+        Returns:
+            FileInfo of the file, or None if it isn't known
+        """
+        with self._lock:
+            file_info = self.current_files.get(file_path)
+            if file_info is None and file_path in self.recent_deletions:
+                file_info = self.recent_deletions[file_path][0]
+            return file_info
+    
     def record_deletion(self, file_path: str):
         """
         Record that a file has been deleted.
@@ -294,7 +521,7 @@ class FileIndex:
             if file_path in self.current_files:
                 file_info = self.current_files[file_path]
                 self.recent_deletions[file_path] = (file_info, time.time())
-                del self.current_files[file_path]
+                self._remove_file(file_path)
                 logger.debug(f"Recorded deletion: {file_path}")
             else:
                 logger.debug(f"Deletion recorded for unknown file: {file_path}")
@@ -323,26 +550,36 @@ class FileIndex:
         
         with self._lock:
             # Add to current files
-            self.current_files[file_path] = new_file_info
+            self._add_file(new_file_info)
             
             # Record the creation
             self.recent_creations[file_path] = (new_file_info, time.time())
             
             # Look for a matching deletion
             move_detected = self._find_matching_deletion(new_file_info)
+            candidates = self._fingerprint_candidates(new_file_info) if not move_detected else []
+        
+        # A file that was renamed and touched in the same window has neither its
+        # name nor its mtime, but its contents are the same. It is read outside
+        # the lock, so other events aren't held up by the I/O.
+        if candidates:
+            fingerprint = self._compute_fingerprint(new_file_info)
+            if fingerprint is not None:
+                with self._lock:
+                    move_detected = self._confirm_fingerprint_match(candidates, fingerprint)
+        
+        if move_detected:
+            old_path, old_file_info = move_detected
+            logger.info(f"Move detected: {old_path} -> {file_path}")
             
-            if move_detected:
-                old_path, old_file_info = move_detected
-                logger.info(f"Move detected: {old_path} -> {file_path}")
-                
-                # Remove from recent deletions since we matched it
-                if old_path in self.recent_deletions:
-                    del self.recent_deletions[old_path]
-                
-                return (old_path, file_path)
-            else:
-                logger.debug(f"Recorded creation (no move detected): {file_path}")
-                return None
+            # Remove from recent deletions since we matched it
+            with self._lock:
+                self.recent_deletions.pop(old_path, None)
+            
+            return (old_path, file_path)
+        else:
+            logger.debug(f"Recorded creation (no move detected): {file_path}")
+            return None
     
     def _find_matching_deletion(self, new_file_info: FileInfo) -> Optional[Tuple[str, FileInfo]]:
         """
@@ -391,12 +628,50 @@ class FileIndex:
                     self.recent_deletions[tracked_path] = (tracked_info, time.time())
                     
                     # Remove from current files since it's no longer at the old location
-                    del self.current_files[tracked_path]
+                    self._remove_file(tracked_path)
                     
                     return (tracked_path, tracked_info)
         
         return None
     
+    def _fingerprint_candidates(self, new_file_info: FileInfo) -> List[Tuple[str, FileInfo]]:
+        """
+        Get the recent deletions a new file could match by content fingerprint.
+        
+        Only deletions fingerprinted before the file disappeared, with the same
+        size as the new file, can match. Must be called with the lock held.
+        
+        Args:
+            new_file_info: FileInfo for the newly created file
+            
+        Returns:
+            List of (deleted_path, deleted_file_info) tuples
+        """
+        return [(path, info) for path, (info, _) in self.recent_deletions.items()
+                if info.checksum is not None and info.size == new_file_info.size]
+    
+    def _confirm_fingerprint_match(self, candidates: List[Tuple[str, FileInfo]],
+                                   fingerprint: str) -> Optional[Tuple[str, FileInfo]]:
+        """
+        Find the candidate deletion with a fingerprint, if it wasn't matched meanwhile.
+        
+        Must be called with the lock held.
+        
+        Args:
+            candidates: Candidates from ``_fingerprint_candidates()``
+            fingerprint: Fingerprint of the new file
+            
+        Returns:
+            Tuple of (deleted_path, deleted_file_info) if match found, None otherwise
+        """
+        for deleted_path, deleted_file_info in candidates:
+            deletion = self.recent_deletions.get(deleted_path)
+            if deletion is not None and deletion[0] is deleted_file_info and \
+                    deleted_file_info.checksum == fingerprint:
+                logger.debug(f"Found fingerprint match: {deleted_path}")
+                return (deleted_path, deleted_file_info)
+        return None
+    
     def get_files_in_directory(self, directory: str) -> List[str]:
         """
         Get all tracked files in a specific directory and its subdirectories.
@@ -7,7 +7,7 @@ import json
 import time
 import threading
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from datetime import datetime
 
 from watchdog.observers import Observer
@@ -17,12 +17,13 @@ from watchdog.events import (
     DirMovedEvent,
     FileCreatedEvent,
     FileDeletedEvent,
+    FileModifiedEvent,
     DirCreatedEvent,
     DirDeletedEvent
 )
 
 from ..utils import path_utils
-from .file_index import FileIndex
+from .file_index import FileIndex, default_snapshot_file
 
 
 class FileWatcher:
@@ -31,7 +32,7 @@ class FileWatcher:
     def __init__(self, watch_path: str, extensions: List[str], ignore_dirs: List[str],
                  recursive: bool = True, output_file: Optional[str] = None, 
                  verbose: bool = False, enable_file_index: bool = True, 
-                 index_rescan_interval: int = 300):
+                 index_rescan_interval: int = 300, fingerprint_rate: float = 0.0):
         """Initialize the file watcher
         
         Args:
@@ -43,6 +44,8 @@ class FileWatcher:
             verbose: Whether to enable verbose output
             enable_file_index: Whether to enable the file index system for better move detection
             index_rescan_interval: How often to rescan the directory tree (seconds)
+            fingerprint_rate: Bytes per second the file index may read to
+                fingerprint files in the background, 0 to disable
         """
         self.watch_path = Path(watch_path)
         self.extensions = extensions
@@ -58,7 +61,9 @@ class FileWatcher:
                 watch_path=str(watch_path),
                 extensions=extensions,
                 rescan_interval=index_rescan_interval,
-                ignore_patterns=ignore_dirs
+                ignore_patterns=ignore_dirs,
+                snapshot_file=default_snapshot_file(str(watch_path)),
+                fingerprint_rate=fingerprint_rate
             )
         
         # Create observer and event handler
@@ -100,6 +105,19 @@ class FileWatcher:
     def get_events(self) -> List[Dict]:
         """Get list of recorded move events"""
         return self.event_handler.move_events.copy()
+    
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """Register a callback for modify, move and delete events
+        
+        Args:
+            listener: Called with the event data of every tracked file event
+        """
+        self.event_handler.listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[Dict], None]):
+        """Unregister a callback added with add_listener"""
+        if listener in self.event_handler.listeners:
+            self.event_handler.listeners.remove(listener)
 
 
 class MoveTrackingHandler(FileSystemEventHandler):
@@ -115,6 +133,7 @@ class MoveTrackingHandler(FileSystemEventHandler):
         self.verbose = verbose
         self.move_events: List[Dict] = []
         self.file_index = file_index
+        self.listeners: List[Callable[[Dict], None]] = []
         
         # Track files processed by file index to avoid duplicates
         self.file_index_processed_files: Dict[str, float] = {}  # file_path -> timestamp
@@ -163,9 +182,19 @@ class MoveTrackingHandler(FileSystemEventHandler):
         
         return True
     
+    def notify_listeners(self, event_data: Dict):
+        """Pass an event to the registered listeners"""
+        for listener in list(self.listeners):
+            try:
+                listener(event_data)
+            except Exception as e:
+                if self.verbose:
+                    print(f"[LISTENER ERROR] {e}")
+    
     def log_event(self, event_data: Dict):
         """Log event to output file and/or console"""
         self.move_events.append(event_data)
+        self.notify_listeners(event_data)
         
         # Console output
         timestamp = event_data['timestamp']
@@ -202,6 +231,15 @@ class MoveTrackingHandler(FileSystemEventHandler):
         
         # Skip if path should be ignored
         if self.should_ignore_path(src_path) or self.should_ignore_path(dest_path):
+            # Blender saves through a temporary file that replaces the tracked one
+            if (not isinstance(event, DirMovedEvent) and not self.should_ignore_path(dest_path)
+                    and self.should_track_file(dest_path)):
+                self.notify_listeners({
+                    'timestamp': datetime.now().isoformat(),
+                    'type': 'file_modified',
+                    'path': dest_path,
+                    'is_directory': False
+                })
             return
         
         # Determine event type
@@ -280,6 +318,13 @@ class MoveTrackingHandler(FileSystemEventHandler):
         if self.verbose:
             print(f"[DELETE EVENT] {path} (directory: {is_directory})")
         
+        self.notify_listeners({
+            'timestamp': datetime.now().isoformat(),
+            'type': 'directory_deleted' if is_directory else 'file_deleted',
+            'path': path,
+            'is_directory': is_directory
+        })
+        
         # Notify file index about deletion if it's a file we track
         if self.file_index and not is_directory and self.should_track_file(path):
             self.file_index.record_deletion(path)
@@ -305,6 +350,26 @@ class MoveTrackingHandler(FileSystemEventHandler):
                     'is_directory': is_directory
                 }
     
+    def on_modified(self, event):
+        """Handle file modify events
+        
+        Modifications are not logged as moves, they are only passed to the
+        listeners (e.g. to invalidate cached file information).
+        """
+        if not isinstance(event, FileModifiedEvent) or not self.listeners:
+            return
+        
+        path = str(event.src_path)
+        if self.should_ignore_path(path) or not self.should_track_file(path):
+            return
+        
+        self.notify_listeners({
+            'timestamp': datetime.now().isoformat(),
+            'type': 'file_modified',
+            'path': path,
+            'is_directory': False
+        })
+    
     def on_created(self, event):
         """Handle file/directory create events"""
         path = str(event.src_path)
@@ -4,10 +4,17 @@ from .path_utils import (
     resolve_path,
     is_path_ignored,
     find_files_by_extension,
+    walk_files_by_extension,
+    directory_tree_changed,
+    find_files_cached,
     get_relative_path,
     ensure_directory_exists,
     bytes_to_string,
+    normalize_path,
+    SymlinkResolver,
+    get_symlink_resolver,
 )
+from .fingerprint import file_fingerprint, IOBudget
 from .logging_utils import setup_logger, get_logger
 
 __all__ = [
@@ -15,9 +22,18 @@ __all__ = [
     'resolve_path',
     'is_path_ignored',
     'find_files_by_extension',
+    'walk_files_by_extension',
+    'directory_tree_changed',
+    'find_files_cached',
     'get_relative_path',
     'ensure_directory_exists',
     'bytes_to_string',
+    'normalize_path',
+    'SymlinkResolver',
+    'get_symlink_resolver',
+    # Fingerprints
+    'file_fingerprint',
+    'IOBudget',
     # Logging utilities
     'setup_logger',
     'get_logger',
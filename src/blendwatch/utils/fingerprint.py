@@ -0,0 +1,122 @@
+"""
+Content fingerprints for BlendWatch
+
+A fingerprint identifies a file's contents without reading the whole file:
+it hashes the file size and a block from the start and the end of the file.
+For blend files the first block covers the file header and the first block
+headers, and the last one the ENDB block and the data written last.
+
+Fingerprints are a strong key for matching a file that was renamed, copied
+or touched, not a proof that two files are identical.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+# Bytes hashed from the start and from the end of a file
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+
+def fingerprint_read_size(size: int) -> int:
+    """Get the number of bytes read to fingerprint a file of a given size."""
+    return min(size, 2 * FINGERPRINT_BLOCK_SIZE)
+
+
+def file_fingerprint(file_path: Union[str, Path], size: Optional[int] = None) -> Optional[str]:
+    """Compute the content fingerprint of a file.
+
+    Args:
+        file_path: Path of the file
+        size: Size of the file, if already known. The fingerprint is not
+            computed if the file no longer has this size.
+
+    Returns:
+        Hex digest of the fingerprint, or None if the file can't be read
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            actual_size = os.fstat(f.fileno()).st_size
+            if size is not None and actual_size != size:
+                return None
+
+            digest = hashlib.blake2b(actual_size.to_bytes(8, 'little'), digest_size=16)
+            digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+            if actual_size > FINGERPRINT_BLOCK_SIZE:
+                f.seek(max(FINGERPRINT_BLOCK_SIZE, actual_size - FINGERPRINT_BLOCK_SIZE))
+                digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+    except OSError:
+        return None
+
+    return digest.hexdigest()
+
+
+class IOBudget:
+    """Limits how many bytes per second are read for fingerprinting.
+
+    A token bucket: up to one second worth of reads can happen at once, after
+    that reads are spread out to the configured rate. Thread-safe.
+    """
+
+    def __init__(self, bytes_per_second: float):
+        """Initialize the budget.
+
+        Args:
+            bytes_per_second: Sustained read rate
+        """
+        self.bytes_per_second = float(bytes_per_second)
+        # Allow at least one whole fingerprint per burst
+        self.capacity = max(self.bytes_per_second, 2.0 * FINGERPRINT_BLOCK_SIZE)
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the budget that accrued since the last call. Must be called with the lock held."""
+        now = time.monotonic()
+        self._available = min(self.capacity, self._available + (now - self._updated) * self.bytes_per_second)
+        self._updated = now
+
+    def try_acquire(self, nbytes: int) -> bool:
+        """Take budget for a read if it is available right now.
+
+        Args:
+            nbytes: Number of bytes that will be read
+
+        Returns:
+            True if the read may happen
+        """
+        with self._lock:
+            self._refill()
+            if self._available < nbytes:
+                return False
+            self._available -= nbytes
+            return True
+
+    def acquire(self, nbytes: int, stop_event: Optional[threading.Event] = None) -> bool:
+        """Wait until there is budget for a read, then take it.
+
+        Args:
+            nbytes: Number of bytes that will be read
+            stop_event: Event that cancels waiting when set
+
+        Returns:
+            True if the read may happen, False if waiting was cancelled
+        """
+        nbytes = min(nbytes, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._available >= nbytes:
+                    self._available -= nbytes
+                    return True
+                wait = (nbytes - self._available) / self.bytes_per_second
+
+            if stop_event is not None:
+                if stop_event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
@@ -4,8 +4,10 @@ Path and file utilities for BlendWatch
 
 import os
 import re
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Set, Any
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Any
 
 
 def bytes_to_string(data: Any) -> str:
@@ -29,6 +31,131 @@ def resolve_path(path: str) -> Path:
     return Path(path).resolve()
 
 
+# Absolute path written on Windows, e.g. C:\assets or C:/assets
+_WINDOWS_ABSOLUTE = re.compile(r'^[A-Za-z]:[\\/]')
+
+
+@lru_cache(maxsize=65536)
+def _normalize_lexically(path: str, base_dir: str) -> str:
+    """Memoized part of ``normalize_path``."""
+    if path.startswith('//'):
+        # Blender relative path, may have been written on Windows
+        relative_part = path[2:]
+        if os.sep == '/':
+            relative_part = relative_part.replace('\\', '/')
+        path = os.path.join(base_dir, relative_part)
+    elif base_dir and not os.path.isabs(path) and not _WINDOWS_ABSOLUTE.match(path):
+        path = os.path.join(base_dir, path)
+    return os.path.normcase(os.path.normpath(path))
+
+
+def normalize_path(path: str, base_dir: str = "", case_insensitive: bool = False,
+                   resolve_symlinks: bool = False) -> str:
+    """Normalize a path with string operations only.
+    
+    Blender relative paths (starting with ``//``) and paths without a root
+    are joined to ``base_dir``, ``.`` and ``..`` components are collapsed.
+    Unlike ``Path.resolve()`` this doesn't ``lstat`` every path component,
+    and results are memoized, so it is cheap enough to call per library in
+    matching loops.
+    
+    Args:
+        path: Path to normalize, e.g. as stored in a blend file
+        base_dir: Directory relative paths are relative to, usually the
+            directory of the blend file the path was read from
+        case_insensitive: If True, case-fold the result
+        resolve_symlinks: If True, resolve symlinks with the shared
+            ``SymlinkResolver``. This is the only step that touches the filesystem.
+        
+    Returns:
+        Normalized path, usable as a comparison key
+    """
+    normalized = _normalize_lexically(path, base_dir)
+    if resolve_symlinks:
+        normalized = _symlink_resolver.resolve(normalized)
+    if case_insensitive:
+        normalized = normalized.casefold()
+    return normalized
+
+
+class SymlinkResolver:
+    """Resolves symlinks as an explicit, cached step.
+    
+    Each path is resolved with ``os.path.realpath`` once. Results are grouped
+    by the mount point the path lives on, so after a remount only the
+    entries of that mount need to be dropped.
+    """
+    
+    def __init__(self):
+        """Initialize an empty resolver."""
+        self._lock = threading.Lock()
+        # Mount point -> {path: resolved path}
+        self._resolved: Dict[str, Dict[str, str]] = {}
+        # Directory -> mount point it lives on
+        self._mount_points: Dict[str, str] = {}
+    
+    def _mount_point(self, directory: str) -> str:
+        """Find the mount point of a directory, caching it for all its parents."""
+        visited = []
+        current = directory
+        while True:
+            mount = self._mount_points.get(current)
+            if mount is not None:
+                break
+            visited.append(current)
+            parent = os.path.dirname(current)
+            if parent == current or os.path.ismount(current):
+                mount = current
+                break
+            current = parent
+        
+        for visited_dir in visited:
+            self._mount_points[visited_dir] = mount
+        return mount
+    
+    def resolve(self, path: str) -> str:
+        """Resolve the symlinks in an absolute path.
+        
+        Args:
+            path: Absolute, normalized path
+            
+        Returns:
+            Path with all symlinks resolved
+        """
+        with self._lock:
+            mount = self._mount_point(os.path.dirname(path))
+            resolved = self._resolved.get(mount, {}).get(path)
+        if resolved is not None:
+            return resolved
+        
+        resolved = os.path.realpath(path)
+        with self._lock:
+            self._resolved.setdefault(mount, {})[path] = resolved
+        return resolved
+    
+    def invalidate(self, mount_point: Optional[str] = None):
+        """Forget resolved paths.
+        
+        Args:
+            mount_point: Only forget paths on this mount. If None, forget everything.
+        """
+        with self._lock:
+            if mount_point is None:
+                self._resolved.clear()
+                self._mount_points.clear()
+            else:
+                self._resolved.pop(os.path.normcase(os.path.normpath(mount_point)), None)
+
+
+# Shared by normalize_path(resolve_symlinks=True)
+_symlink_resolver = SymlinkResolver()
+
+
+def get_symlink_resolver() -> SymlinkResolver:
+    """Get the resolver shared by ``normalize_path(resolve_symlinks=True)``."""
+    return _symlink_resolver
+
+
 def is_path_ignored_string(path_str: str, ignore_patterns: List[str]) -> bool:
     """Check if a path string should be ignored based on regex patterns.
     
@@ -57,22 +184,112 @@ def is_path_ignored(path: Path, ignore_patterns: List[str]) -> bool:
     return False
 
 
-def find_files_by_extension(directory: Path, extensions: List[str], recursive: bool = True) -> List[Path]:
-    """Find all files with specific extensions in a directory."""
+def walk_files_by_extension(directory: Path, extensions: Sequence[str],
+                            ignore_patterns: Optional[Sequence[str]] = None,
+                            recursive: bool = True) -> Tuple[List[Path], Dict[str, int]]:
+    """Find all files with specific extensions in a single ``os.scandir`` walk.
+    
+    Directories whose path matches an ignore pattern are pruned before
+    descending into them, and the entries' cached type information is used
+    instead of a ``stat()`` per path. Symlinked directories are not followed.
+    
+    Args:
+        directory: Directory to search
+        extensions: File extensions to find, e.g. ``['.blend']``
+        ignore_patterns: Regex patterns of directories to skip
+        recursive: Whether to search subdirectories
+        
+    Returns:
+        Tuple of (sorted list of files, mtime in nanoseconds of each directory walked)
+    """
+    suffixes = tuple(os.path.normcase(ext if ext.startswith('.') else '.' + ext) for ext in extensions)
+    patterns = [re.compile(pattern) for pattern in ignore_patterns or ()]
+    
     files = []
+    dir_mtimes: Dict[str, int] = {}
+    stack = [str(directory)]
+    while stack:
+        current = stack.pop()
+        try:
+            # Taken before listing, so changes made during the walk are noticed later
+            dir_mtimes[current] = os.stat(current).st_mtime_ns
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and not any(pattern.search(entry.path) for pattern in patterns):
+                                stack.append(entry.path)
+                        elif os.path.normcase(entry.name).endswith(suffixes) and entry.is_file():
+                            files.append(Path(entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            dir_mtimes.pop(current, None)
+            continue
+    
+    files.sort()
+    return files, dir_mtimes
+
+
+def directory_tree_changed(dir_mtimes: Dict[str, int]) -> bool:
+    """Check if any of the directories of an earlier walk changed since.
+    
+    Adding, removing or renaming an entry updates its directory's mtime, so
+    this is enough to tell whether the result of the walk is still valid.
+    
+    Args:
+        dir_mtimes: Directory mtimes returned by ``walk_files_by_extension()``
+        
+    Returns:
+        True if a directory was modified or can no longer be accessed
+    """
+    for directory, mtime_ns in dir_mtimes.items():
+        try:
+            if os.stat(directory).st_mtime_ns != mtime_ns:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+# (directory, extensions, ignore patterns) -> (files, directory mtimes)
+_walk_cache: Dict[Tuple[str, Tuple[str, ...], Tuple[str, ...]], Tuple[List[Path], Dict[str, int]]] = {}
+_walk_cache_lock = threading.Lock()
+
+
+def find_files_cached(directory: Path, extensions: Sequence[str],
+                      ignore_patterns: Optional[Sequence[str]] = None,
+                      force_refresh: bool = False) -> List[Path]:
+    """Find files like ``walk_files_by_extension()``, reusing the last walk of the same tree.
     
-    if recursive:
-        pattern = "**/*"
-    else:
-        pattern = "*"
+    The previous result is returned as long as none of the walked
+    directories' mtimes changed, which costs one ``stat()`` per directory
+    instead of listing them all again.
     
-    for ext in extensions:
-        if not ext.startswith('.'):
-            ext = '.' + ext
-        # Use glob to find matching paths, then filter to only include actual files
-        matching_paths = directory.glob(f"{pattern}{ext}")
-        files.extend([path for path in matching_paths if path.is_file()])
+    Args:
+        directory: Directory to search recursively
+        extensions: File extensions to find, e.g. ``['.blend']``
+        ignore_patterns: Regex patterns of directories to skip
+        force_refresh: If True, always walk the directory tree again
+        
+    Returns:
+        Sorted list of matching files
+    """
+    key = (str(directory), tuple(extensions), tuple(ignore_patterns or ()))
+    with _walk_cache_lock:
+        cached = _walk_cache.get(key)
+    if not force_refresh and cached is not None and not directory_tree_changed(cached[1]):
+        return list(cached[0])
     
+    files, dir_mtimes = walk_files_by_extension(directory, extensions, ignore_patterns)
+    with _walk_cache_lock:
+        _walk_cache[key] = (files, dir_mtimes)
+    return list(files)
+
+
+def find_files_by_extension(directory: Path, extensions: List[str], recursive: bool = True) -> List[Path]:
+    """Find all files with specific extensions in a directory."""
+    files, _ = walk_files_by_extension(directory, extensions, recursive=recursive)
     return files
 
 
@@ -2,16 +2,20 @@
 Tests for the backlinks module.
 """
 
+import os
 import pytest
 import tempfile
 import shutil
+from collections.abc import Mapping
 from pathlib import Path
 
 from blendwatch.blender.backlinks import (
     BacklinkScanner,
     BacklinkResult,
-    find_backlinks
+    find_backlinks,
+    _find_cycles,
 )
+from blendwatch.blender.cache import BlendFileCache
 from blendwatch.core.config import Config
 
 
@@ -107,6 +111,397 @@ class TestBacklinkScanner:
         linking_files = [result.blend_file for result in backlinks]
         assert linked_cube not in linking_files
     
+    def test_optimized_backlinks_read_each_file_once(self, monkeypatch):
+        """Pre-filtering and matching share one read per file"""
+        from blendwatch.blender import block_level_optimizations
+        
+        reads = []
+        read_library_entries = block_level_optimizations.read_library_entries
+        
+        def counting_read(blend_file, *args, **kwargs):
+            reads.append(Path(blend_file))
+            return read_library_entries(blend_file, *args, **kwargs)
+        
+        monkeypatch.setattr(block_level_optimizations, "read_library_entries", counting_read)
+        
+        scanner = BacklinkScanner(self.blendfiles_dir)
+        backlinks = scanner.find_backlinks_to_file_optimized(
+            self.blendfiles_dir / "basic_file.blend", max_workers=1)
+        
+        assert "linked_cube.blend" in [result.blend_file.name for result in backlinks]
+        assert sorted(reads) == sorted(scanner.find_blend_files())
+    
+    def test_backlinks_match_full_paths(self):
+        """A library with the target's file name in another directory is no backlink"""
+        project_dir = self.temp_dir / "project"
+        project_dir.mkdir()
+        for name in ("basic_file.blend", "linked_cube.blend"):
+            shutil.copy2(self.blendfiles_dir / name, project_dir / name)
+        same_name = self.temp_dir / "elsewhere" / "basic_file.blend"
+        
+        scanner = BacklinkScanner(project_dir)
+        assert scanner.find_backlinks_to_file(same_name) == []
+        assert scanner.find_backlinks_to_file_optimized(same_name, max_workers=1) == []
+        assert [r.blend_file.name for r in scanner.find_backlinks_to_file(project_dir / "basic_file.blend")] == \
+            ["linked_cube.blend"]
+        
+        config = Config(extensions=[".blend"], ignore_dirs=[], match_basename=True)
+        scanner = BacklinkScanner(project_dir, config=config)
+        assert [r.blend_file.name for r in scanner.find_backlinks_to_file(same_name)] == ["linked_cube.blend"]
+        assert [r.blend_file.name for r in scanner.find_backlinks_to_file_optimized(same_name, max_workers=1)] == \
+            ["linked_cube.blend"]
+    
+    def test_optimized_backlinks_same_with_and_without_prefiltering(self):
+        """Both modes report library paths resolved relative to the linking file"""
+        project_dir = self.temp_dir / "project"
+        project_dir.mkdir()
+        for name in ("basic_file.blend", "linked_cube.blend"):
+            shutil.copy2(self.blendfiles_dir / name, project_dir / name)
+        target = project_dir / "basic_file.blend"
+        
+        # Store the library's path relative too, not only its name
+        from blendwatch.blender.block_level_optimizations import read_block_paths
+        from blendwatch.blender.library_writer import LibraryPathWriter
+        linked_cube = project_dir / "linked_cube.blend"
+        library = read_block_paths(linked_cube)[0]
+        assert LibraryPathWriter(linked_cube).update_blocks({library: "//basic_file.blend"}) == 1
+        
+        scanner = BacklinkScanner(project_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        prefiltered = scanner.find_backlinks_to_file_optimized(target, max_workers=1)
+        assert prefiltered == scanner.find_backlinks_to_file_optimized(target, max_workers=1,
+                                                                       use_prefiltering=False)
+        assert prefiltered[0].library_paths == {"//basic_file.blend": str(target)}
+    
+    def test_iter_backlinks_streams_results(self, monkeypatch):
+        """Results are yielded before the remaining files are read"""
+        from blendwatch.blender import cache as cache_module
+        from blendwatch.blender.cache import BlendFileCache
+        
+        project_dir = self.temp_dir / "project"
+        project_dir.mkdir()
+        for name in ("basic_file.blend", "doubly_linked.blend", "linked_cube.blend"):
+            shutil.copy2(self.blendfiles_dir / name, project_dir / name)
+        # Sorted after the file that links to the target
+        shutil.copy2(self.blendfiles_dir / "absolute_path.blend", project_dir / "zz_unrelated.blend")
+        
+        reads = []
+        scan_block_paths = cache_module.scan_block_paths
+        
+        def counting_scan(blend_file, *args, **kwargs):
+            reads.append(Path(blend_file).name)
+            return scan_block_paths(blend_file, *args, **kwargs)
+        
+        monkeypatch.setattr(cache_module, "scan_block_paths", counting_scan)
+        
+        scanner = BacklinkScanner(project_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        backlinks = scanner.iter_backlinks_to_file(project_dir / "basic_file.blend")
+        first = next(backlinks)
+        
+        assert first.blend_file.name == "linked_cube.blend"
+        assert "zz_unrelated.blend" not in reads
+        assert list(backlinks) == []
+        assert "zz_unrelated.blend" in reads
+    
+    def test_find_backlinks_to_directory(self):
+        """Files linking to anything below a directory are found in one query"""
+        scanner = BacklinkScanner(self.blendfiles_dir)
+        
+        backlinks = scanner.find_backlinks_to_directory(self.blendfiles_dir / "subdir")
+        assert backlinks == []
+        
+        backlinks = scanner.find_backlinks_to_directory(self.blendfiles_dir)
+        by_file = {result.blend_file.name: result for result in backlinks}
+        assert "linked_cube.blend" in by_file
+        assert by_file["linked_cube.blend"].matching_libraries == \
+            scanner.find_backlinks_to_file(self.blendfiles_dir / "basic_file.blend")[0].matching_libraries
+
+    def test_find_backlinks_to_assets(self):
+        """Images and other assets are in the reverse index, like libraries"""
+        blend_file = self.temp_dir / "absolute_path.blend"
+        shutil.copy2(self.blendfiles_dir / "absolute_path.blend", blend_file)
+        texture = self.temp_dir / "textures" / "Bricks" / "brick_dotted_04-color.jpg"
+        texture.parent.mkdir(parents=True)
+        texture.touch()
+
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        backlinks = scanner.find_backlinks_to_file(texture)
+        assert [(result.blend_file, result.matching_libraries) for result in backlinks] == \
+            [(blend_file, ["//textures/Bricks/brick_dotted_04-color.jpg"])]
+        scanner.save_cache()
+
+        # Read back from the database, also with a prefix query on the directory
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        assert [result.blend_file for result in scanner.find_backlinks_to_file(texture)] == [blend_file]
+        backlinks = scanner.find_backlinks_to_directory(self.temp_dir / "textures")
+        assert [(result.blend_file, result.matching_libraries) for result in backlinks] == \
+            [(blend_file, ["//textures/Bricks/brick_dotted_04-color.jpg"])]
+        assert scanner.find_backlinks_to_file(self.temp_dir / "textures" / "other.jpg") == []
+
+    def test_find_broken_links(self, monkeypatch):
+        """Missing link targets are found with one listing per directory"""
+        from blendwatch.blender import validation
+
+        listed = []
+        listdir = validation.os.listdir
+
+        def recording_listdir(path):
+            listed.append(path)
+            return listdir(path)
+
+        monkeypatch.setattr(validation.os, "listdir", recording_listdir)
+        scanner = BacklinkScanner(self.blendfiles_dir)
+        broken = scanner.find_broken_links(max_workers=2)
+
+        by_name = {blend_file.name: links for blend_file, links in broken.items()}
+        assert "linked_cube.blend" not in by_name
+        assert "basic_file.blend" not in by_name
+        # The library name is what Blender loads, its stale absolute path is ignored
+        assert [link.name for link in by_name["doubly_linked.blend"]] == ["//material_textures.blend"]
+        assert [link.name for link in by_name["doubly_linked_up-windows.blend"]] == \
+            ["//..\\material_textures.blend"]
+        assert {link.code for link in by_name["absolute_path.blend"]} == {"IM"}
+
+        # Libraries of several files in the same directory share its listing
+        assert len(listed) == len(set(listed))
+
+    def test_find_broken_links_skips_builtin_font_and_packed(self):
+        """Fonts using Blender's default font and packed assets aren't links on disk"""
+        from blendwatch.blender.blend_headers import read_blocks
+        from blendwatch.blender.block_level_optimizations import _read_block_paths_bat, scan_block_paths
+        from blendwatch.blender.library_writer import LibraryPathWriter
+
+        blend_file = self.temp_dir / "title_card.blend"
+        shutil.copy2(self.blendfiles_dir / "absolute_path.blend", blend_file)
+        font, image = scan_block_paths(blend_file)
+        assert LibraryPathWriter(blend_file).update_blocks({font: "<builtin>"}) == 1
+
+        # Turn the first image into a font and pack the second one
+        header, sdna, blocks = read_blocks(blend_file, [b"IM"])
+        packed_offset = sdna.layout(blocks[1].sdna_index).fields["packedfile"][0]
+        with open(blend_file, "r+b") as fileobj:
+            fileobj.seek(blocks[0].offset - 16 - header.pointer_size)
+            fileobj.write(b"VF")
+            fileobj.seek(blocks[1].offset + packed_offset)
+            fileobj.write(b"\x01" * header.pointer_size)
+
+        assert scan_block_paths(blend_file) == []
+        assert _read_block_paths_bat(blend_file, [b"IM", b"VF"]) == []
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        assert scanner.find_broken_links() == {}
+
+    def test_find_broken_links_sequences(self):
+        """Tile sets and image sequences are found from any of their files"""
+        from blendwatch.blender.block_level_optimizations import scan_block_paths
+        from blendwatch.blender.library_writer import LibraryPathWriter
+
+        blend_file = self.temp_dir / "wall.blend"
+        shutil.copy2(self.blendfiles_dir / "absolute_path.blend", blend_file)
+        tiles, frames = scan_block_paths(blend_file)
+        LibraryPathWriter(blend_file).update_blocks({tiles: "//textures/wall.<UDIM>.png",
+                                                     frames: "//render/frame_0001.png"})
+        (self.temp_dir / "textures").mkdir()
+        (self.temp_dir / "render").mkdir()
+        (self.temp_dir / "textures" / "wall.1002.png").touch()
+        (self.temp_dir / "render" / "frame_0002.png").touch()
+
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        assert scanner.find_broken_links() == {}
+
+        (self.temp_dir / "textures" / "wall.1002.png").unlink()
+        broken = scanner.find_broken_links()
+        assert [link.stored_path for link in broken[blend_file]] == ["//textures/wall.<UDIM>.png"]
+
+    def test_dependency_traces_are_memoized(self, monkeypatch):
+        """Dependencies are traced again only after the file or a library changed"""
+        from blendwatch.blender import backlinks
+
+        shutil.copy2(self.blendfiles_dir / "linked_cube.blend", self.temp_dir / "linked_cube.blend")
+        shutil.copy2(self.blendfiles_dir / "basic_file.blend", self.temp_dir / "basic_file.blend")
+        blend_file = self.temp_dir / "linked_cube.blend"
+
+        traced = []
+        deps = backlinks.trace.deps
+
+        def counting_deps(bfilepath, progress_cb=None):
+            traced.append(bfilepath)
+            return deps(bfilepath, progress_cb)
+
+        monkeypatch.setattr(backlinks.trace, "deps", counting_deps)
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        dependencies = scanner.find_all_dependencies(blend_file)
+        assert [dep.usage_type for dep in dependencies] == ["library"]
+
+        # A new scanner on the same cache reuses the trace, also for the summary
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        assert scanner.find_all_dependencies_batch([blend_file]) == {blend_file: dependencies}
+        assert scanner.get_dependency_summary(blend_file) == {"library": 1}
+        assert len(traced) == 1
+
+        library = self.temp_dir / "basic_file.blend"
+        os.utime(library, ns=(library.stat().st_atime_ns, library.stat().st_mtime_ns + 1_000_000_000))
+        assert scanner.find_all_dependencies(blend_file) == dependencies
+        assert len(traced) == 2
+
+    def test_dependency_batches_close_files(self, monkeypatch):
+        """blender-asset-tracer's files are closed after every batch of traced files"""
+        from blender_asset_tracer import blendfile
+        from blendwatch.blender import backlinks
+
+        blend_files = []
+        for name in ("linked_cube.blend", "doubly_linked.blend", "basic_file.blend"):
+            shutil.copy2(self.blendfiles_dir / name, self.temp_dir / name)
+            blend_files.append(self.temp_dir / name)
+
+        open_files = []
+        deps = backlinks.trace.deps
+
+        def recording_deps(bfilepath, progress_cb=None):
+            open_files.append(len(blendfile._cached_bfiles))
+            return deps(bfilepath, progress_cb)
+
+        monkeypatch.setattr(backlinks.trace, "deps", recording_deps)
+        monkeypatch.setattr(backlinks, "TRACE_BATCH_SIZE", 2)
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        assert len(scanner.find_all_dependencies_batch(blend_files)) == 3
+        # The second file of the first batch shares basic_file.blend, the next batch starts empty
+        assert open_files[0] == 0 and open_files[1] > 0 and open_files[2] == 0
+        assert blendfile._cached_bfiles == {}
+
+        blend_files[0].touch()
+        scanner.find_all_dependencies(blend_files[0])
+        assert blendfile._cached_bfiles == {}
+
+    def test_find_missing_dependencies_sequences(self, monkeypatch):
+        """Sequences are found from their directory listing, not by checking each frame"""
+        from blendwatch.blender import validation
+
+        (self.temp_dir / "subdir").mkdir()
+        shutil.copy2(self.blendfiles_dir / "subdir" / "image_sequence_dir_up.blend",
+                     self.temp_dir / "subdir" / "image_sequence_dir_up.blend")
+        blend_file = self.temp_dir / "subdir" / "image_sequence_dir_up.blend"
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+
+        missing = scanner.find_missing_dependencies(blend_file)
+        assert [(dep.asset_path.name, dep.is_sequence) for dep in missing] == [("000210.png", True)]
+
+        # The stored first frame is gone, but other frames are there
+        (self.temp_dir / "imgseq").mkdir()
+        for frame in range(211, 215):
+            (self.temp_dir / "imgseq" / f"{frame:06d}.png").touch()
+
+        listed = []
+        listdir = validation.os.listdir
+        monkeypatch.setattr(validation.os, "listdir", lambda path: listed.append(path) or listdir(path))
+        assert scanner.find_missing_dependencies(blend_file) == []
+        assert listed == [str(self.temp_dir / "imgseq")]
+
+    def test_directory_listing_tile_sets(self):
+        """UDIM and UVTILE tokens match tile numbers in the listing"""
+        from blendwatch.blender.validation import DirectoryListingCache
+
+        for name in ("wall.1001.png", "wall.1002.png", "wall.diffuse.png", "rock.u1_v1.exr"):
+            (self.temp_dir / name).touch()
+
+        listings = DirectoryListingCache()
+        assert listings.sequence_files(str(self.temp_dir / "wall.<UDIM>.png")) == \
+            [str(self.temp_dir / "wall.1001.png"), str(self.temp_dir / "wall.1002.png")]
+        assert listings.asset_exists(str(self.temp_dir / "rock.<UVTILE>.exr"), is_sequence=True)
+        assert not listings.asset_exists(str(self.temp_dir / "rock.<UDIM>.exr"), is_sequence=True)
+        # Without the sequence flag a frame path is just a file
+        assert not listings.asset_exists(str(self.temp_dir / "wall.1003.png"))
+        assert listings.asset_exists(str(self.temp_dir / "wall.1003.png"), is_sequence=True)
+
+    def test_build_manifests(self):
+        """Manifests list the blend file, its libraries and every sequence frame"""
+        (self.temp_dir / "subdir").mkdir()
+        (self.temp_dir / "imgseq").mkdir()
+        for frame in range(210, 213):
+            (self.temp_dir / "imgseq" / f"{frame:06d}.png").write_bytes(b"png")
+        shot = self.temp_dir / "subdir" / "image_sequence_dir_up.blend"
+        shutil.copy2(self.blendfiles_dir / "subdir" / "image_sequence_dir_up.blend", shot)
+        shutil.copy2(self.blendfiles_dir / "linked_cube.blend", self.temp_dir / "linked_cube.blend")
+
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        manifests = scanner.build_manifests([shot, self.temp_dir / "linked_cube.blend"])
+
+        entries = manifests[shot]
+        assert [(Path(entry.path).name, entry.usage_type) for entry in entries] == \
+            [("image_sequence_dir_up.blend", "blendfile")] + \
+            [(f"{frame:06d}.png", "DATA") for frame in range(210, 213)]
+        assert all(entry.size == 3 for entry in entries[1:])
+
+        # The library of linked_cube.blend wasn't copied
+        library = manifests[self.temp_dir / "linked_cube.blend"][1]
+        assert (Path(library.path).name, library.usage_type, library.size) == ("basic_file.blend", "library", None)
+
+    def test_build_manifests_closes_files(self, monkeypatch):
+        """No blend file stays open after manifests of several shots are built"""
+        from blender_asset_tracer import blendfile
+
+        shots = []
+        for name in ("linked_cube.blend", "doubly_linked.blend", "basic_file.blend"):
+            shutil.copy2(self.blendfiles_dir / name, self.temp_dir / name)
+            shots.append(self.temp_dir / name)
+
+        opened = []
+        open_cached = blendfile.open_cached
+
+        def recording_open_cached(path, *args, **kwargs):
+            bfile = open_cached(path, *args, **kwargs)
+            opened.append(bfile)
+            return bfile
+
+        monkeypatch.setattr(blendfile, "open_cached", recording_open_cached)
+        scanner = BacklinkScanner(self.temp_dir, cache=BlendFileCache(cache_dir=self.temp_dir / "cache"))
+        assert len(scanner.build_manifests(shots)) == 3
+
+        assert opened
+        assert all(bfile.fileobj.closed for bfile in opened)
+        assert blendfile._cached_bfiles == {}
+
+    def test_find_transitive_backlinks(self):
+        """Files linking through intermediate libraries are found, nearest first"""
+        scanner = BacklinkScanner(self.blendfiles_dir)
+        basic_file = self.blendfiles_dir / "basic_file.blend"
+        linked_cube = self.blendfiles_dir / "linked_cube.blend"
+        doubly_linked = self.blendfiles_dir / "doubly_linked.blend"
+        
+        result = scanner.find_transitive_backlinks(basic_file)
+        assert result.depths[linked_cube] == 1
+        assert result.depths[doubly_linked] == 2
+        assert doubly_linked in result.edges[linked_cube]
+        assert result.cycles == []
+        assert not result.truncated
+        
+        limited = scanner.find_transitive_backlinks(basic_file, max_depth=1)
+        assert limited.depths == {linked_cube: 1}
+        assert limited.truncated
+        
+        # Nothing links to doubly_linked.blend, so stopping after it loses nothing
+        limited = scanner.find_transitive_backlinks(basic_file, max_depth=2)
+        assert limited.depths == result.depths
+        assert not limited.truncated
+    
+    def test_find_transitive_backlinks_reads_cache_only(self, monkeypatch):
+        """Walking the graph doesn't read files that are already cached"""
+        from blendwatch.blender import cache as cache_module
+        
+        scanner = BacklinkScanner(self.blendfiles_dir)
+        basic_file = self.blendfiles_dir / "basic_file.blend"
+        expected = scanner.find_transitive_backlinks(basic_file)
+        
+        def no_read(*args, **kwargs):
+            raise AssertionError("blend file read")
+        
+        monkeypatch.setattr(cache_module, "scan_block_paths", no_read)
+        known_path_loads = []
+        get_known_paths = scanner.cache.get_known_paths
+        monkeypatch.setattr(scanner.cache, "get_known_paths",
+                            lambda: known_path_loads.append(True) or get_known_paths())
+        assert scanner.find_transitive_backlinks(basic_file) == expected
+        # The cached paths are loaded once, not for every level
+        assert len(known_path_loads) == 1
+    
     def test_ignore_directories(self):
         """Test that directories matching ignore patterns are skipped"""
         # Create a test directory structure
@@ -198,6 +593,15 @@ class TestBacklinkScanner:
         for target_file in test_files:
             assert target_file in results
             assert isinstance(results[target_file], list)
+            assert results[target_file] == scanner.find_backlinks_to_file(target_file)
+
+
+def test_find_cycles():
+    """Link cycles are reported once, diamonds are not cycles"""
+    a, b, c, d = (Path(name) for name in ("a", "b", "c", "d"))
+    
+    assert _find_cycles({a: [b, c], b: [d], c: [d], d: []}) == []
+    assert _find_cycles({a: [b], b: [c], c: [a]}) == [[a, b, c]]
 
 
 class TestConvenienceFunctions:
@@ -287,7 +691,7 @@ class TestRealBlendFileIntegration:
                 
                 # Verify result structure
                 assert isinstance(result.blend_file, Path)
-                assert isinstance(result.library_paths, dict)
+                assert isinstance(result.library_paths, Mapping)
                 assert isinstance(result.matching_libraries, list)
                 assert len(result.matching_libraries) > 0
 
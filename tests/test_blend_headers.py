@@ -0,0 +1,217 @@
+"""
+Tests for the block header walker
+"""
+
+import shutil
+import struct
+from pathlib import Path
+
+import pytest
+import zstandard
+from blender_asset_tracer import blendfile
+
+from blendwatch.blender.blend_headers import (
+    SEEKABLE_FOOTER_MAGIC,
+    SKIPPABLE_FRAME_MAGIC,
+    SeekableZstdReader,
+    _open_uncompressed,
+    mmap_blocks,
+    read_blocks,
+    walk_blocks,
+)
+from blendwatch.blender.block_level_optimizations import (
+    PATH_BLOCK_CODES,
+    BlockPath,
+    FastLibraryReader,
+    StreamingLibraryScanner,
+    _read_block_paths_bat,
+    _read_library_entries_bat,
+    read_block_paths,
+)
+from blendwatch.blender.library_writer import LibraryPathWriter
+
+
+BLENDFILES_DIR = Path(__file__).parent / "blendfiles"
+BLEND_FILES = sorted(BLENDFILES_DIR.rglob("*.blend"))
+
+
+@pytest.mark.parametrize("blend_file", BLEND_FILES, ids=lambda p: p.name)
+def test_library_blocks_match_blender_asset_tracer(blend_file):
+    """The header walker finds the same Library blocks as blender-asset-tracer"""
+    reader = FastLibraryReader(blend_file)
+    assert reader._read_library_entries() == _read_library_entries_bat(blend_file)
+
+
+@pytest.mark.parametrize("blend_file", BLEND_FILES, ids=lambda p: p.name)
+def test_block_paths_match_blender_asset_tracer(blend_file):
+    """Paths of all path-bearing ID blocks are read in one pass, like blender-asset-tracer reads them"""
+    block_paths = read_block_paths(blend_file)
+    
+    libraries = [(path.name, path.path) for path in block_paths if path.code == "LI"]
+    assert libraries == _read_library_entries_bat(blend_file)
+    assert ([path for path in block_paths if path.code != "LI"] ==
+            _read_block_paths_bat(blend_file, PATH_BLOCK_CODES))
+    assert read_block_paths(blend_file, backend="mmap") == block_paths
+
+
+def test_image_paths():
+    """Image blocks report their ID name and stored path"""
+    block_paths = read_block_paths(BLENDFILES_DIR / "absolute_path.blend")
+    assert block_paths[0] == BlockPath("IM", "brick_dotted_04-color.jpg",
+                                       "//textures/Bricks/brick_dotted_04-color.jpg")
+    assert {path.code for path in block_paths} == {"IM"}
+
+
+def test_struct_layout_matches_blender_asset_tracer():
+    """Field offsets computed from the SDNA match blender-asset-tracer's"""
+    blend_file = BLENDFILES_DIR / "doubly_linked.blend"
+    header, sdna, blocks = read_blocks(blend_file, [b"LI"])
+    assert header.version == 279
+    assert header.pointer_size == 8
+    assert len(blocks) == 2
+    
+    layout = sdna.layout(blocks[0].sdna_index)
+    assert layout.name == "Library"
+    
+    with blendfile.open_cached(blend_file) as bf:
+        dna_struct = bf.code_index[b"LI"][0].dna_type
+        for dna_field in dna_struct._fields:
+            name = dna_field.name.name_only.decode()
+            assert layout.fields[name][:2] == (dna_field.offset, dna_field.size)
+
+
+def test_skips_other_blocks():
+    """Only the requested block types are returned"""
+    _, _, blocks = read_blocks(BLENDFILES_DIR / "basic_file.blend", [b"OB"])
+    assert blocks
+    assert {block.code for block in blocks} == {b"OB"}
+
+
+def test_gzip_compressed_file():
+    """Gzip compressed files are decompressed on the fly"""
+    _, _, blocks = read_blocks(BLENDFILES_DIR / "linked_cube_compressed.blend", [b"LI"])
+    assert len(blocks) == 1
+
+
+def test_not_a_blend_file(tmp_path):
+    """Files that aren't blend files raise ValueError"""
+    not_blend = tmp_path / "not.blend"
+    not_blend.write_bytes(b"definitely not a blend file")
+    with pytest.raises(ValueError):
+        read_blocks(not_blend, [b"LI"])
+
+
+def test_sdna_shared_between_files():
+    """Files with the same DNA1 block share one parsed SDNA"""
+    _, first, _ = read_blocks(BLENDFILES_DIR / "linked_cube.blend", [b"LI"])
+    _, second, _ = read_blocks(BLENDFILES_DIR / "doubly_linked.blend", [b"LI"])
+    assert first is second
+
+
+def test_in_place_write_matches_blender_asset_tracer(tmp_path):
+    """Patching Library blocks in place gives the same result as blender-asset-tracer"""
+    in_place = tmp_path / "in_place.blend"
+    via_bat = tmp_path / "via_bat.blend"
+    shutil.copy2(BLENDFILES_DIR / "doubly_linked.blend", in_place)
+    shutil.copy2(BLENDFILES_DIR / "doubly_linked.blend", via_bat)
+    
+    old_path = dict(_read_library_entries_bat(in_place))["//linked_cube.blend"]
+    updates = {BlockPath("LI", "//linked_cube.blend", old_path): "/new/location/linked_cube.blend"}
+    assert LibraryPathWriter(in_place)._write_block_updates_in_place(updates, relative=False) == 1
+    assert LibraryPathWriter(via_bat)._write_block_updates_bat(updates, relative=False) == 1
+    
+    assert (_read_library_entries_bat(in_place) ==
+            _read_library_entries_bat(via_bat))
+
+
+def test_in_place_image_write_matches_blender_asset_tracer(tmp_path):
+    """Patching Image blocks in place gives the same result as blender-asset-tracer"""
+    in_place = tmp_path / "in_place.blend"
+    via_bat = tmp_path / "via_bat.blend"
+    shutil.copy2(BLENDFILES_DIR / "absolute_path.blend", in_place)
+    shutil.copy2(BLENDFILES_DIR / "absolute_path.blend", via_bat)
+    
+    updates = {path: f"//moved/{path.name}" for path in read_block_paths(in_place)}
+    assert LibraryPathWriter(in_place)._write_block_updates_in_place(updates, relative=False) == 2
+    assert LibraryPathWriter(via_bat)._write_block_updates_bat(updates, relative=False) == 2
+    
+    assert read_block_paths(in_place) == read_block_paths(via_bat)
+    assert [path.path for path in read_block_paths(in_place)] == [
+        "//moved/brick_dotted_04-color.jpg",
+        "//moved/buildings_roof_04-color.png",
+    ]
+
+
+def _write_seekable_zstd(source, target, frame_size):
+    """Compress a file in the Zstandard seekable format, as Blender writes it"""
+    data = source.read_bytes()
+    compressor = zstandard.ZstdCompressor()
+    entries = []
+    with open(target, "wb") as f:
+        for start in range(0, len(data), frame_size):
+            chunk = data[start:start + frame_size]
+            frame = compressor.compress(chunk)
+            f.write(frame)
+            entries.append(struct.pack("<II", len(frame), len(chunk)))
+        footer = struct.pack("<IBI", len(entries), 0, SEEKABLE_FOOTER_MAGIC)
+        table = b"".join(entries) + footer
+        f.write(struct.pack("<II", SKIPPABLE_FRAME_MAGIC, len(table)))
+        f.write(table)
+    return len(entries)
+
+
+def test_zstd_compressed_file(tmp_path):
+    """Plain Zstandard compressed files are decompressed on the fly"""
+    source = BLENDFILES_DIR / "doubly_linked.blend"
+    compressed = tmp_path / "compressed.blend"
+    compressed.write_bytes(zstandard.ZstdCompressor().compress(source.read_bytes()))
+    
+    assert (FastLibraryReader(compressed)._read_library_entries() ==
+            FastLibraryReader(source)._read_library_entries())
+
+
+def test_seekable_zstd_skips_frames(tmp_path):
+    """Seekable Zstandard files only decompress the frames that are read"""
+    source = BLENDFILES_DIR / "doubly_linked.blend"
+    compressed = tmp_path / "seekable.blend"
+    frame_count = _write_seekable_zstd(source, compressed, frame_size=4096)
+    
+    with _open_uncompressed(compressed) as fileobj:
+        assert isinstance(fileobj, SeekableZstdReader)
+        _, _, blocks = walk_blocks(fileobj, [b"LI"])
+        assert fileobj.frames_decompressed < frame_count
+    
+    assert len(blocks) == 2
+    assert (FastLibraryReader(compressed)._read_library_entries() ==
+            FastLibraryReader(source)._read_library_entries())
+
+
+@pytest.mark.parametrize("blend_file", BLEND_FILES, ids=lambda p: p.name)
+def test_mmap_backend_matches_stream_backend(blend_file):
+    """The mmap backend reads the same libraries as the stream backend"""
+    assert (FastLibraryReader(blend_file, backend="mmap")._read_library_entries() ==
+            FastLibraryReader(blend_file, backend="stream")._read_library_entries())
+
+
+def test_mmap_blocks_are_views():
+    """Blocks read through mmap are memoryviews, released after the context"""
+    with mmap_blocks(BLENDFILES_DIR / "doubly_linked.blend", [b"LI"]) as (_, sdna, blocks):
+        assert len(blocks) == 2
+        assert isinstance(blocks[0].data, memoryview)
+        assert sdna.layout(blocks[0].sdna_index).name == "Library"
+    
+    with pytest.raises(ValueError):
+        bytes(blocks[0].data)
+
+
+def test_mmap_rejects_compressed_file():
+    """Compressed files can't be memory-mapped"""
+    with pytest.raises(ValueError):
+        with mmap_blocks(BLENDFILES_DIR / "linked_cube_compressed.blend", [b"LI"]):
+            pass
+
+
+def test_streaming_scanner_with_mmap_backend():
+    """StreamingLibraryScanner can read through the mmap backend"""
+    assert (StreamingLibraryScanner(backend="mmap").scan_libraries_batch(BLEND_FILES) ==
+            StreamingLibraryScanner().scan_libraries_batch(BLEND_FILES))
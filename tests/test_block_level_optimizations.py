@@ -15,6 +15,7 @@ from blendwatch.blender.block_level_optimizations import (
     SelectiveBlockReader,
     get_libraries_ultra_fast,
     batch_scan_libraries,
+    iter_scan_libraries,
 )
 from blendwatch.blender.library_writer import get_blend_file_libraries
 
@@ -106,6 +107,30 @@ class TestBlockLevelOptimizations:
             assert isinstance(file_path, Path)
             assert isinstance(libraries, dict)
     
+    def test_blender_asset_tracer_files_are_closed(self, monkeypatch):
+        """Files opened with blender-asset-tracer don't stay in its file cache"""
+        from blender_asset_tracer import blendfile
+        from blendwatch.blender.block_level_optimizations import _read_block_paths_bat, _read_library_entries_bat
+        
+        test_files = sorted(self.blendfiles_dir.glob("*.blend"))
+        open_counts = []
+        open_cached = blendfile.open_cached
+        
+        def counting_open_cached(path, *args, **kwargs):
+            open_counts.append(len(blendfile._cached_bfiles))
+            return open_cached(path, *args, **kwargs)
+        
+        monkeypatch.setattr(blendfile, "open_cached", counting_open_cached)
+        StreamingLibraryScanner(max_open_files=2).scan_libraries_batch(test_files)
+        assert max(open_counts) < 2
+        assert blendfile._cached_bfiles == {}
+        
+        _read_library_entries_bat(test_files[0])
+        _read_block_paths_bat(test_files[0], [b"IM"])
+        SelectiveBlockReader.get_block_types_in_file(test_files[0])
+        SelectiveBlockReader.count_blocks_by_type(test_files[0])
+        assert blendfile._cached_bfiles == {}
+    
     def test_ultra_fast_vs_standard(self):
         """Compare performance of ultra-fast vs standard library reading."""
         test_files = list(self.blendfiles_dir.glob("*.blend"))
@@ -165,6 +190,31 @@ class TestBlockLevelOptimizations:
         # Results should be consistent
         assert len(batch_results) == len(individual_results)
     
+    def test_process_pool_scanning(self):
+        """Scanning in worker processes gives the same results as in-process"""
+        test_files = sorted(self.blendfiles_dir.rglob("*.blend"))
+        if len(test_files) < 2:
+            pytest.skip("Need at least 2 test blend files")
+        
+        serial_results = batch_scan_libraries(test_files, max_workers=1)
+        pool_results = batch_scan_libraries(test_files, max_workers=2, chunk_size=1)
+        
+        assert pool_results == serial_results
+        assert all(isinstance(path, Path) for path in pool_results)
+    
+    def test_iter_scan_streams_results(self):
+        """Results are streamed as (file, libraries) pairs"""
+        test_files = sorted(self.blendfiles_dir.rglob("*.blend"))
+        if not test_files:
+            pytest.skip("No test blend files found")
+        
+        scan = iter_scan_libraries(test_files, max_workers=2, chunk_size=1)
+        blend_file, libraries = next(scan)
+        scan.close()
+        
+        assert blend_file in test_files
+        assert libraries == get_libraries_ultra_fast(blend_file, resolve_paths=False)
+    
     def test_selective_filtering(self):
         """Test that selective filtering improves performance."""
         test_files = list(self.blendfiles_dir.glob("*.blend"))
@@ -0,0 +1,412 @@
+"""
+Tests for the blend file cache.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from blendwatch.blender.block_level_optimizations import get_libraries_ultra_fast, resolve_library_path
+from blendwatch.blender.cache import BlendFileCache
+
+
+class TestReverseIndex:
+    """Test the reverse library index of BlendFileCache"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Set up a project with copies of the test blend files"""
+        self.blendfiles_dir = Path(__file__).parent / "blendfiles"
+        if not self.blendfiles_dir.exists():
+            pytest.skip(f"Test blend files directory not found: {self.blendfiles_dir}")
+        
+        self.project_dir = tmp_path / "project"
+        self.project_dir.mkdir()
+        for name in ("basic_file.blend", "linked_cube.blend", "doubly_linked.blend"):
+            shutil.copy2(self.blendfiles_dir / name, self.project_dir / name)
+        
+        self.cache = BlendFileCache(cache_dir=tmp_path / "cache")
+        self.blend_files = sorted(self.project_dir.glob("*.blend"))
+    
+    def test_index_populated_on_scan(self):
+        """Scanning a file adds its libraries to the reverse index"""
+        linked_cube = self.project_dir / "linked_cube.blend"
+        libraries = self.cache.get_library_paths(linked_cube)
+        assert libraries
+        
+        for lib_path in libraries.values():
+            assert str(linked_cube) in self.cache.get_candidate_files(lib_path)
+        
+        self.cache.save()
+        assert self.cache.get_stats()["indexed_libraries"] > 0
+    
+    def test_get_files_linking_to(self):
+        """Backlink queries are answered from the index"""
+        target = str(self.project_dir / "basic_file.blend")
+        linking = self.cache.get_files_linking_to(target, self.blend_files)
+        
+        assert [f.name for f in linking] == ["linked_cube.blend"]
+    
+    def test_matches_full_paths_only(self):
+        """Libraries only match by file name when asked for"""
+        same_name = str(self.project_dir / "elsewhere" / "basic_file.blend")
+        substring = str(self.project_dir / "file.blend")
+        
+        assert self.cache.get_files_linking_to(same_name, self.blend_files) == []
+        assert self.cache.get_files_linking_to(substring, self.blend_files) == []
+        
+        linking = self.cache.get_files_linking_to(same_name, self.blend_files, match_basename=True)
+        assert [f.name for f in linking] == ["linked_cube.blend"]
+        assert self.cache.get_files_linking_to(substring, self.blend_files, match_basename=True) == []
+    
+    def test_find_links_to_targets(self):
+        """Several targets are matched in one pass, grouped by target"""
+        basic_file = str(self.project_dir / "basic_file.blend")
+        nothing = str(self.project_dir / "nothing.blend")
+        
+        matches = self.cache.find_links_to_targets([basic_file, nothing], self.blend_files)
+        
+        assert set(matches) == {basic_file, nothing}
+        assert [f.name for f in matches[basic_file]] == ["linked_cube.blend"]
+        assert matches[basic_file] == self.cache.get_matching_libraries(basic_file, self.blend_files)
+        assert matches[nothing] == {}
+    
+    def test_find_links_under_directory(self):
+        """A directory prefix query finds links to any file below it"""
+        matches = self.cache.find_links_under_directory(str(self.project_dir), self.blend_files)
+        assert self.project_dir / "linked_cube.blend" in matches
+        
+        # Sibling directories sharing the name as a prefix don't match
+        sibling = str(self.project_dir) + "-old"
+        assert self.cache.find_links_under_directory(sibling, self.blend_files) == {}
+        assert self.cache.find_links_under_directory(str(self.project_dir / "nothing"), self.blend_files) == {}
+    
+    def test_unrelated_target_has_no_candidates(self):
+        """Targets nothing links to return no candidates"""
+        for blend_file in self.blend_files:
+            self.cache.get_library_paths(blend_file)
+        
+        assert self.cache.get_candidate_files(str(self.project_dir / "nothing.blend")) == set()
+        assert self.cache.get_files_linking_to(str(self.project_dir / "nothing.blend"), self.blend_files) == []
+    
+    def test_invalidate_removes_from_index(self):
+        """Invalidated files are removed from the reverse index"""
+        linked_cube = self.project_dir / "linked_cube.blend"
+        target = str(self.project_dir / "basic_file.blend")
+        self.cache.get_library_paths(linked_cube)
+        assert str(linked_cube) in self.cache.get_candidate_files(target)
+        
+        self.cache.invalidate_file(linked_cube)
+        assert str(linked_cube) not in self.cache.get_candidate_files(target)
+    
+    def test_index_survives_reload(self):
+        """The reverse index is rebuilt when the cache is loaded from disk"""
+        for blend_file in self.blend_files:
+            self.cache.get_library_paths(blend_file)
+        self.cache.save()
+        
+        reloaded = BlendFileCache(cache_dir=self.cache.cache_dir)
+        target = str(self.project_dir / "basic_file.blend")
+        assert str(self.project_dir / "linked_cube.blend") in reloaded.get_candidate_files(target)
+
+
+class TestSQLiteBackend:
+    """Test the SQLite storage of BlendFileCache"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Set up a cache directory and a test blend file"""
+        self.blendfiles_dir = Path(__file__).parent / "blendfiles"
+        self.linked_cube = self.blendfiles_dir / "linked_cube.blend"
+        if not self.linked_cube.exists():
+            pytest.skip(f"Test file not found: {self.linked_cube}")
+        self.cache_dir = tmp_path / "cache"
+    
+    def test_database_uses_wal(self):
+        """The cache database is opened in WAL mode"""
+        cache = BlendFileCache(cache_dir=self.cache_dir)
+        mode = cache._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+        assert cache.cache_file.exists()
+    
+    def test_changes_are_pending_until_save(self):
+        """Only changed entries are written, and only on save"""
+        cache = BlendFileCache(cache_dir=self.cache_dir)
+        cache.get_library_paths(self.linked_cube)
+        assert cache.get_stats()["pending_writes"] == 1
+        
+        cache.save()
+        assert cache.get_stats()["pending_writes"] == 0
+        
+        # A cache hit does not create new writes
+        cache.get_library_paths(self.linked_cube)
+        assert cache.get_stats()["pending_writes"] == 0
+    
+    def test_shared_between_instances(self):
+        """Two caches on the same directory see each other's saved entries"""
+        writer = BlendFileCache(cache_dir=self.cache_dir)
+        reader = BlendFileCache(cache_dir=self.cache_dir)
+        
+        libraries = writer.get_library_paths(self.linked_cube)
+        writer.save()
+        
+        assert reader.get_library_paths(self.linked_cube) == libraries
+        assert reader.get_stats()["cache_hits"] == 1
+    
+    def test_invalidate_deletes_row(self):
+        """Invalidated entries are deleted from the database on save"""
+        cache = BlendFileCache(cache_dir=self.cache_dir)
+        cache.get_library_paths(self.linked_cube)
+        cache.save()
+        
+        cache.invalidate_file(self.linked_cube)
+        cache.save()
+        
+        assert BlendFileCache(cache_dir=self.cache_dir).get_stats()["cached_files"] == 0
+    
+    def test_schema_version_recorded(self):
+        """The schema version is stored in the database"""
+        cache = BlendFileCache(cache_dir=self.cache_dir)
+        version = cache._conn.execute("PRAGMA user_version").fetchone()[0]
+        assert version == BlendFileCache.SCHEMA_VERSION
+    
+    def test_fingerprint_known_after_file_is_gone(self, tmp_path):
+        """The last entry of a deleted file, with its fingerprint, can still be looked up"""
+        blend_file = tmp_path / "linked_cube.blend"
+        shutil.copy2(self.linked_cube, blend_file)
+        
+        cache = BlendFileCache(cache_dir=self.cache_dir, fingerprint_rate=1024 * 1024)
+        cache.get_library_paths(blend_file)
+        fingerprint = cache.get_fingerprint(blend_file)
+        assert fingerprint is not None
+        cache.save()
+        
+        blend_file.unlink()
+        cache.invalidate_file(blend_file)
+        cache.save()
+        
+        entry = BlendFileCache(cache_dir=self.cache_dir).get_last_known_entry(blend_file)
+        assert entry.fingerprint == fingerprint
+        assert entry.size == self.linked_cube.stat().st_size
+
+
+class TestFileIdentity:
+    """Test that cache entries survive moves and renames"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Copy a blend file with a relative library link into a temp project"""
+        blendfiles_dir = Path(__file__).parent / "blendfiles"
+        if not (blendfiles_dir / "linked_cube.blend").exists():
+            pytest.skip("Test blend files not found")
+        
+        self.project = tmp_path / "project"
+        self.project.mkdir()
+        for name in ("basic_file.blend", "linked_cube.blend"):
+            shutil.copy2(blendfiles_dir / name, self.project / name)
+        self.linked_cube = self.project / "linked_cube.blend"
+        self.cache = BlendFileCache(cache_dir=tmp_path / "cache")
+    
+    def test_renamed_file_is_not_reparsed(self):
+        """A renamed file is found by identity instead of being parsed again"""
+        libraries = self.cache.get_library_paths(self.linked_cube)
+        self.cache.save()
+        
+        renamed = self.project / "renamed_cube.blend"
+        self.linked_cube.rename(renamed)
+        
+        assert self.cache.get_library_paths(renamed) == libraries
+        stats = self.cache.get_stats()
+        assert stats["cache_misses"] == 1
+        assert stats["moves_tracked"] == 1
+        
+        # The old path is no longer cached
+        self.cache.save()
+        assert self.cache.get_stats()["cached_files"] == 1
+    
+    def test_relative_libraries_resolved_for_new_location(self):
+        """Relative library paths are resolved again after a move"""
+        libraries = self.cache.get_library_paths(self.linked_cube)
+        assert libraries
+        
+        subdir = self.project / "subdir"
+        subdir.mkdir()
+        moved = subdir / "linked_cube.blend"
+        self.linked_cube.rename(moved)
+        
+        moved_libraries = self.cache.get_library_paths(moved)
+        assert self.cache.get_stats()["cache_misses"] == 1
+        
+        raw_libraries = get_libraries_ultra_fast(moved, resolve_paths=False)
+        assert moved_libraries == {
+            name: resolve_library_path(moved, raw_path)
+            for name, raw_path in raw_libraries.items()
+        }
+    
+    def test_move_file_repoints_entry(self):
+        """Watcher move events re-point the path index"""
+        self.cache.get_library_paths(self.linked_cube)
+        self.cache.save()
+        
+        moved = self.project / "moved_cube.blend"
+        self.linked_cube.rename(moved)
+        assert self.cache.move_file(self.linked_cube, moved)
+        self.cache.save()
+        
+        reloaded = BlendFileCache(cache_dir=self.cache.cache_dir)
+        assert reloaded.get_library_paths(moved) is not None
+        assert reloaded.get_stats()["cache_hits"] == 1
+        assert reloaded.get_stats()["cache_misses"] == 0
+    
+    def test_move_directory_repoints_entries(self):
+        """Moving a directory re-points every entry below it"""
+        self.cache.get_library_paths(self.linked_cube)
+        self.cache.get_library_paths(self.project / "basic_file.blend")
+        self.cache.save()
+        
+        moved_project = self.project.parent / "moved_project"
+        self.project.rename(moved_project)
+        assert self.cache.move_directory(self.project, moved_project) == 2
+        
+        self.cache.get_library_paths(moved_project / "linked_cube.blend")
+        assert self.cache.get_stats()["cache_misses"] == 2
+
+
+class TestBlockPaths:
+    """Test caching the paths of images and other path-bearing ID blocks"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Copy a blend file with image paths into a temp project"""
+        blendfiles_dir = Path(__file__).parent / "blendfiles"
+        if not (blendfiles_dir / "absolute_path.blend").exists():
+            pytest.skip("Test blend files not found")
+        
+        self.project = tmp_path / "project"
+        self.project.mkdir()
+        self.blend_file = self.project / "absolute_path.blend"
+        shutil.copy2(blendfiles_dir / "absolute_path.blend", self.blend_file)
+        self.cache = BlendFileCache(cache_dir=tmp_path / "cache")
+    
+    def test_image_paths_resolved(self):
+        """Relative image paths are resolved against the blend file"""
+        block_paths = self.cache.get_block_paths(self.blend_file)
+        
+        assert [path.code for path in block_paths] == ["IM", "IM"]
+        assert block_paths[0].path == str(self.project / "textures" / "Bricks" / "brick_dotted_04-color.jpg")
+        
+        raw_paths = self.cache.get_block_paths(self.blend_file, resolve_paths=False)
+        assert raw_paths[0].path == "//textures/Bricks/brick_dotted_04-color.jpg"
+        assert self.cache.get_stats()["cache_misses"] == 1
+    
+    def test_block_paths_survive_reload(self):
+        """Block paths are stored with the entry and read back without parsing"""
+        block_paths = self.cache.get_block_paths(self.blend_file)
+        self.cache.save()
+        
+        reloaded = BlendFileCache(cache_dir=self.cache.cache_dir)
+        assert reloaded.get_block_paths(self.blend_file) == block_paths
+        assert reloaded.get_stats()["cache_misses"] == 0
+    
+    def test_library_lookup_caches_block_paths(self):
+        """Reading libraries caches the other paths of the file as well"""
+        assert self.cache.get_library_paths(self.blend_file) == {}
+        assert len(self.cache.get_block_paths(self.blend_file)) == 2
+        assert self.cache.get_stats()["cache_misses"] == 1
+
+
+class FakeWatcher:
+    """Minimal stand-in for FileWatcher's listener API"""
+    
+    def __init__(self):
+        self.listeners = []
+    
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+    
+    def emit(self, **event_data):
+        for listener in self.listeners:
+            listener(event_data)
+
+
+class TestWatcherSubscription:
+    """Test proactive invalidation from watcher events"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Copy a blend file into a temp project and subscribe a cache"""
+        blendfiles_dir = Path(__file__).parent / "blendfiles"
+        if not (blendfiles_dir / "linked_cube.blend").exists():
+            pytest.skip("Test blend files not found")
+        
+        self.project = tmp_path / "project"
+        self.project.mkdir()
+        self.blend_file = self.project / "linked_cube.blend"
+        shutil.copy2(blendfiles_dir / "linked_cube.blend", self.blend_file)
+        
+        self.watcher = FakeWatcher()
+        self.cache = BlendFileCache(cache_dir=tmp_path / "cache", max_staleness=60.0)
+        self.cache.subscribe(self.watcher, verify_interval=None)
+        yield
+        self.cache.close()
+    
+    def test_clean_entries_are_trusted(self):
+        """Verified entries are read without checking the file on disk"""
+        self.cache.get_library_paths(self.blend_file)
+        self.cache.get_library_paths(self.blend_file)
+        assert self.cache.get_stats()["stats_skipped"] == 1
+    
+    def test_modify_event_forces_check(self):
+        """A modify event makes the next read check the file again"""
+        self.cache.get_library_paths(self.blend_file)
+        self.watcher.emit(type='file_modified', path=str(self.blend_file))
+        
+        self.cache.get_library_paths(self.blend_file)
+        assert self.cache.get_stats()["stats_skipped"] == 0
+    
+    def test_delete_event_invalidates(self):
+        """A delete event drops the entry"""
+        self.cache.get_library_paths(self.blend_file)
+        self.watcher.emit(type='file_deleted', path=str(self.blend_file))
+        assert self.cache.get_stats()["cached_files"] == 0
+    
+    def test_move_event_repoints_entry(self):
+        """A move event re-points the entry and keeps it trusted"""
+        self.cache.get_library_paths(self.blend_file)
+        moved = self.project / "moved.blend"
+        self.blend_file.rename(moved)
+        self.watcher.emit(type='file_moved', old_path=str(self.blend_file), new_path=str(moved))
+        
+        assert self.cache.get_library_paths(moved) is not None
+        stats = self.cache.get_stats()
+        assert stats["cache_misses"] == 1
+        assert stats["stats_skipped"] == 1
+    
+    def test_staleness_bound(self):
+        """Entries older than max_staleness are checked on disk"""
+        self.cache.max_staleness = 0.0
+        self.cache.get_library_paths(self.blend_file)
+        self.cache.get_library_paths(self.blend_file)
+        assert self.cache.get_stats()["stats_skipped"] == 0
+    
+    def test_verify_sweep_finds_missed_changes(self):
+        """The verify sweep catches changes the watcher did not report"""
+        self.cache.get_library_paths(self.blend_file)
+        with open(self.blend_file, "ab") as f:
+            f.write(b"\0")
+        
+        assert self.cache.verify_entries() == 1
+        self.cache.get_library_paths(self.blend_file)
+        assert self.cache.get_stats()["cache_misses"] == 2
+    
+    def test_unsubscribed_cache_always_checks(self):
+        """Without a watcher every read checks the file on disk"""
+        self.cache.unsubscribe()
+        assert self.watcher.listeners == []
+        self.cache.get_library_paths(self.blend_file)
+        self.cache.get_library_paths(self.blend_file)
+        assert self.cache.get_stats()["stats_skipped"] == 0
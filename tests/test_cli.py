@@ -136,4 +136,134 @@ class TestUpdateLinksCommand:
         assert result.exit_code != 0
         assert "Log File not found" in result.output
 
+
+class TestBacklinksCommand:
+    """Tests for the 'backlinks' CLI command."""
+
+    def test_backlinks_recursive_json(self, runner):
+        """--recursive lists files depending on the target through other libraries."""
+        blendfiles_dir = Path(__file__).parent / "blendfiles"
+        result = runner.invoke(main, [
+            'backlinks', str(blendfiles_dir / "basic_file.blend"), str(blendfiles_dir),
+            '--recursive', '--output-format', 'json'
+        ])
+
+        assert result.exit_code == 0, f"CLI command failed: {result.output}"
+        output = json.loads(result.output)
+        depths = {Path(entry['blend_file']).name: entry['depth'] for entry in output['dependents']}
+        assert depths['linked_cube.blend'] == 1
+        assert depths['doubly_linked.blend'] == 2
+        assert output['cycles'] == []
+
+    def test_backlinks_ndjson(self, runner):
+        """--output-format ndjson prints one JSON object per backlink."""
+        blendfiles_dir = Path(__file__).parent / "blendfiles"
+        result = runner.invoke(main, [
+            'backlinks', str(blendfiles_dir / "basic_file.blend"), str(blendfiles_dir),
+            '--output-format', 'ndjson'
+        ])
+
+        assert result.exit_code == 0, f"CLI command failed: {result.output}"
+        rows = [json.loads(line) for line in result.output.splitlines() if line.startswith('{')]
+        assert [Path(row['blend_file']).name for row in rows] == ['linked_cube.blend']
+        assert rows[0]['matching_libraries']
+
 # Class removed: TestOtherCommands containing only trivial help command tests
+
+
+class TestValidateCommand:
+    """Tests for the 'validate' CLI command."""
+
+    def test_validate_reports_broken_links(self, runner, tmp_path):
+        """Broken links are reported per file and make the command fail."""
+        blendfiles_dir = Path(__file__).parent / "blendfiles"
+        shutil.copy2(blendfiles_dir / "linked_cube.blend", tmp_path / "linked_cube.blend")
+
+        result = runner.invoke(main, ['validate', str(tmp_path), '--output-format', 'ndjson'])
+        assert result.exit_code == 1, f"CLI command should fail: {result.output}"
+        rows = [json.loads(line) for line in result.output.splitlines() if line.startswith('{')]
+        assert [(Path(row['blend_file']).name, row['name']) for row in rows] == \
+            [('linked_cube.blend', '//basic_file.blend')]
+
+        shutil.copy2(blendfiles_dir / "basic_file.blend", tmp_path / "basic_file.blend")
+        result = runner.invoke(main, ['validate', str(tmp_path)])
+        assert result.exit_code == 0, f"CLI command failed: {result.output}"
+
+
+class TestDepsCommand:
+    """Tests for the 'deps' CLI command."""
+
+    def test_deps_batch(self, runner, tmp_path):
+        """Several files are analyzed in one run."""
+        blendfiles_dir = Path(__file__).parent / "blendfiles"
+        for name in ("linked_cube.blend", "basic_file.blend"):
+            shutil.copy2(blendfiles_dir / name, tmp_path / name)
+
+        result = runner.invoke(main, ['deps', '--all', '--search-dir', str(tmp_path), '--summary'])
+        assert result.exit_code == 0, f"CLI command failed: {result.output}"
+        assert "Dependency Summary for linked_cube.blend" in result.output
+        assert "Dependency Summary for basic_file.blend" in result.output
+        assert "Analyzed 2 of 2 files" in result.output
+
+        result = runner.invoke(main, ['deps', str(tmp_path / "linked_cube.blend"), str(tmp_path / "basic_file.blend")])
+        assert result.exit_code == 0, f"CLI command failed: {result.output}"
+        assert "Dependencies for linked_cube.blend" in result.output
+        assert "Dependencies for basic_file.blend" in result.output
+
+        result = runner.invoke(main, ['deps', '--show-missing', str(tmp_path / "linked_cube.blend")])
+        assert result.exit_code == 0, f"CLI command failed: {result.output}"
+        assert "All dependencies found for linked_cube.blend" in result.output
+
+    def test_deps_requires_files(self, runner, tmp_path):
+        """Without files or --all there is nothing to analyze."""
+        result = runner.invoke(main, ['deps', '--search-dir', str(tmp_path)])
+        assert result.exit_code != 0
+
+
+class TestManifestCommand:
+    """Tests for the 'manifest' CLI command."""
+
+    def test_manifest_ndjson(self, runner, tmp_path):
+        """Every needed file is written as one JSON line."""
+        blendfiles_dir = Path(__file__).parent / "blendfiles"
+        shutil.copy2(blendfiles_dir / "linked_cube.blend", tmp_path / "linked_cube.blend")
+        output = tmp_path / "manifest.ndjson"
+
+        result = runner.invoke(main, ['manifest', str(tmp_path / "linked_cube.blend"), '-o', str(output)])
+        assert result.exit_code == 1, f"Missing library should fail: {result.output}"
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [(Path(row['path']).name, row['missing']) for row in rows] == \
+            [('linked_cube.blend', False), ('basic_file.blend', True)]
+
+        shutil.copy2(blendfiles_dir / "basic_file.blend", tmp_path / "basic_file.blend")
+        result = runner.invoke(main, ['manifest', str(tmp_path / "linked_cube.blend")])
+        assert result.exit_code == 0, f"CLI command failed: {result.output}"
+        rows = [json.loads(line) for line in result.output.splitlines() if line.startswith('{')]
+        assert rows[1]['size'] == (tmp_path / "basic_file.blend").stat().st_size
+
+
+class TestSyncCommand:
+    """Tests for the 'sync' CLI command."""
+
+    def test_sync_cleans_up_after_error(self, runner, tmp_path, monkeypatch):
+        """The watcher and the cache are shut down when the loop fails."""
+        import tempfile as tempfile_module
+        from types import SimpleNamespace
+        from blendwatch.blender.cache import BlendFileCache
+        from blendwatch.cli.commands import sync
+
+        def failing_sleep(seconds):
+            raise RuntimeError("disk went away")
+
+        closed = []
+        close = BlendFileCache.close
+        monkeypatch.setattr(BlendFileCache, "close", lambda self: closed.append(self) or close(self))
+        monkeypatch.setattr(tempfile_module, "tempdir", str(tmp_path))
+        monkeypatch.setattr(sync, "time", SimpleNamespace(sleep=failing_sleep))
+
+        result = runner.invoke(main, ['sync', str(tmp_path)])
+        assert result.exit_code == 1, f"CLI command should fail: {result.output}"
+        assert "disk went away" in result.output
+        assert len(closed) == 1
+        assert closed[0]._verify_thread is None
+        assert closed[0]._watcher is None
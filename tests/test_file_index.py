@@ -2,7 +2,9 @@
 Tests for the file index module
 """
 
+import os
 import tempfile
+import threading
 import time
 from pathlib import Path
 from unittest.mock import patch
@@ -357,3 +359,115 @@ class TestFileIndex:
         assert summary['tracked_files'] == 2
         assert summary['recent_deletions'] == 1
         assert summary['recent_creations'] == 1
+    
+    def test_find_by_name(self, tmp_path):
+        """The name index ignores case and follows deletions and creations"""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        (tmp_path / "a" / "Rig.blend").write_text("content")
+        (tmp_path / "b" / "rig.blend").write_text("content")
+        
+        index = FileIndex(watch_path=str(tmp_path), extensions=['.blend'], rescan_interval=0)
+        index.rescan()
+        assert {info.path for info in index.find_by_name("RIG.blend")} == \
+            {str(tmp_path / "a" / "Rig.blend"), str(tmp_path / "b" / "rig.blend")}
+        
+        index.record_deletion(str(tmp_path / "a" / "Rig.blend"))
+        assert [info.path for info in index.find_by_name("rig.blend")] == [str(tmp_path / "b" / "rig.blend")]
+        assert index.get_file_info(str(tmp_path / "a" / "Rig.blend")).size == len("content")
+        
+        (tmp_path / "c.blend").write_text("new")
+        index.record_creation(str(tmp_path / "c.blend"))
+        assert [info.path for info in index.find_by_name("c.blend")] == [str(tmp_path / "c.blend")]
+    
+    def test_snapshot_round_trip(self, tmp_path):
+        """A rescan saves a snapshot that another index loads without walking"""
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "rig.blend").write_text("content")
+        snapshot = tmp_path / "snapshot.json"
+        
+        index = FileIndex(watch_path=str(project), extensions=['.blend'], rescan_interval=0,
+                          snapshot_file=snapshot)
+        index.rescan()
+        assert snapshot.exists()
+        
+        loaded = FileIndex(watch_path=str(project), extensions=['.blend'], rescan_interval=0,
+                           snapshot_file=snapshot)
+        with patch('os.walk', side_effect=AssertionError("directory walked")):
+            assert loaded.load_snapshot()
+        assert [info.path for info in loaded.find_by_name("rig.blend")] == [str(project / "rig.blend")]
+        
+        # Snapshots of other directories are ignored
+        other = FileIndex(watch_path=str(tmp_path), extensions=['.blend'], rescan_interval=0,
+                          snapshot_file=snapshot)
+        assert not other.load_snapshot()
+    
+    def test_fingerprint_detects_rename_and_touch(self, tmp_path):
+        """A renamed file with a new mtime is matched by its content fingerprint"""
+        old_file = tmp_path / "rig.blend"
+        old_file.write_bytes(b"BLENDER" * 1000)
+        
+        index = FileIndex(watch_path=str(tmp_path), extensions=['.blend'], rescan_interval=0)
+        index.rescan()
+        assert index.get_fingerprint(str(old_file)) is not None
+        
+        new_file = tmp_path / "rig_v2.blend"
+        old_file.rename(new_file)
+        stat = new_file.stat()
+        os.utime(new_file, (stat.st_atime + 60, stat.st_mtime + 60))
+        
+        index.record_deletion(str(old_file))
+        
+        # The new file is read without holding up other index users
+        from blendwatch.core import file_index
+        lock_free = []
+        
+        def try_lock():
+            acquired = index._lock.acquire(blocking=False)
+            if acquired:
+                index._lock.release()
+            lock_free.append(acquired)
+        
+        def checking_fingerprint(*args, **kwargs):
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            return fingerprint(*args, **kwargs)
+        
+        fingerprint = file_index.file_fingerprint
+        with patch.object(file_index, "file_fingerprint", checking_fingerprint):
+            assert index.record_creation(str(new_file)) == (str(old_file), str(new_file))
+        assert lock_free == [True]
+    
+    def test_find_by_fingerprint_uses_budget(self, tmp_path):
+        """Looking up a fingerprint reads same-size files within the fingerprint I/O budget"""
+        for name in ("a.blend", "b.blend", "c.blend"):
+            (tmp_path / name).write_bytes(b"x" * 100)
+        
+        index = FileIndex(watch_path=str(tmp_path), extensions=['.blend'], rescan_interval=0,
+                          fingerprint_rate=1024 * 1024)
+        index.rescan()
+        with patch.object(index._fingerprint_budget, "acquire", wraps=index._fingerprint_budget.acquire) as acquire:
+            fingerprint = index.get_fingerprint(str(tmp_path / "a.blend"))
+            assert len(index.find_by_fingerprint(fingerprint, 100)) == 3
+        # a.blend was fingerprinted already
+        assert acquire.call_count == 2
+    
+    def test_fingerprints_kept_across_rescans(self, tmp_path):
+        """Fingerprints of unchanged files survive a rescan and a snapshot"""
+        test_file = tmp_path / "rig.blend"
+        test_file.write_bytes(b"content")
+        snapshot = tmp_path / "snapshot.json"
+        
+        index = FileIndex(watch_path=str(tmp_path), extensions=['.blend'], rescan_interval=0,
+                          snapshot_file=snapshot)
+        index.rescan()
+        fingerprint = index.get_fingerprint(str(test_file))
+        index.rescan()
+        assert index.get_file_info(str(test_file)).checksum == fingerprint
+        
+        loaded = FileIndex(watch_path=str(tmp_path), extensions=['.blend'], rescan_interval=0,
+                           snapshot_file=snapshot)
+        assert loaded.load_snapshot()
+        assert [info.path for info in loaded.find_by_fingerprint(fingerprint, len(b"content"))] == [str(test_file)]
@@ -133,6 +133,49 @@ class TestLibraryWriter:
         # The new path should be in Blender's relative format
         assert new_raw_path == "//new_lib.blend"
 
+    def test_update_library_paths_reuses_scan(self, monkeypatch):
+        """
+        A scan from an earlier stage is used instead of reading the file again.
+        """
+        test_file = self.temp_dir / "test_scan.blend"
+        shutil.copy2(self.linked_cube_path, test_file)
+
+        writer = LibraryPathWriter(test_file)
+        scan = writer.scan()
+        assert scan.has_libraries
+        old_path = list(scan.raw_library_paths.keys())[0]
+
+        def no_reads(*args, **kwargs):
+            raise AssertionError("file was read again")
+
+        monkeypatch.setattr("blendwatch.blender.library_writer.scan_libraries", no_reads)
+        assert writer.update_library_paths({old_path: "/tmp/scanned.blend"}, scan=scan) == 1
+        monkeypatch.undo()
+
+        assert list(writer.get_library_paths().values())[0] == "/tmp/scanned.blend"
+
+    def test_update_block_paths_batch(self):
+        """
+        Image paths from a multi-entry mapping are rewritten in one call.
+        """
+        test_file = self.temp_dir / "test_images.blend"
+        shutil.copy2(self.blendfiles_dir / "absolute_path.blend", test_file)
+
+        writer = LibraryPathWriter(test_file)
+        images = writer.get_block_paths()
+        assert [image.code for image in images] == ["IM", "IM"]
+
+        path_mapping = {
+            str(self.temp_dir / "textures" / "Bricks" / "brick_dotted_04-color.jpg"): "/new/bricks.jpg",
+            images[1].path: "/new/roof.png",
+            "/not/referenced.png": "/new/unused.png",
+        }
+        assert writer.update_block_paths(path_mapping) == 2
+        assert [image.path for image in writer.get_block_paths()] == ["/new/bricks.jpg", "/new/roof.png"]
+
+        # Only blocks of the requested types are updated
+        assert writer.update_block_paths({"/new/roof.png": "/x.png"}, codes=[b"LI"]) == 0
+
     def test_update_idempotency_and_no_ops(self):
         """
         Tests that no updates are performed when paths don't match or are the same.
@@ -103,3 +103,66 @@ def test_apply_move_log_with_relative_false(mock_scanner_cls, mock_writer_cls, t
     count = apply_move_log(log_file, tmp_path, relative=False)
     assert count == 1
     mock_writer.update_library_path.assert_called_with('old', 'new', relative=False)
+
+
+def test_apply_move_log_rewrites_image_paths(tmp_path):
+    """Texture moves are applied to Image blocks, all of a file's moves in one write"""
+    blendfiles_dir = Path(__file__).parent / "blendfiles"
+    if not (blendfiles_dir / "absolute_path.blend").exists():
+        pytest.skip("Test blend files not found")
+    
+    from blendwatch.blender.block_level_optimizations import read_block_paths
+    
+    project = tmp_path / "project"
+    project.mkdir()
+    blend_file = project / "absolute_path.blend"
+    blend_file.write_bytes((blendfiles_dir / "absolute_path.blend").read_bytes())
+    
+    images = read_block_paths(blend_file)
+    moves = [
+        (str(project / "textures" / "Bricks" / "brick_dotted_04-color.jpg"), str(project / "bricks.jpg")),
+        (images[1].path, str(project / "roof.png")),
+        (str(project / "unrelated.png"), str(project / "elsewhere.png")),
+    ]
+    log_file = tmp_path / "log.jsonl"
+    log_file.write_text("".join(
+        json.dumps({"type": "file_moved", "old_path": old, "new_path": new}) + "\n" for old, new in moves
+    ))
+    
+    assert apply_move_log(log_file, project, dry_run=True) == 2
+    assert read_block_paths(blend_file) == images
+    
+    assert apply_move_log(log_file, project) == 2
+    assert [image.path for image in read_block_paths(blend_file)] == [
+        str(project / "bricks.jpg"),
+        str(project / "roof.png"),
+    ]
+
+
+def test_apply_move_log_leaves_same_named_assets_alone(tmp_path):
+    """Only the moved texture is rewritten, not other textures with the same file name"""
+    blendfiles_dir = Path(__file__).parent / "blendfiles"
+    if not (blendfiles_dir / "absolute_path.blend").exists():
+        pytest.skip("Test blend files not found")
+    
+    from blendwatch.blender.block_level_optimizations import read_block_paths
+    from blendwatch.blender.library_writer import LibraryPathWriter
+    
+    project = tmp_path / "project"
+    project.mkdir()
+    blend_file = project / "absolute_path.blend"
+    blend_file.write_bytes((blendfiles_dir / "absolute_path.blend").read_bytes())
+    
+    bob, alice = (str(project / name / "albedo.png") for name in ("bob", "alice"))
+    images = read_block_paths(blend_file)
+    assert LibraryPathWriter(blend_file).update_blocks({images[0]: bob, images[1]: alice}) == 2
+    
+    log_file = tmp_path / "log.jsonl"
+    log_file.write_text(json.dumps({"type": "file_moved", "old_path": bob,
+                                    "new_path": str(project / "bob2" / "albedo.png")}) + "\n")
+    
+    assert apply_move_log(log_file, project) == 1
+    assert [image.path for image in read_block_paths(blend_file)] == [
+        str(project / "bob2" / "albedo.png"),
+        alice,
+    ]
@@ -0,0 +1,139 @@
+"""
+Tests for the path utilities
+"""
+
+import os
+
+import pytest
+
+from blendwatch.utils import path_utils
+from blendwatch.utils.path_utils import (
+    SymlinkResolver,
+    find_files_cached,
+    normalize_path,
+    walk_files_by_extension,
+)
+
+
+class TestNormalizePath:
+    """Test the lexical path normalizer"""
+
+    def test_blender_relative_path(self):
+        """// paths are relative to the base directory"""
+        assert normalize_path("//textures/wood.png", "/project/scenes") == \
+            os.path.normpath("/project/scenes/textures/wood.png")
+
+    def test_parent_components_collapsed(self):
+        """.. and . components are collapsed"""
+        assert normalize_path("//../lib/./rig.blend", "/project/scenes") == \
+            os.path.normpath("/project/lib/rig.blend")
+        assert normalize_path("/project/a/../b/rig.blend") == os.path.normpath("/project/b/rig.blend")
+
+    @pytest.mark.skipif(os.sep != "/", reason="backslashes are separators on Windows anyway")
+    def test_windows_separators_in_relative_path(self):
+        """Relative paths written on Windows use backslashes"""
+        assert normalize_path("//..\\lib\\rig.blend", "/project/scenes") == "/project/lib/rig.blend"
+
+    def test_windows_absolute_path_not_joined(self):
+        """Drive letter paths are absolute, even when read on another platform"""
+        assert not normalize_path("C:\\assets\\rig.blend", "/project/scenes").startswith(
+            os.path.normpath("/project"))
+
+    def test_case_folding(self):
+        """Case is only folded when asked for"""
+        assert normalize_path("/Project/Rig.blend", case_insensitive=True) == \
+            os.path.normcase(os.path.normpath("/project/rig.blend"))
+        assert normalize_path("/Project/Rig.blend") == os.path.normcase(os.path.normpath("/Project/Rig.blend"))
+
+    def test_does_not_touch_filesystem(self, monkeypatch):
+        """Normalizing is pure string work"""
+        def no_stat(*args, **kwargs):
+            raise AssertionError("filesystem accessed")
+
+        monkeypatch.setattr(os, "lstat", no_stat)
+        monkeypatch.setattr(os, "stat", no_stat)
+        assert normalize_path("//../never/stat/me.blend", "/nowhere/at/all") == \
+            os.path.normpath("/nowhere/at/never/stat/me.blend")
+
+
+class TestSymlinkResolver:
+    """Test the cached symlink resolution step"""
+
+    def test_resolves_and_caches(self, tmp_path):
+        """Symlinks are resolved once, until the mount is invalidated"""
+        target = tmp_path / "real"
+        target.mkdir()
+        link = tmp_path / "link"
+        try:
+            link.symlink_to(target, target_is_directory=True)
+        except OSError:
+            pytest.skip("Symlinks not supported")
+
+        resolver = SymlinkResolver()
+        path = str(link / "rig.blend")
+        assert resolver.resolve(path) == os.path.realpath(path)
+
+        # Re-pointing the link isn't noticed until the cache is dropped
+        other = tmp_path / "other"
+        other.mkdir()
+        link.unlink()
+        link.symlink_to(other, target_is_directory=True)
+        assert resolver.resolve(path) == os.path.join(os.path.realpath(target), "rig.blend")
+
+        resolver.invalidate()
+        assert resolver.resolve(path) == os.path.join(os.path.realpath(other), "rig.blend")
+
+
+class TestFileDiscovery:
+    """Test the scandir based file discovery"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Set up a small project tree"""
+        self.root = tmp_path / "project"
+        (self.root / "shots" / "010").mkdir(parents=True)
+        (self.root / ".git" / "objects").mkdir(parents=True)
+        (self.root / "shots" / "010" / "anim.blend").write_bytes(b"")
+        (self.root / "rig.blend").write_bytes(b"")
+        (self.root / "notes.txt").write_text("")
+        (self.root / ".git" / "objects" / "stray.blend").write_bytes(b"")
+
+    def test_ignored_directories_are_pruned(self, monkeypatch):
+        """Ignored directories are never listed"""
+        listed = []
+        scandir = os.scandir
+
+        def recording_scandir(path):
+            listed.append(path)
+            return scandir(path)
+
+        monkeypatch.setattr(path_utils.os, "scandir", recording_scandir)
+        files, dir_mtimes = walk_files_by_extension(self.root, [".blend"], [r"\.git"])
+
+        assert files == [self.root / "rig.blend", self.root / "shots" / "010" / "anim.blend"]
+        assert not any(".git" in path for path in listed)
+        assert set(dir_mtimes) == set(listed)
+
+    def test_cached_until_a_directory_changes(self, monkeypatch):
+        """The previous walk is reused until a directory's mtime changes"""
+        assert len(find_files_cached(self.root, [".blend"], [r"\.git"])) == 2
+
+        walks = []
+        walk = path_utils.walk_files_by_extension
+
+        def counting_walk(*args, **kwargs):
+            walks.append(args)
+            return walk(*args, **kwargs)
+
+        monkeypatch.setattr(path_utils, "walk_files_by_extension", counting_walk)
+        assert len(find_files_cached(self.root, [".blend"], [r"\.git"])) == 2
+        assert walks == []
+
+        new_file = self.root / "shots" / "010" / "light.blend"
+        new_file.write_bytes(b"")
+        # Make sure the directory mtime differs on coarse-grained filesystems
+        stat = os.stat(new_file.parent)
+        os.utime(new_file.parent, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert new_file in find_files_cached(self.root, [".blend"], [r"\.git"])
+        assert len(walks) == 1
@@ -0,0 +1,116 @@
+"""
+Tests for relinking broken libraries
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from blendwatch.blender.backlinks import BacklinkScanner
+from blendwatch.blender.cache import BlendFileCache
+from blendwatch.blender.relink import apply_relinks, plan_relinks
+from blendwatch.core.file_index import FileIndex
+
+
+BLENDFILES_DIR = Path(__file__).parent / "blendfiles"
+
+
+class TestRelink:
+    """Test planning and applying relinks from the file index"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Set up a project where basic_file.blend was moved away from linked_cube.blend"""
+        if not BLENDFILES_DIR.exists():
+            pytest.skip(f"Test blend files directory not found: {BLENDFILES_DIR}")
+        
+        self.project = tmp_path / "project"
+        (self.project / "assets").mkdir(parents=True)
+        shutil.copy2(BLENDFILES_DIR / "linked_cube.blend", self.project / "linked_cube.blend")
+        shutil.copy2(BLENDFILES_DIR / "basic_file.blend", self.project / "basic_file.blend")
+        
+        self.snapshot = tmp_path / "file_index.json"
+        self.index = FileIndex(str(self.project), ['.blend'], rescan_interval=0, snapshot_file=self.snapshot)
+        self.index.rescan()
+        
+        # Moved without anything watching
+        shutil.move(self.project / "basic_file.blend", self.project / "assets" / "basic_file.blend")
+        self.scanner = BacklinkScanner(self.project, cache=BlendFileCache(cache_dir=tmp_path / "cache"))
+    
+    def test_relinks_to_moved_file(self):
+        """The moved library is found in the index and relinked"""
+        plan = plan_relinks(self.scanner.find_broken_links(), self.index, rescan_missing=True)
+        assert len(plan) == 1
+        assert plan[0].new_path == str(self.project / "assets" / "basic_file.blend")
+        
+        assert apply_relinks(plan, self.scanner.cache) == 1
+        assert self.scanner.find_broken_links() == {}
+    
+    def test_ambiguous_candidates_not_applied(self):
+        """Equally good candidates are reported, but nothing is relinked"""
+        (self.project / "other").mkdir()
+        shutil.copy2(self.project / "assets" / "basic_file.blend", self.project / "other" / "basic_file.blend")
+        self.index.rescan()
+        
+        plan = plan_relinks(self.scanner.find_broken_links(), self.index)
+        assert plan[0].ambiguous
+        assert plan[0].new_path is None
+        assert len(plan[0].candidates) == 2
+        assert apply_relinks(plan, self.scanner.cache) == 0
+    
+    def test_size_breaks_ties(self):
+        """A candidate with the size the library had when it was indexed wins"""
+        (self.project / "other").mkdir()
+        # A different file with the same name
+        shutil.copy2(BLENDFILES_DIR / "absolute_path.blend", self.project / "other" / "basic_file.blend")
+        
+        # The snapshot from before the move knows the old size, the rescan finds the candidates
+        index = FileIndex(str(self.project), ['.blend'], rescan_interval=0, snapshot_file=self.snapshot)
+        assert index.load_snapshot()
+        plan = plan_relinks(self.scanner.find_broken_links(), index, rescan_missing=True)
+        assert not plan[0].ambiguous
+        assert plan[0].candidates == [str(self.project / "assets" / "basic_file.blend"),
+                                      str(self.project / "other" / "basic_file.blend")]
+    
+    def test_renamed_library_found_by_fingerprint(self):
+        """A library that was renamed as well is found by its cached fingerprint"""
+        # The library was scanned and fingerprinted before it went missing
+        old_path = self.project / "basic_file.blend"
+        shutil.move(self.project / "assets" / "basic_file.blend", old_path)
+        assert self.scanner.cache.get_fingerprint(old_path) is not None
+        self.scanner.cache.save()
+        
+        # Copied to another disk and back, so it is a different file to the cache
+        renamed = self.project / "assets" / "cube_base.blend"
+        shutil.copy2(old_path, renamed)
+        old_path.unlink()
+        
+        plan = plan_relinks(self.scanner.find_broken_links(), self.index, self.scanner.cache, rescan_missing=True)
+        assert plan[0].new_path == str(renamed)
+    
+    def test_same_named_healthy_library_left_alone(self, tmp_path):
+        """Only the broken library is relinked, not a healthy one with the same file name"""
+        from blendwatch.blender.block_level_optimizations import read_block_paths
+        from blendwatch.blender.library_writer import LibraryPathWriter
+        
+        project = tmp_path / "shots"
+        for directory in ("b", "assets/a"):
+            (project / directory).mkdir(parents=True)
+        shot = project / "shot.blend"
+        shutil.copy2(BLENDFILES_DIR / "doubly_linked.blend", shot)
+        libraries = [block_path for block_path in read_block_paths(shot) if block_path.code == "LI"]
+        assert LibraryPathWriter(shot).update_blocks({libraries[0]: "//a/char.blend",
+                                                      libraries[1]: "//b/char.blend"}) == 2
+        shutil.copy2(BLENDFILES_DIR / "basic_file.blend", project / "b" / "char.blend")
+        # a/char.blend was moved into a folder that still tells it apart from b/char.blend
+        shutil.copy2(BLENDFILES_DIR / "linked_cube.blend", project / "assets" / "a" / "char.blend")
+        index = FileIndex(str(project), ['.blend'], rescan_interval=0, snapshot_file=tmp_path / "shots_index.json")
+        index.rescan()
+        scanner = BacklinkScanner(project, cache=BlendFileCache(cache_dir=tmp_path / "shots_cache"))
+        plan = plan_relinks({shot: scanner.find_broken_links()[shot]}, index)
+        assert [relink.new_path for relink in plan] == [str(project / "assets" / "a" / "char.blend")]
+        
+        assert apply_relinks(plan, scanner.cache) == 1
+        assert {block_path.name for block_path in read_block_paths(shot) if block_path.code == "LI"} == \
+            {"//assets/a/char.blend", "//b/char.blend"}
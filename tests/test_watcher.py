@@ -14,7 +14,8 @@ from watchdog.events import (
     FileCreatedEvent,
     FileDeletedEvent,
     DirCreatedEvent,
-    DirDeletedEvent
+    DirDeletedEvent,
+    FileModifiedEvent
 )
 
 from blendwatch.core.watcher import FileWatcher, MoveTrackingHandler
@@ -97,6 +98,34 @@ class TestMoveTrackingHandler:
         assert 'renamed' in events[0]['type']
         assert 'moved' in events[1]['type']
     
+    def test_listeners_receive_events(self):
+        """Listeners get move, modify and delete events, only moves are logged"""
+        received = []
+        self.handler.listeners.append(received.append)
+        
+        self.handler.on_moved(FileMovedEvent('/path/old.py', '/path/new.py'))
+        self.handler.on_modified(FileModifiedEvent('/path/new.py'))
+        self.handler.on_deleted(FileDeletedEvent('/path/new.py'))
+        
+        assert [event['type'] for event in received] == ['file_renamed', 'file_modified', 'file_deleted']
+        assert len(self.handler.move_events) == 1
+    
+    def test_save_through_ignored_temp_file_is_a_modification(self):
+        """Replacing a file with an ignored temporary file notifies a modification"""
+        handler = MoveTrackingHandler(['.blend'], [r'.*\.blend@$'])
+        received = []
+        handler.listeners.append(received.append)
+        
+        handler.on_moved(FileMovedEvent('/path/scene.blend@', '/path/scene.blend'))
+        
+        assert received == [{
+            'timestamp': received[0]['timestamp'],
+            'type': 'file_modified',
+            'path': '/path/scene.blend',
+            'is_directory': False
+        }]
+        assert handler.move_events == []
+    
     def test_directory_move_with_files(self):
         """Test directory move events generate file move events"""
         with patch('blendwatch.utils.path_utils.find_files_by_extension') as mock_find_files: